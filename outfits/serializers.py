@@ -113,10 +113,9 @@ class OutfitCreateSerializer(serializers.ModelSerializer):
         """Validate outfit data"""
         # Check user's outfit limit
         user = self.context['request'].user
-        current_count = Outfit.objects.filter(user=user).count()
         max_outfits = user.get_max_outfits()
         
-        if current_count >= max_outfits:
+        if user.outfits_created_count >= max_outfits:
             raise serializers.ValidationError(
                 f"You've reached your outfit limit of {max_outfits}. "
                 f"Upgrade to Premium to create more!"
@@ -166,9 +165,6 @@ class OutfitCreateSerializer(serializers.ModelSerializer):
                     position=idx
                 )
         
-        # Update user's outfit count
-        user.increment_outfits_count()
-        
         return outfit
 
 
@@ -6,6 +6,7 @@ from django.core.paginator import Paginator
 from .models import Outfit, OutfitItem, StyleChallenge, ChallengeParticipation, ChallengeOutfit, UserBadge
 from users.models import StyleCritiqueSession
 from wardrobe.models import ClothingItem
+from planner.models import WearStats
 
 
 @login_required
@@ -114,7 +115,7 @@ def outfit_create_view(request):
     user = request.user
     
     # Check outfit limit
-    outfit_count = Outfit.objects.filter(user=user).count()
+    outfit_count = user.outfits_created_count
     max_outfits = user.get_max_outfits()
     if outfit_count >= max_outfits:
         messages.warning(
@@ -162,9 +163,6 @@ def outfit_create_view(request):
                 except ClothingItem.DoesNotExist:
                     pass
             
-            # Update user's outfit count
-            user.increment_outfits_count()
-            
             # Run AI Style Coach audit AFTER items are added
             try:
                 from recommendations.ai_engine import StyleCoach
@@ -300,12 +298,6 @@ def outfit_delete_view(request, outfit_id):
         outfit_name = outfit.name
         outfit.delete()
         
-        # Update user's outfit count
-        user = request.user
-        if user.outfits_created_count > 0:
-            user.outfits_created_count -= 1
-            user.save(update_fields=['outfits_created_count'])
-        
         messages.success(request, f'{outfit_name} has been deleted.')
         return redirect('outfits:outfit_gallery')
     
@@ -334,13 +326,16 @@ def outfit_stats_view(request):
     
     # Calculate statistics
     avg_items = outfits.annotate(item_count=Count('items')).aggregate(avg=Avg('item_count'))
-    total_wears = outfits.aggregate(total=Sum('times_worn'))
+    wear_totals = WearStats.objects.filter(user=user, outfit__isnull=False).aggregate(
+        total=Sum('wear_count_total'), recent=Sum('wear_count_30d')
+    )
     
     stats = {
         'total_outfits': outfits.count(),
         'favorite_outfits': outfits.filter(favorite=True).count(),
         'avg_items_per_outfit': avg_items['avg'] or 0,
-        'total_wears': total_wears['total'] or 0,
+        'total_wears': wear_totals['total'] or 0,
+        'wears_last_30_days': wear_totals['recent'] or 0,
         'by_occasion': {},
         'most_worn': [],
         'recent_outfits': [],
@@ -578,23 +573,14 @@ class OutfitViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Automatically associate outfit with current user and check limits"""
         user = self.request.user
-        outfit_count = Outfit.objects.filter(user=user).count()
         max_outfits = user.get_max_outfits()
-        if outfit_count >= max_outfits:
+        if user.outfits_created_count >= max_outfits:
             raise ValidationError(
                 f"You have reached your limit of {max_outfits} outfits. "
                 f"Upgrade to Premium to create more."
             )
         serializer.save()
     
-    def perform_destroy(self, instance):
-        """Decrement user's outfit count on delete"""
-        user = self.request.user
-        instance.delete()
-        # Update count
-        user.outfits_created_count = max(0, user.outfits_created_count - 1)
-        user.save(update_fields=['outfits_created_count'])
-    
     @action(detail=True, methods=['post'])
     def toggle_favorite(self, request, pk=None):
         """
@@ -732,9 +718,6 @@ class OutfitViewSet(viewsets.ModelViewSet):
                 y_position=outfit_item.y_position
             )
         
-        # Update user count
-        request.user.increment_outfits_count()
-        
         serializer = OutfitDetailSerializer(duplicate_outfit)
         return Response({
             'status': 'success',
@@ -752,10 +735,15 @@ class OutfitViewSet(viewsets.ModelViewSet):
         outfits = self.get_queryset()
         
         # Calculate statistics
+        wear_totals = WearStats.objects.filter(user=user, outfit__isnull=False).aggregate(
+            total=Sum('wear_count_total'), recent=Sum('wear_count_30d')
+        )
         stats = {
             'total_outfits': outfits.count(),
             'by_occasion': {},
             'favorite_count': outfits.filter(favorite=True).count(),
+            'total_wears': wear_totals['total'] or 0,
+            'wears_last_30_days': wear_totals['recent'] or 0,
             'most_worn': [],
             'recent_outfits': [],
         }
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Event, OutfitPlanning, TravelPlan, WearHistory
+from .models import Event, OutfitPlanning, TravelPlan, WearHistory, WearStats
 
 
 @admin.register(Event)
@@ -39,3 +39,11 @@ class WearHistoryAdmin(admin.ModelAdmin):
     raw_id_fields = ['user', 'outfit']
     filter_horizontal = ['clothing_items']
     date_hierarchy = 'worn_date'
+
+
+@admin.register(WearStats)
+class WearStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'outfit', 'clothing_item', 'last_worn', 'wear_count_30d', 'wear_count_total']
+    search_fields = ['user__email', 'outfit__name', 'clothing_item__name']
+    raw_id_fields = ['user', 'outfit', 'clothing_item']
+    date_hierarchy = 'last_worn'
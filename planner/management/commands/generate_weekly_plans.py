@@ -0,0 +1,198 @@
+"""
+Django Management Command: Generate Weekly Plans
+
+Precomputes next week's AI outfit plan for every active user so the first
+planner visit of the week does not pay the generation cost synchronously.
+
+--workers only speeds things up on a database with concurrent writers
+(PostgreSQL, MySQL). SQLite serializes writers, so plan saves run one at a
+time behind a lock there and extra workers overlap little more than the
+scoring and weather fetches.
+
+Usage:
+    # Plan next week for all active users
+    python manage.py generate_weekly_plans
+
+    # Plan a specific week with 8 workers
+    python manage.py generate_weekly_plans --week 2025-01-06 --workers 8
+
+    # Regenerate even if nothing changed since the last plan
+    python manage.py generate_weekly_plans --force
+
+    # Dry run (only report what would be generated)
+    python manage.py generate_weekly_plans --dry-run
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Sunday at 9 PM: 0 21 * * 0 cd /path/to/tailora && python manage.py generate_weekly_plans
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.utils import timezone
+
+from planner.models import WeeklyPlan
+from planner.weekly_planner_ai import WeeklyPlannerAI
+from users.models import User
+
+
+# Same minimum as the generate_weekly_plan view
+MIN_OUTFITS = 3
+
+
+class Command(BaseCommand):
+    help = 'Precompute weekly outfit plans for all active users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--week',
+            type=str,
+            help='Any date in the week to plan (YYYY-MM-DD, default: next week)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of parallel workers (default: 4; little gain on SQLite)'
+        )
+        parser.add_argument(
+            '--email',
+            type=str,
+            help='Generate for a specific user email only'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate even if plan inputs have not changed'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be generated without writing plans'
+        )
+
+    def handle(self, *args, **options):
+        week_start = self._parse_week(options.get('week'))
+        workers = max(1, options['workers'])
+        force = options['force']
+        dry_run = options['dry_run']
+
+        users = self._get_eligible_users(options.get('email'))
+
+        # Group users by location so each forecast is fetched once
+        by_location = defaultdict(list)
+        for user in users:
+            by_location[user.plan_location or 'Tunis'].append(user)
+
+        self.stdout.write(
+            self.style.NOTICE(
+                f"Planning week of {week_start} for {len(users)} users "
+                f"across {len(by_location)} locations ({workers} workers)..."
+            )
+        )
+
+        # SQLite allows a single writer: keep reads parallel, serialize writes
+        self.write_lock = threading.Lock() if connection.vendor == 'sqlite' else nullcontext()
+
+        results = {'generated': 0, 'skipped': 0, 'failed': 0}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for location, location_users in by_location.items():
+                weather_data = WeeklyPlannerAI(location_users[0])._fetch_week_weather(week_start, location)
+                for user in location_users:
+                    future = executor.submit(
+                        self._plan_user, user, week_start, location, weather_data, force, dry_run
+                    )
+                    futures[future] = user
+
+            for future in as_completed(futures):
+                user = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    results['failed'] += 1
+                    self.stdout.write(self.style.ERROR(f"  ✗ {user.email}: {e}"))
+                    continue
+
+                results[outcome] += 1
+                if outcome == 'generated':
+                    prefix = '[DRY RUN] Would generate' if dry_run else '✓ Generated'
+                    self.stdout.write(f"  {prefix}: {user.email}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! Generated: {results['generated']}, "
+                f"Unchanged: {results['skipped']}, Failed: {results['failed']}"
+            )
+        )
+
+    def _parse_week(self, week_param):
+        """Return the Monday of the requested week (default: next week)"""
+        if week_param:
+            try:
+                day = datetime.strptime(week_param, '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Invalid --week date '{week_param}', expected YYYY-MM-DD")
+        else:
+            day = timezone.now().date() + timedelta(days=7)
+        return day - timedelta(days=day.weekday())
+
+    def _get_eligible_users(self, email=None):
+        """
+        Active users with enough outfits, annotated with the location of
+        their most recent plan in a single query.
+        """
+        latest_location = WeeklyPlan.objects.filter(
+            user=OuterRef('pk')
+        ).order_by('-week_start').values('location')[:1]
+
+        users = User.objects.filter(
+            is_active=True,
+            status='active'
+        ).annotate(
+            outfit_total=Count('outfits'),
+            plan_location=Subquery(latest_location)
+        ).filter(
+            outfit_total__gte=MIN_OUTFITS
+        ).select_related('style_profile')
+
+        if email:
+            users = users.filter(email=email)
+            if not users.exists():
+                raise CommandError(f"No eligible user with email '{email}'")
+
+        return list(users)
+
+    def _plan_user(self, user, week_start, location, weather_data, force, dry_run):
+        """Generate one user's plan in its own transaction (runs in a worker thread)"""
+        try:
+            planner_ai = WeeklyPlannerAI(user)
+
+            if not force:
+                signature = planner_ai.compute_inputs_signature(week_start, location, weather_data)
+                unchanged = WeeklyPlan.objects.filter(
+                    user=user,
+                    week_start=week_start,
+                    inputs_signature=signature
+                ).exists()
+                if unchanged:
+                    return 'skipped'
+
+            if not dry_run:
+                with self.write_lock, transaction.atomic():
+                    planner_ai.generate_weekly_plan(
+                        week_start=week_start,
+                        location=location,
+                        weather_data=weather_data
+                    )
+            return 'generated'
+        finally:
+            # Each worker thread owns its own connection
+            connection.close()
@@ -0,0 +1,49 @@
+"""
+Django Management Command: Refresh Wear Stats
+
+Recomputes the WearStats aggregate table from WearHistory. Existing history
+is backfilled by migration planner 0008; run this nightly so wear_count_30d
+drops wears that have aged out of the 30-day window.
+
+Usage:
+    # Rebuild for all users
+    python manage.py refresh_wear_stats
+
+    # Rebuild for one user
+    python manage.py refresh_wear_stats --email user@example.com
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Nightly at 3 AM: 0 3 * * * cd /path/to/tailora && python manage.py refresh_wear_stats
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from planner.models import WearStats
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the wear stats aggregate table from wear history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email',
+            type=str,
+            help='Rebuild for a specific user email only'
+        )
+
+    def handle(self, *args, **options):
+        email = options.get('email')
+        user_id = None
+
+        if email:
+            try:
+                user_id = User.objects.values_list('id', flat=True).get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f"User with email '{email}' not found")
+
+        WearStats.rebuild(user_id=user_id)
+
+        rows = WearStats.objects.all()
+        if user_id:
+            rows = rows.filter(user_id=user_id)
+        self.stdout.write(self.style.SUCCESS(f"Done! {rows.count()} wear stats rows"))
@@ -15,15 +15,23 @@ Usage:
     
     # Dry run (don't actually send)
     python manage.py send_outfit_reminders --time evening --dry-run
+    
+    # Sharded mode: only users whose local reminder time is due
+    python manage.py send_outfit_reminders --sharded
+    
+    # Compute next reminder times for all users (run once before enabling --sharded)
+    python manage.py send_outfit_reminders --reschedule
 
 Schedule with cron (Linux) or Task Scheduler (Windows):
     # Evening at 8 PM: 0 20 * * * cd /path/to/tailora && python manage.py send_outfit_reminders --time evening
     # Morning at 7 AM: 0 7 * * * cd /path/to/tailora && python manage.py send_outfit_reminders --time morning
+    # Or, sharded, every 15 minutes: */15 * * * * cd /path/to/tailora && python manage.py send_outfit_reminders --sharded
 """
 
 from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
 from planner.notification_scheduler import OutfitNotificationScheduler
-from users.models import User
+from users.models import User, StyleProfile
 
 
 class Command(BaseCommand):
@@ -47,6 +55,16 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be sent without actually sending'
         )
+        parser.add_argument(
+            '--sharded',
+            action='store_true',
+            help='Send only to users whose local reminder time is due (run every 15 minutes)'
+        )
+        parser.add_argument(
+            '--reschedule',
+            action='store_true',
+            help='Recompute next reminder times for all users'
+        )
 
     def handle(self, *args, **options):
         reminder_time = options['time']
@@ -55,6 +73,25 @@ class Command(BaseCommand):
         
         scheduler = OutfitNotificationScheduler()
         
+        if options.get('reschedule'):
+            count = scheduler.reschedule_all()
+            self.stdout.write(self.style.SUCCESS(f"Rescheduled reminders for {count} profiles"))
+            return
+        
+        if options.get('sharded'):
+            if dry_run:
+                due = StyleProfile.objects.filter(next_reminder_at__lte=timezone.now()).count()
+                self.stdout.write(f"Would process {due} due reminders")
+                return
+            results = scheduler.run_due_reminders()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Done! Sent: {results['sent']}, Skipped: {results['skipped']}, "
+                    f"Failed: {results['failed']}, Missed: {results['missed']}"
+                )
+            )
+            return
+        
         self.stdout.write(
             self.style.NOTICE(f"Running {reminder_time} outfit reminders...")
         )
@@ -91,16 +128,12 @@ class Command(BaseCommand):
         else:
             # Send to all eligible users
             if dry_run:
-                users = scheduler.get_users_for_notification(reminder_time)
-                self.stdout.write(f"Would send to {len(users)} users:")
-                for user in users[:10]:  # Show first 10
-                    slot = scheduler.get_tomorrow_outfit(user) if reminder_time == 'evening' else scheduler.get_today_outfit(user)
-                    if slot and slot.primary_outfit:
-                        self.stdout.write(f"  - {user.email}: {slot.primary_outfit.name}")
-                    else:
-                        self.stdout.write(f"  - {user.email}: (no outfit)")
-                if len(users) > 10:
-                    self.stdout.write(f"  ... and {len(users) - 10} more")
+                slots = scheduler.get_reminder_slots(reminder_time)
+                self.stdout.write(f"Would send to {len(slots)} users:")
+                for slot in slots[:10]:  # Show first 10
+                    self.stdout.write(f"  - {slot.weekly_plan.user.email}: {slot.primary_outfit.name}")
+                if len(slots) > 10:
+                    self.stdout.write(f"  ... and {len(slots) - 10} more")
             else:
                 results = scheduler.run_reminders(reminder_time)
                 self.stdout.write(
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0004_weeklyplan_dailyplanslot_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyplan',
+            name='inputs_signature',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0005_weeklyplan_inputs_signature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyplan',
+            name='candidate_rankings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
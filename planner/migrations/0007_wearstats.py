@@ -0,0 +1,39 @@
+# Generated by Django 5.0 on 2026-10-18 21:21
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0005_alter_userbadge_user'),
+        ('planner', '0006_weeklyplan_candidate_rankings'),
+        ('wardrobe', '0002_clothingitem_care_type_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WearStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('last_worn', models.DateField()),
+                ('wear_count_30d', models.IntegerField(default=0)),
+                ('wear_count_total', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('clothing_item', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='wear_stats', to='wardrobe.clothingitem')),
+                ('outfit', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='wear_stats', to='outfits.outfit')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wear_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Wear Stats',
+                'verbose_name_plural': 'Wear Stats',
+                'db_table': 'wear_stats',
+                'indexes': [models.Index(fields=['user', 'last_worn'], name='wear_stats_user_id_fac5ad_idx')],
+                'unique_together': {('user', 'clothing_item'), ('user', 'outfit')},
+            },
+        ),
+    ]
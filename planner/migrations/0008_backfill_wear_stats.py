@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+
+RECENT_DAYS = 30  # WearStats.RECENT_DAYS
+
+
+def backfill_wear_stats(apps, schema_editor):
+    """Aggregate existing wear history into WearStats (same as WearStats.rebuild)"""
+    WearHistory = apps.get_model('planner', 'WearHistory')
+    WearStats = apps.get_model('planner', 'WearStats')
+    cutoff = timezone.now().date() - timedelta(days=RECENT_DAYS)
+
+    sources = [
+        ('outfit_id', WearHistory.objects.filter(outfit__isnull=False).values(
+            owner=F('user_id'), target=F('outfit_id')
+        ), 'worn_date'),
+        ('clothing_item_id', WearHistory.clothing_items.through.objects.values(
+            owner=F('wearhistory__user_id'), target=F('clothingitem_id')
+        ), 'wearhistory__worn_date'),
+    ]
+    WearStats.objects.all().delete()
+    for field, grouped, date_field in sources:
+        rows = grouped.annotate(
+            last=Max(date_field),
+            total=Count('pk'),
+            recent=Count('pk', filter=Q(**{f'{date_field}__gte': cutoff})),
+        )
+        WearStats.objects.bulk_create([
+            WearStats(user_id=row['owner'], last_worn=row['last'], wear_count_30d=row['recent'],
+                      wear_count_total=row['total'], **{field: row['target']})
+            for row in rows
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0007_wearstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_wear_stats, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from users.models import User
 from outfits.models import Outfit
 from wardrobe.models import ClothingItem
+import datetime
 import uuid
 
 
@@ -183,6 +184,130 @@ class WearHistory(models.Model):
         return f"{self.user.email} - {self.worn_date} - {outfit_name}"
 
 
+class WearStats(models.Model):
+    """
+    Maintained wear aggregate per user and outfit, or per user and item
+    Kept in sync with WearHistory by planner.signals so planners and stats
+    pages read one compact row instead of scanning history.
+    wear_count_30d only grows on write; refresh_wear_stats decays it nightly.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='wear_stats')
+    outfit = models.ForeignKey(Outfit, on_delete=models.CASCADE, related_name='wear_stats', null=True, blank=True)
+    clothing_item = models.ForeignKey(ClothingItem, on_delete=models.CASCADE, related_name='wear_stats', null=True, blank=True)
+    
+    last_worn = models.DateField()
+    wear_count_30d = models.IntegerField(default=0)
+    wear_count_total = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    RECENT_DAYS = 30
+    
+    class Meta:
+        db_table = 'wear_stats'
+        unique_together = [['user', 'outfit'], ['user', 'clothing_item']]
+        verbose_name = 'Wear Stats'
+        verbose_name_plural = 'Wear Stats'
+        indexes = [
+            models.Index(fields=['user', 'last_worn']),
+        ]
+    
+    def __str__(self):
+        target = self.outfit_id or self.clothing_item_id
+        return f"{self.user_id} - {target} - {self.wear_count_total} wears"
+    
+    @classmethod
+    def record_wear(cls, user_id, worn_date, outfit_ids=(), item_ids=()):
+        """
+        Count one wear on each outfit/item: a single UPDATE for existing
+        rows plus a bulk insert of the missing ones, per key type.
+        """
+        from datetime import timedelta
+        from django.db.models import F, Value
+        from django.db.models.functions import Greatest
+        from django.utils import timezone
+        
+        if isinstance(worn_date, str):
+            worn_date = datetime.date.fromisoformat(worn_date)
+        recent = int(worn_date >= timezone.now().date() - timedelta(days=cls.RECENT_DAYS))
+        for field, ids in (('outfit_id', set(outfit_ids)), ('clothing_item_id', set(item_ids))):
+            if not ids:
+                continue
+            rows = cls.objects.filter(user_id=user_id, **{f'{field}__in': ids})
+            existing = set(rows.values_list(field, flat=True))
+            rows.update(
+                wear_count_total=F('wear_count_total') + 1,
+                wear_count_30d=F('wear_count_30d') + recent,
+                last_worn=Greatest(F('last_worn'), Value(worn_date)),
+            )
+            cls.objects.bulk_create([
+                cls(user_id=user_id, last_worn=worn_date, wear_count_30d=recent,
+                    wear_count_total=1, **{field: key})
+                for key in ids - existing
+            ], ignore_conflicts=True)
+    
+    @classmethod
+    def rebuild(cls, user_id=None, outfit_ids=None, item_ids=None):
+        """
+        Recompute rows from WearHistory with grouped aggregates.
+        Scope to a user and/or specific outfits/items, or rebuild everything.
+        """
+        from datetime import timedelta
+        from django.db import transaction
+        from django.db.models import F
+        from django.utils import timezone
+        
+        cutoff = timezone.now().date() - timedelta(days=cls.RECENT_DAYS)
+        history = WearHistory.objects.filter(outfit__isnull=False)
+        item_history = WearHistory.clothing_items.through.objects.all()
+        outfit_rows = cls.objects.filter(outfit__isnull=False)
+        item_rows = cls.objects.filter(clothing_item__isnull=False)
+        
+        if user_id is not None:
+            history = history.filter(user_id=user_id)
+            item_history = item_history.filter(wearhistory__user_id=user_id)
+            outfit_rows = outfit_rows.filter(user_id=user_id)
+            item_rows = item_rows.filter(user_id=user_id)
+        if outfit_ids is not None:
+            history = history.filter(outfit_id__in=outfit_ids)
+            outfit_rows = outfit_rows.filter(outfit_id__in=outfit_ids)
+        if item_ids is not None:
+            item_history = item_history.filter(clothingitem_id__in=item_ids)
+            item_rows = item_rows.filter(clothing_item_id__in=item_ids)
+        
+        with transaction.atomic():
+            if item_ids is None:
+                cls._replace_rows(
+                    'outfit', outfit_rows,
+                    history.values(owner=F('user_id'), target=F('outfit_id')),
+                    'worn_date', cutoff
+                )
+            if outfit_ids is None:
+                cls._replace_rows(
+                    'clothing_item', item_rows,
+                    item_history.values(owner=F('wearhistory__user_id'), target=F('clothingitem_id')),
+                    'wearhistory__worn_date', cutoff
+                )
+    
+    @classmethod
+    def _replace_rows(cls, field, stale_rows, grouped_history, date_field, cutoff):
+        """Delete stale rows and insert fresh aggregates grouped by (owner, target)"""
+        from django.db.models import Count, Max, Q
+        
+        stale_rows.delete()
+        rows = grouped_history.annotate(
+            last=Max(date_field),
+            total=Count('pk'),
+            recent=Count('pk', filter=Q(**{f'{date_field}__gte': cutoff})),
+        )
+        cls.objects.bulk_create([
+            cls(user_id=row['owner'], last_worn=row['last'], wear_count_30d=row['recent'],
+                wear_count_total=row['total'], **{f'{field}_id': row['target']})
+            for row in rows
+        ], batch_size=500)
+
+
 class WeeklyPlan(models.Model):
     """
     AI-generated weekly outfit plan
@@ -200,6 +325,8 @@ class WeeklyPlan(models.Model):
     events_considered = models.JSONField(default=list, blank=True)  # Events during this week
     generation_reasoning = models.TextField(blank=True)  # Why these outfits were chosen
     location = models.CharField(max_length=100, default='Tunis')  # Weather location
+    inputs_signature = models.CharField(max_length=64, blank=True)  # Hash of plan inputs (batch regeneration skip)
+    candidate_rankings = models.JSONField(default=dict, blank=True)  # Day offset -> top scored outfits (regenerate/swap cache)
     
     # User feedback for ML improvement
     overall_rating = models.IntegerField(null=True, blank=True)  # 1-5 stars
@@ -10,17 +10,25 @@ Usage:
     
     # Morning reminders (run at 7 AM)
     python manage.py send_outfit_reminders --time morning
+    
+    # Sharded mode (run every 15 minutes): only users whose local
+    # reminder time has come up, see StyleProfile.next_reminder_at
+    python manage.py send_outfit_reminders --sharded
 """
 
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.utils import timezone
 from django.conf import settings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from typing import Optional, List
 
-from users.models import User, Notification
+from users.models import User, Notification, StyleProfile
 from planner.models import WeeklyPlan, DailyPlanSlot
 
 
@@ -29,9 +37,39 @@ class OutfitNotificationScheduler:
     Scheduler for sending outfit reminder emails
     """
     
+    SEND_BATCH_SIZE = 100  # Messages rendered and sent per batch
+    RENDER_WORKERS = 4  # Threads rendering email templates in parallel
+    
     def __init__(self):
         self.from_email = settings.DEFAULT_FROM_EMAIL
     
+    def _eligible_users(self, reminder_time: str):
+        """
+        Queryset of users who should receive notifications at this time.
+        
+        Preferences are filtered in SQL; a missing key falls back to the
+        defaults of StyleProfile.get_notification_prefs().
+        """
+        prefs = 'style_profile__notification_preferences'
+        no_profile = Q(style_profile__isnull=True)
+        
+        def enabled(key):
+            return no_profile | ~Q(**{f'{prefs}__has_key': key}) | Q(**{f'{prefs}__{key}': True})
+        
+        time_match = Q(**{f'{prefs}__reminder_time__in': [reminder_time, 'both']})
+        if reminder_time == 'evening':
+            # Default reminder time (also for users without a style profile)
+            time_match |= no_profile | ~Q(**{f'{prefs}__has_key': 'reminder_time'})
+        
+        return User.objects.filter(
+            is_active=True,
+            status='active'
+        ).filter(
+            enabled('outfit_reminder'),
+            enabled('email_notifications'),
+            time_match
+        )
+    
     def get_users_for_notification(self, reminder_time: str) -> List[User]:
         """
         Get users who should receive notifications at this time
@@ -39,26 +77,41 @@ class OutfitNotificationScheduler:
         Args:
             reminder_time: 'morning' or 'evening'
         """
-        users = []
-        for user in User.objects.filter(is_active=True, status='active'):
-            try:
-                profile = user.style_profile
-                prefs = profile.get_notification_prefs()
-                
-                if not prefs.get('outfit_reminder', True):
-                    continue
-                if not prefs.get('email_notifications', True):
-                    continue
-                
-                user_time = prefs.get('reminder_time', 'evening')
-                if user_time == 'both' or user_time == reminder_time:
-                    users.append(user)
-            except Exception:
-                # User without style profile - use defaults (evening)
-                if reminder_time == 'evening':
-                    users.append(user)
-        
-        return users
+        return list(self._eligible_users(reminder_time))
+    
+    def get_reminder_slots(self, reminder_time: str, users=None, target_date=None) -> List[DailyPlanSlot]:
+        """
+        Get the planned slots to remind about, for all eligible users at once
+        
+        Joins each eligible user's slot (tomorrow for evening, today for
+        morning) with its plan, user and outfit, and prefetches the outfit
+        items: two queries regardless of the number of users.
+        
+        Args:
+            reminder_time: 'morning' or 'evening'
+            users: Optional user queryset to restrict to (defaults to all eligible)
+            target_date: Day of the slots (defaults to today/tomorrow)
+        """
+        if target_date is None:
+            target_date = timezone.now().date()
+            if reminder_time == 'evening':
+                target_date += timedelta(days=1)
+        week_start = target_date - timedelta(days=target_date.weekday())
+        
+        if users is None:
+            users = self._eligible_users(reminder_time)
+        
+        return list(DailyPlanSlot.objects.filter(
+            date=target_date,
+            weekly_plan__week_start=week_start,
+            weekly_plan__user__in=users,
+            primary_outfit__isnull=False
+        ).select_related(
+            'weekly_plan__user',
+            'primary_outfit'
+        ).prefetch_related(
+            'primary_outfit__items'
+        ))
     
     def get_tomorrow_outfit(self, user: User) -> Optional[DailyPlanSlot]:
         """Get the outfit planned for tomorrow"""
@@ -103,13 +156,7 @@ class OutfitNotificationScheduler:
         if not slot or not slot.primary_outfit:
             return False
         
-        return self._send_outfit_email(
-            user=user,
-            slot=slot,
-            subject=f"👔 Your outfit for tomorrow ({slot.day_name})",
-            template='email/outfit_reminder_evening.html',
-            context_extra={'is_evening': True}
-        )
+        return self._send_outfit_email(user, slot, 'evening')
     
     def send_morning_reminder(self, user: User) -> bool:
         """Send morning reminder about today's outfit"""
@@ -118,64 +165,74 @@ class OutfitNotificationScheduler:
         if not slot or not slot.primary_outfit:
             return False
         
-        return self._send_outfit_email(
+        return self._send_outfit_email(user, slot, 'morning')
+    
+    def _build_outfit_email(
+        self,
+        user: User,
+        slot: DailyPlanSlot,
+        reminder_time: str,
+        connection=None
+    ) -> EmailMultiAlternatives:
+        """Render the reminder email for a slot (safe to call from worker threads)"""
+        if reminder_time == 'evening':
+            subject = f"👔 Your outfit for tomorrow ({slot.day_name})"
+            template = 'email/outfit_reminder_evening.html'
+            context_extra = {'is_evening': True}
+        else:
+            subject = f"☀️ Time to get dressed! Today's outfit ready"
+            template = 'email/outfit_reminder_morning.html'
+            context_extra = {'is_morning': True}
+        
+        outfit = slot.primary_outfit
+        items = list(outfit.items.all()[:6])
+        
+        context = {
+            'user': user,
+            'slot': slot,
+            'outfit': outfit,
+            'items': items,
+            'weather': {
+                'temperature': slot.temperature,
+                'condition': slot.weather_condition,
+            },
+            'day_name': slot.day_name,
+            'date': slot.date,
+            'selection_reason': slot.selection_reason,
+            'site_url': getattr(settings, 'SITE_URL', 'http://127.0.0.1:8000'),
+            **context_extra
+        }
+        
+        html_message = render_to_string(template, context)
+        message = EmailMultiAlternatives(
+            subject=subject,
+            body=strip_tags(html_message),
+            from_email=self.from_email,
+            to=[user.email],
+            connection=connection
+        )
+        message.attach_alternative(html_message, 'text/html')
+        return message
+    
+    def _build_notification(self, user: User, slot: DailyPlanSlot, subject: str) -> Notification:
+        """In-app notification mirroring a sent reminder"""
+        return Notification(
             user=user,
-            slot=slot,
-            subject=f"☀️ Time to get dressed! Today's outfit ready",
-            template='email/outfit_reminder_morning.html',
-            context_extra={'is_morning': True}
+            notification_type='outfit_ready',
+            title=subject,
+            message=f"Your outfit '{slot.primary_outfit.name}' is ready for {slot.day_name}",
+            related_object_type='DailyPlanSlot',
+            related_object_id=slot.id
         )
     
-    def _send_outfit_email(
-        self, 
-        user: User, 
-        slot: DailyPlanSlot,
-        subject: str,
-        template: str,
-        context_extra: dict = None
-    ) -> bool:
+    def _send_outfit_email(self, user: User, slot: DailyPlanSlot, reminder_time: str) -> bool:
         """Send outfit reminder email"""
         try:
-            outfit = slot.primary_outfit
-            items = list(outfit.items.all()[:6])
-            
-            context = {
-                'user': user,
-                'slot': slot,
-                'outfit': outfit,
-                'items': items,
-                'weather': {
-                    'temperature': slot.temperature,
-                    'condition': slot.weather_condition,
-                },
-                'day_name': slot.day_name,
-                'date': slot.date,
-                'selection_reason': slot.selection_reason,
-                'site_url': getattr(settings, 'SITE_URL', 'http://127.0.0.1:8000'),
-                **(context_extra or {})
-            }
-            
-            html_message = render_to_string(template, context)
-            plain_message = strip_tags(html_message)
-            
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                from_email=self.from_email,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False
-            )
+            message = self._build_outfit_email(user, slot, reminder_time)
+            message.send(fail_silently=False)
             
             # Create in-app notification too
-            Notification.objects.create(
-                user=user,
-                notification_type='outfit_ready',
-                title=subject,
-                message=f"Your outfit '{outfit.name}' is ready for {slot.day_name}",
-                related_object_type='DailyPlanSlot',
-                related_object_id=slot.id
-            )
+            self._build_notification(user, slot, message.subject).save()
             
             return True
             
@@ -183,30 +240,137 @@ class OutfitNotificationScheduler:
             print(f"Failed to send reminder to {user.email}: {e}")
             return False
     
-    def run_reminders(self, reminder_time: str) -> dict:
+    def _render_batch(self, executor, slots: List[DailyPlanSlot], reminder_time: str, connection) -> list:
+        """Render a batch of emails in parallel; failed renders come back as None"""
+        def render(slot):
+            try:
+                return self._build_outfit_email(slot.weekly_plan.user, slot, reminder_time, connection)
+            except Exception as e:
+                print(f"Failed to render reminder for {slot.weekly_plan.user.email}: {e}")
+                return None
+        
+        return list(executor.map(render, slots))
+    
+    def run_reminders(self, reminder_time: str, users=None, target_date=None) -> dict:
         """
         Run reminders for all eligible users
         
+        Slots are loaded in one pass, rendered in parallel batches and sent
+        over a single reused mail connection.
+        
         Args:
             reminder_time: 'morning' or 'evening'
+            users: Optional user queryset to restrict to (defaults to all eligible)
+            target_date: Day of the slots (defaults to today/tomorrow)
             
         Returns:
             dict with counts of sent/failed
         """
-        users = self.get_users_for_notification(reminder_time)
-        results = {'sent': 0, 'failed': 0, 'skipped': 0}
+        if users is None:
+            users = self._eligible_users(reminder_time)
+        slots = self.get_reminder_slots(reminder_time, users=users, target_date=target_date)
         
-        for user in users:
-            if reminder_time == 'evening':
-                success = self.send_evening_reminder(user)
-            else:
-                success = self.send_morning_reminder(user)
+        # Eligible users without a planned outfit have nothing to remind about
+        results = {'sent': 0, 'failed': 0, 'skipped': max(0, users.count() - len(slots))}
+        if not slots:
+            return results
+        
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        try:
+            with ThreadPoolExecutor(max_workers=self.RENDER_WORKERS) as executor:
+                for start in range(0, len(slots), self.SEND_BATCH_SIZE):
+                    batch = slots[start:start + self.SEND_BATCH_SIZE]
+                    messages = self._render_batch(executor, batch, reminder_time, connection)
+                    notifications = []
+                    
+                    for slot, message in zip(batch, messages):
+                        user = slot.weekly_plan.user
+                        if message is None:
+                            results['failed'] += 1
+                            continue
+                        try:
+                            connection.send_messages([message])
+                        except Exception as e:
+                            print(f"Failed to send reminder to {user.email}: {e}")
+                            results['failed'] += 1
+                            continue
+                        notifications.append(self._build_notification(user, slot, message.subject))
+                        results['sent'] += 1
+                    
+                    Notification.objects.bulk_create(notifications)
+        finally:
+            connection.close()
+        
+        return results
+    
+    def run_due_reminders(self, now=None) -> dict:
+        """
+        Sharded tick: remind only users whose next_reminder_at has passed
+        
+        Due profiles are claimed and rescheduled up front (row-locked where
+        the database supports it), so overlapping ticks never double-send.
+        They are then grouped by reminder type and local target date, which
+        yields a few set-based run_reminders() passes per tick.
+        
+        Slots that come due too late (the scheduler was down) are dropped
+        rather than sent: a morning reminder once its day is over, an
+        evening one once the day it prepares for has begun.
+        
+        Returns:
+            dict with counts of sent/failed/skipped, and missed slots
+        """
+        now = now or timezone.now()
+        
+        with transaction.atomic():
+            due = list(
+                StyleProfile.objects.select_for_update(skip_locked=True).filter(
+                    next_reminder_at__lte=now
+                ).order_by('next_reminder_at')
+            )
             
-            if success:
-                results['sent'] += 1
-            elif success is False:
-                results['skipped'] += 1  # No outfit to remind about
-            else:
-                results['failed'] += 1
+            # (reminder type, user's local target date) -> user ids
+            groups = defaultdict(list)
+            missed = 0
+            for profile in due:
+                tz = profile.get_reminder_timezone()
+                local_date = profile.next_reminder_at.astimezone(tz).date()
+                local_today = now.astimezone(tz).date()
+                if profile.next_reminder_type == 'evening':
+                    local_date += timedelta(days=1)
+                    on_time = local_date > local_today
+                else:
+                    on_time = local_date >= local_today
+                if on_time:
+                    groups[(profile.next_reminder_type, local_date)].append(profile.user_id)
+                else:
+                    missed += 1
+                    print(
+                        f"Skipping missed {profile.next_reminder_type} reminder for user {profile.user_id} "
+                        f"(outfit date {local_date})"
+                    )
+                profile.schedule_next_reminder(after=now)
+            
+            StyleProfile.objects.bulk_update(due, ['next_reminder_at', 'next_reminder_type'])
+        
+        results = {'sent': 0, 'failed': 0, 'skipped': 0, 'missed': missed}
+        for (reminder_time, target_date), user_ids in groups.items():
+            users = User.objects.filter(id__in=user_ids, is_active=True, status='active')
+            group_results = self.run_reminders(reminder_time, users=users, target_date=target_date)
+            for key in ('sent', 'failed', 'skipped'):
+                results[key] += group_results[key]
         
         return results
+    
+    def reschedule_all(self, batch_size: int = 1000) -> int:
+        """(Re)compute next_reminder_at for every profile, e.g. after deploying sharding"""
+        now = timezone.now()
+        count = 0
+        profiles = StyleProfile.objects.order_by('pk')
+        for start in range(0, profiles.count(), batch_size):
+            batch = list(profiles[start:start + batch_size])
+            for profile in batch:
+                profile.schedule_next_reminder(after=now)
+            StyleProfile.objects.bulk_update(batch, ['next_reminder_at', 'next_reminder_type'])
+            count += len(batch)
+        return count
@@ -0,0 +1,89 @@
+import datetime
+
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from outfits.models import Outfit, OutfitItem
+from .models import Event, WearHistory, WearStats, WeeklyPlan
+
+
+def invalidate_plan_rankings(user_id):
+    """Drop cached candidate rankings so the next regenerate rescores"""
+    WeeklyPlan.objects.filter(user_id=user_id, status='active').update(candidate_rankings={})
+
+
+@receiver([post_save, post_delete], sender=Outfit)
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=WearHistory)
+def invalidate_rankings_on_change(sender, instance, **kwargs):
+    """Outfits, events and wear history all feed the plan scoring"""
+    invalidate_plan_rankings(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=OutfitItem)
+def invalidate_rankings_on_outfit_items(sender, instance, **kwargs):
+    """Changing an outfit's items changes its weather/color scores"""
+    user_id = Outfit.objects.filter(id=instance.outfit_id).values_list('user_id', flat=True).first()
+    if user_id:
+        invalidate_plan_rankings(user_id)
+
+
+def _as_date(value):
+    return datetime.date.fromisoformat(value) if isinstance(value, str) else value
+
+
+@receiver(pre_save, sender=WearHistory)
+def remember_wear_target(sender, instance, **kwargs):
+    """An edit may move the wear to another outfit or date"""
+    if not instance._state.adding:
+        instance._previous_wear = WearHistory.objects.filter(pk=instance.pk).values(
+            'outfit_id', 'worn_date'
+        ).first()
+
+
+@receiver(post_save, sender=WearHistory)
+def update_outfit_wear_stats(sender, instance, created, **kwargs):
+    """Count new wears incrementally; edits recompute the rows they touch"""
+    if created:
+        if instance.outfit_id:
+            WearStats.record_wear(instance.user_id, instance.worn_date, outfit_ids=[instance.outfit_id])
+        return
+    
+    previous = getattr(instance, '_previous_wear', None)
+    if previous is None:
+        return
+    date_moved = previous['worn_date'] != _as_date(instance.worn_date)
+    if previous['outfit_id'] != instance.outfit_id or date_moved:
+        outfit_ids = {previous['outfit_id'], instance.outfit_id} - {None}
+        if outfit_ids:
+            WearStats.rebuild(user_id=instance.user_id, outfit_ids=outfit_ids)
+    if date_moved:
+        item_ids = list(instance.clothing_items.values_list('id', flat=True))
+        if item_ids:
+            WearStats.rebuild(user_id=instance.user_id, item_ids=item_ids)
+
+
+@receiver(m2m_changed, sender=WearHistory.clothing_items.through)
+def update_item_wear_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    """Item wears are linked after the WearHistory row is created"""
+    if action == 'post_add' and not reverse:
+        WearStats.record_wear(instance.user_id, instance.worn_date, item_ids=pk_set)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if reverse:
+            WearStats.rebuild(user_id=instance.user_id, item_ids=[instance.id])
+        else:
+            WearStats.rebuild(user_id=instance.user_id, item_ids=pk_set)
+
+
+@receiver(pre_delete, sender=WearHistory)
+def remember_worn_items(sender, instance, **kwargs):
+    """The item links are gone by post_delete"""
+    instance._worn_item_ids = list(instance.clothing_items.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=WearHistory)
+def remove_wear_stats(sender, instance, **kwargs):
+    if instance.outfit_id:
+        WearStats.rebuild(user_id=instance.user_id, outfit_ids=[instance.outfit_id])
+    item_ids = getattr(instance, '_worn_item_ids', None)
+    if item_ids:
+        WearStats.rebuild(user_id=instance.user_id, item_ids=item_ids)
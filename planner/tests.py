@@ -1,3 +1,127 @@
-from django.test import TestCase
+import datetime
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from outfits.models import Outfit
+from users.models import StyleProfile, User
+from wardrobe.models import ClothingCategory, ClothingItem
+
+from .models import WearHistory, WearStats
+from .notification_scheduler import OutfitNotificationScheduler
+from .weekly_planner_ai import WeeklyPlannerAI
+
+
+class WearStatsSignalTests(TestCase):
+    """
+    WearStats follows WearHistory edits by touching only the affected rows
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='wearer', email='wearer@example.com', password='x')
+        cls.first = Outfit.objects.create(user=cls.user, name='First')
+        cls.second = Outfit.objects.create(user=cls.user, name='Second')
+        cls.item = ClothingItem.objects.create(
+            user=cls.user,
+            name='Shirt',
+            category=ClothingCategory.objects.create(name='Tops'),
+            image='wardrobe/shirt.jpg',
+        )
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.wear = WearHistory.objects.create(user=self.user, outfit=self.first, worn_date=self.today)
+        self.wear.clothing_items.add(self.item)
+
+    def stats(self, **target):
+        return WearStats.objects.filter(user=self.user, **target).values_list(
+            'last_worn', 'wear_count_total'
+        ).first()
+
+    def test_moving_a_wear_updates_both_outfits(self):
+        self.wear.outfit = self.second
+        self.wear.save()
+
+        self.assertIsNone(self.stats(outfit=self.first))
+        self.assertEqual(self.stats(outfit=self.second), (self.today, 1))
+        self.assertEqual(self.stats(clothing_item=self.item), (self.today, 1))
+
+    def test_changing_the_date_updates_outfit_and_items(self):
+        earlier = self.today - datetime.timedelta(days=3)
+        self.wear.worn_date = earlier.isoformat()
+        self.wear.save()
+
+        self.assertEqual(self.stats(outfit=self.first), (earlier, 1))
+        self.assertEqual(self.stats(clothing_item=self.item), (earlier, 1))
+
+    def test_other_edits_leave_stats_alone(self):
+        other = Outfit.objects.create(user=self.user, name='Other')
+        WearStats.objects.filter(user=self.user, outfit=self.first).update(wear_count_total=5)
+
+        self.wear.notes = 'Rainy day'
+        self.wear.save()
+        WearHistory.objects.create(user=self.user, outfit=other, worn_date=self.today)
+
+        self.assertEqual(self.stats(outfit=self.first), (self.today, 5))
+
+
+class WeatherBucketTests(SimpleTestCase):
+    """
+    Plan signatures only change when the forecast changes enough to matter
+    """
+
+    def forecast(self, temperature, condition='Clear', humidity=50):
+        return {
+            day: {'temperature': temperature, 'condition': condition, 'humidity': humidity, 'icon': '01d'}
+            for day in range(7)
+        }
+
+    def test_small_forecast_changes_keep_the_bucket(self):
+        self.assertEqual(
+            WeeklyPlannerAI._weather_bucket(self.forecast(21.2)),
+            WeeklyPlannerAI._weather_bucket(self.forecast(22.9, humidity=80)),
+        )
+
+    def test_new_band_or_condition_changes_the_bucket(self):
+        bucket = WeeklyPlannerAI._weather_bucket(self.forecast(21))
+        self.assertNotEqual(bucket, WeeklyPlannerAI._weather_bucket(self.forecast(25)))
+        self.assertNotEqual(bucket, WeeklyPlannerAI._weather_bucket(self.forecast(21, 'Rain')))
+
+
+@patch.object(OutfitNotificationScheduler, 'run_reminders', return_value={'sent': 1, 'failed': 0, 'skipped': 0})
+class DueRemindersTests(TestCase):
+    """
+    Reminder slots that come due after their outfit day has begun are not sent
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reminded', email='reminded@example.com', password='x')
+
+    # Midday in the site (and default reminder) time zone
+    now = timezone.make_aware(datetime.datetime(2026, 3, 10, 12))
+
+    def set_due(self, reminder_type, when):
+        StyleProfile.objects.filter(user=self.user).update(
+            next_reminder_type=reminder_type, next_reminder_at=when
+        )
+
+    def test_missed_evening_reminder_is_skipped_and_rescheduled(self, run_reminders):
+        self.set_due('evening', self.now - datetime.timedelta(days=2))
+
+        results = OutfitNotificationScheduler().run_due_reminders(now=self.now)
+
+        run_reminders.assert_not_called()
+        self.assertEqual(results['missed'], 1)
+        profile = StyleProfile.objects.get(user=self.user)
+        self.assertGreater(profile.next_reminder_at, self.now)
+
+    def test_slightly_late_reminder_is_still_sent(self, run_reminders):
+        self.set_due('morning', self.now - datetime.timedelta(hours=4))
+
+        results = OutfitNotificationScheduler().run_due_reminders(now=self.now)
+
+        run_reminders.assert_called_once()
+        self.assertEqual((results['sent'], results['missed']), (1, 0))
@@ -9,17 +9,20 @@ Generates intelligent weekly outfit plans based on:
 - Color harmony and style rules
 """
 
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Max
 from django.utils import timezone
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
+import hashlib
+import json
 import random
+import uuid
 
 from wardrobe.models import ClothingItem
 from outfits.models import Outfit, OutfitItem
 from users.models import StyleProfile, User
-from .models import Event, WeeklyPlan, DailyPlanSlot, WearHistory
+from .models import Event, WeeklyPlan, DailyPlanSlot, WearHistory, WearStats
 from .weather_service import WeatherService
 
 
@@ -43,6 +46,8 @@ class WeeklyPlannerAI:
     STYLE_WEIGHT = 0.10
     COLOR_WEIGHT = 0.06
     RANDOMNESS_FACTOR = 0.15  # Up to 15% random variation for variety
+    RANKING_CACHE_SIZE = 10  # Candidates kept per day for regenerate/swap
+    SIGNATURE_TEMP_STEP = 3  # Forecast changes within a band don't force a new plan
     
     def __init__(self, user: User):
         self.user = user
@@ -64,7 +69,8 @@ class WeeklyPlannerAI:
     def generate_weekly_plan(
         self, 
         week_start: Optional[datetime] = None,
-        location: str = 'Tunis'
+        location: str = 'Tunis',
+        weather_data: Optional[Dict] = None
     ) -> WeeklyPlan:
         """
         Generate a complete weekly outfit plan
@@ -72,6 +78,8 @@ class WeeklyPlannerAI:
         Args:
             week_start: Monday of the week to plan (default: current week)
             location: City for weather forecast
+            weather_data: Pre-fetched week forecast (skips the weather fetch,
+                used by batch generation to share one forecast per location)
             
         Returns:
             WeeklyPlan object with 7 DailyPlanSlot entries
@@ -97,7 +105,8 @@ class WeeklyPlannerAI:
             existing_plan.delete()
         
         # Fetch required data
-        weather_data = self._fetch_week_weather(week_start, location)
+        if weather_data is None:
+            weather_data = self._fetch_week_weather(week_start, location)
         week_events = self._get_week_events(week_start)
         available_outfits = self._get_available_outfits()
         wear_history = self._get_recent_wear_history(days=21)
@@ -115,34 +124,25 @@ class WeeklyPlannerAI:
             } for e in week_events],
             location=location,
             generation_reasoning=self._generate_plan_reasoning(week_events, weather_data),
+            inputs_signature=self.compute_inputs_signature(week_start, location, weather_data),
             status='active'
         )
         
         # Generate outfit for each day
         used_outfits = set()  # Track used outfits to ensure variety
+        candidate_rankings = {}  # Cached per-day rankings for regenerate/swap
         
         for day_offset in range(7):
             day_date = week_start + timedelta(days=day_offset)
             day_weather = self._get_day_weather(weather_data, day_offset)
             day_events = [e for e in week_events if e.date == day_date]
             
-            # Calculate scores for all outfits
-            scored_outfits = []
-            for outfit in available_outfits:
-                if outfit.id in used_outfits:
-                    continue  # Skip already used outfits
-                    
-                scores = self._calculate_outfit_scores(
-                    outfit, 
-                    day_weather, 
-                    day_events,
-                    wear_history,
-                    day_date
-                )
-                scored_outfits.append((outfit, scores))
-            
-            # Sort by total score
-            scored_outfits.sort(key=lambda x: x[1]['total'], reverse=True)
+            # Rank all outfits for the day, then skip already used ones
+            ranked_outfits = self._rank_outfits_for_day(
+                available_outfits, day_weather, day_events, wear_history, day_date
+            )
+            candidate_rankings[str(day_offset)] = self._serialize_ranking(ranked_outfits)
+            scored_outfits = [(o, s) for o, s in ranked_outfits if o.id not in used_outfits]
             
             # Select primary outfit and alternatives
             primary_outfit = None
@@ -190,8 +190,75 @@ class WeeklyPlannerAI:
             if day_events:
                 daily_slot.events.set(day_events)
         
+        weekly_plan.candidate_rankings = candidate_rankings
+        weekly_plan.save(update_fields=['candidate_rankings'])
+        
         return weekly_plan
     
+    def compute_inputs_signature(self, week_start, location: str, weather_data: Dict) -> str:
+        """
+        Fingerprint everything a weekly plan is derived from.
+        
+        Uses a handful of aggregate queries (no row scans), so batch
+        generation can cheaply skip users whose plan would not change.
+        The forecast only counts through _weather_bucket(), so a forecast
+        refresh that moves a temperature by a degree doesn't regenerate
+        every plan.
+        
+        Returns:
+            SHA-256 hex digest of the plan inputs
+        """
+        from recommendations.models import UserPreferenceSignal
+        
+        week_end = week_start + timedelta(days=6)
+        outfits = Outfit.objects.filter(user=self.user).aggregate(
+            count=Count('id'), updated=Max('updated_at')
+        )
+        outfit_items = OutfitItem.objects.filter(outfit__user=self.user).aggregate(
+            count=Count('id'), updated=Max('clothing_item__updated_at')
+        )
+        events = Event.objects.filter(
+            user=self.user, date__gte=week_start, date__lte=week_end
+        ).aggregate(count=Count('id'), updated=Max('updated_at'))
+        wear = WearHistory.objects.filter(user=self.user).aggregate(
+            count=Count('id'), updated=Max('created_at')
+        )
+        signals = UserPreferenceSignal.objects.filter(user=self.user).aggregate(
+            count=Count('id'), updated=Max('created_at')
+        )
+        preferred_styles = getattr(self.style_profile, 'preferred_styles', None) or []
+        
+        payload = {
+            'week_start': str(week_start),
+            'location': location,
+            'weather': self._weather_bucket(weather_data),
+            'outfits': outfits,
+            'outfit_items': outfit_items,
+            'events': events,
+            'wear': wear,
+            'signals': signals,
+            'styles': sorted(preferred_styles),
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def _weather_bucket(cls, weather_data: Dict) -> List:
+        """
+        The parts of the forecast plan scoring reads, coarsened: per day the
+        temperature band (SIGNATURE_TEMP_STEP degrees) and the condition.
+        Humidity, icon and feels-like are not scored and are left out.
+        """
+        bucket = []
+        for day_offset in range(7):
+            weather = cls._get_day_weather(weather_data, day_offset)
+            temperature = weather.get('temperature', 20)
+            bucket.append([
+                None if temperature is None else int(temperature // cls.SIGNATURE_TEMP_STEP),
+                (weather.get('condition') or '').lower(),
+            ])
+        return bucket
+    
     def _fetch_week_weather(self, week_start, location: str) -> Dict:
         """
         Fetch 7-day weather forecast
@@ -229,8 +296,12 @@ class WeeklyPlannerAI:
         
         return weather_data
     
-    def _get_day_weather(self, weather_data: Dict, day_offset: int) -> Dict:
+    @staticmethod
+    def _get_day_weather(weather_data: Dict, day_offset: int) -> Dict:
         """Get weather for a specific day offset"""
+        # Keys become strings once the forecast is stored on a WeeklyPlan
+        if str(day_offset) in weather_data:
+            return weather_data[str(day_offset)]
         return weather_data.get(day_offset, {
             'temperature': 20,
             'condition': 'Clear',
@@ -256,6 +327,50 @@ class WeeklyPlannerAI:
         random.shuffle(outfits)
         return outfits
     
+    def _rank_outfits_for_day(
+        self,
+        outfits: List[Outfit],
+        day_weather: Dict,
+        day_events: List[Event],
+        wear_history: Dict,
+        day_date
+    ) -> List[Tuple[Outfit, Dict]]:
+        """Score every outfit for a day, best first"""
+        scored_outfits = [
+            (outfit, self._calculate_outfit_scores(outfit, day_weather, day_events, wear_history, day_date))
+            for outfit in outfits
+        ]
+        scored_outfits.sort(key=lambda x: x[1]['total'], reverse=True)
+        return scored_outfits
+    
+    def _serialize_ranking(self, scored_outfits: List[Tuple[Outfit, Dict]]) -> List[Dict]:
+        """Convert a ranking to JSON for WeeklyPlan.candidate_rankings"""
+        return [
+            {'outfit_id': str(outfit.id), 'scores': scores}
+            for outfit, scores in scored_outfits[:self.RANKING_CACHE_SIZE]
+        ]
+    
+    def _load_cached_ranking(self, weekly_plan: WeeklyPlan, day_offset: int) -> Optional[List[Tuple[Outfit, Dict]]]:
+        """
+        Hydrate a cached day ranking with a single outfit query.
+        
+        Returns None when the cache was invalidated (outfits, events or
+        wear history changed since the plan was generated).
+        """
+        cached = (weekly_plan.candidate_rankings or {}).get(str(day_offset))
+        if not cached:
+            return None
+        
+        outfits = Outfit.objects.filter(user=self.user).in_bulk(
+            [entry['outfit_id'] for entry in cached]
+        )
+        ranking = []
+        for entry in cached:
+            outfit = outfits.get(uuid.UUID(entry['outfit_id']))
+            if outfit:
+                ranking.append((outfit, entry['scores']))
+        return ranking
+    
     def _weighted_random_select(self, scored_outfits: List[Tuple[Outfit, Dict]]) -> Tuple[Outfit, Dict]:
         """
         Select an outfit using weighted random selection.
@@ -299,17 +414,11 @@ class WeeklyPlannerAI:
         Returns dict: outfit_id -> last_worn_date
         """
         cutoff = timezone.now().date() - timedelta(days=days)
-        history = WearHistory.objects.filter(
+        return dict(WearStats.objects.filter(
             user=self.user,
-            worn_date__gte=cutoff
-        ).select_related('outfit')
-        
-        wear_dict = {}
-        for entry in history:
-            if entry.outfit:
-                wear_dict[entry.outfit.id] = entry.worn_date
-        
-        return wear_dict
+            outfit__isnull=False,
+            last_worn__gte=cutoff
+        ).values_list('outfit_id', 'last_worn'))
     
     def _calculate_outfit_scores(
         self,
@@ -617,6 +726,9 @@ class WeeklyPlannerAI:
         """
         Regenerate outfit suggestion for a specific day
         
+        Resamples from the plan's cached ranking when available; otherwise
+        rebuilds the day's scoring context and re-caches it.
+        
         Args:
             daily_slot: The DailyPlanSlot to regenerate
             
@@ -627,50 +739,62 @@ class WeeklyPlannerAI:
         weather_data = weekly_plan.weather_data
         day_offset = daily_slot.day_of_week
         
-        # Get available outfits, excluding currently assigned one
-        available_outfits = self._get_available_outfits()
-        current_outfit = daily_slot.primary_outfit
-        
-        if current_outfit:
-            available_outfits = [o for o in available_outfits if o.id != current_outfit.id]
-        
         # Get day context
         day_weather = self._get_day_weather(weather_data, day_offset)
         day_events = list(daily_slot.events.all())
-        wear_history = self._get_recent_wear_history()
         
-        # Score outfits
-        scored_outfits = []
-        for outfit in available_outfits:
-            scores = self._calculate_outfit_scores(
-                outfit, day_weather, day_events, wear_history, daily_slot.date
+        ranked_outfits = self._load_cached_ranking(weekly_plan, day_offset)
+        if ranked_outfits is None:
+            ranked_outfits = self._rank_outfits_for_day(
+                self._get_available_outfits(),
+                day_weather,
+                day_events,
+                self._get_recent_wear_history(),
+                daily_slot.date
             )
-            scored_outfits.append((outfit, scores))
+            weekly_plan.candidate_rankings = {
+                **(weekly_plan.candidate_rankings or {}),
+                str(day_offset): self._serialize_ranking(ranked_outfits),
+            }
+            weekly_plan.save(update_fields=['candidate_rankings'])
         
-        scored_outfits.sort(key=lambda x: x[1]['total'], reverse=True)
+        # Exclude currently assigned outfit
+        current_outfit_id = daily_slot.primary_outfit_id
+        scored_outfits = [(o, s) for o, s in ranked_outfits if o.id != current_outfit_id]
         
         if scored_outfits:
             # Use weighted random selection for variety
             new_outfit, scores = self._weighted_random_select(scored_outfits[:5])
             daily_slot.primary_outfit = new_outfit
-            daily_slot.selection_reason = self._generate_selection_reason(
-                new_outfit, scores, day_weather, day_events
-            )
-            daily_slot.confidence = scores['total']
-            daily_slot.weather_score = scores['weather']
-            daily_slot.occasion_score = scores['occasion']
-            daily_slot.recency_score = scores['recency']
-            daily_slot.style_score = scores['style']
+            self._apply_scores(daily_slot, new_outfit, scores, day_weather, day_events)
             daily_slot.status = 'suggested'
             
             # Update alternatives
-            alternatives = [o for o, _ in scored_outfits[1:4]]
+            alternatives = [o for o, _ in scored_outfits if o.id != new_outfit.id][:3]
             daily_slot.alternatives.set(alternatives)
             
             daily_slot.save()
         
         return daily_slot
     
+    def _apply_scores(
+        self,
+        daily_slot: DailyPlanSlot,
+        outfit: Outfit,
+        scores: Dict,
+        day_weather: Dict,
+        day_events: List[Event]
+    ):
+        """Copy an outfit's score breakdown and reasoning onto a slot"""
+        daily_slot.selection_reason = self._generate_selection_reason(
+            outfit, scores, day_weather, day_events
+        )
+        daily_slot.confidence = scores['total']
+        daily_slot.weather_score = scores['weather']
+        daily_slot.occasion_score = scores['occasion']
+        daily_slot.recency_score = scores['recency']
+        daily_slot.style_score = scores['style']
+    
     def accept_outfit(self, daily_slot: DailyPlanSlot) -> DailyPlanSlot:
         """Mark an outfit as accepted by user"""
         daily_slot.status = 'accepted'
@@ -697,6 +821,18 @@ class WeeklyPlannerAI:
         # Remove new primary from alternatives
         alternatives = [a for a in alternatives if a.id != alternative_outfit.id]
         
+        # Refresh the score breakdown from the cached ranking, if present
+        cached = (daily_slot.weekly_plan.candidate_rankings or {}).get(str(daily_slot.day_of_week), [])
+        scores = next(
+            (entry['scores'] for entry in cached if entry['outfit_id'] == str(alternative_outfit.id)),
+            None
+        )
+        if scores:
+            day_weather = self._get_day_weather(daily_slot.weekly_plan.weather_data, daily_slot.day_of_week)
+            self._apply_scores(
+                daily_slot, alternative_outfit, scores, day_weather, list(daily_slot.events.all())
+            )
+        
         daily_slot.alternatives.set(alternatives[:3])
         daily_slot.save()
         
@@ -1,3 +1,45 @@
+from unittest.mock import patch
+
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import User
+from wardrobe.models import ClothingCategory, ClothingItem
+
+
+@patch('planner.weather_service.WeatherService.get_current_weather', return_value=None)
+@patch('recommendations.views.OutfitRecommendationEngine')
+class DailyRecommendationsViewTests(TestCase):
+    """
+    The daily page's wardrobe analysis comes from WardrobeStatsService
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='premium', email='premium@example.com', password='x', role='premium'
+        )
+        tops = ClothingCategory.objects.create(name='Tops')
+        for i, (color, times_worn) in enumerate([('black', 0), ('black', 2), ('white', 0)]):
+            ClothingItem.objects.create(
+                user=cls.user,
+                name=f'Item {i}',
+                category=tops,
+                color=color,
+                times_worn=times_worn,
+                image=f'wardrobe/item{i}.jpg',
+            )
+
+    def test_wardrobe_analysis_is_filled_in(self, engine, weather):
+        engine.return_value.generate_weather_recommendations.return_value = []
+        engine.return_value.suggest_shopping_items.return_value = []
+        self.client.force_login(self.user)
+
+        response = self.client.get('/recommendations/daily/')
+
+        self.assertEqual(response.status_code, 200)
+        analysis = response.context['wardrobe_analysis']
+        self.assertEqual(analysis['total_items'], 3)
+        self.assertEqual(analysis['category_distribution'], {'Tops': 3})
+        self.assertEqual(analysis['color_distribution'], {'black': 2, 'white': 1})
+        self.assertEqual(len(analysis['underutilized_items']), 2)
+        self.assertNotEqual(analysis['wardrobe_health'], 'Loading...')
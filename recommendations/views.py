@@ -105,30 +105,19 @@ def daily_recommendations_view(request):
     }
     
     try:
-        from collections import defaultdict
-        items = ClothingItem.objects.filter(user=user, status='available')
+        from wardrobe.stats_service import WardrobeStatsService
         
-        category_counts = defaultdict(int)
-        color_counts = defaultdict(int)
-        underutilized = []
+        stats = WardrobeStatsService(user).get_stats()
         
-        for item in items:
-            if item.category:
-                category_counts[item.category.name] += 1
-            if item.color:
-                color_counts[item.color] += 1
-            if item.times_worn == 0:
-                underutilized.append(item)
-        
-        total_items = items.count()
+        total_items = stats['available_count']
         versatility_score = min(total_items / 20.0, 1.0) * 100
         
         wardrobe_analysis = {
             'total_items': total_items,
             'versatility_score': int(versatility_score),
-            'category_distribution': dict(category_counts),
-            'color_distribution': dict(color_counts),
-            'underutilized_items': underutilized[:5],
+            'category_distribution': stats['available_by_category'],
+            'color_distribution': stats['available_by_color'],
+            'underutilized_items': stats['never_worn'][:5],
             'wardrobe_health': 'Excellent' if versatility_score > 80 else 
                               'Good' if versatility_score > 50 else 'Needs Expansion'
         }
@@ -590,38 +579,24 @@ class RecommendationViewSet(viewsets.ModelViewSet):
         Analyze wardrobe for gaps and insights
         GET /api/recommendations/wardrobe_analysis/
         """
-        user = request.user
-        from collections import defaultdict
-        
-        # Get wardrobe items
-        items = ClothingItem.objects.filter(user=user, status='available')
+        from wardrobe.stats_service import WardrobeStatsService
         
-        # Analyze categories
-        category_counts = defaultdict(int)
-        color_counts = defaultdict(int)
-        underutilized = []
+        stats = WardrobeStatsService(request.user).get_stats()
         
-        for item in items:
-            if item.category:
-                category_counts[item.category.name] += 1
-            if item.color:
-                color_counts[item.color] += 1
-            if item.times_worn == 0:
-                underutilized.append({
-                    'id': str(item.id),
-                    'name': item.name,
-                    'category': item.category.name if item.category else None
-                })
+        underutilized = [
+            {'id': item['id'], 'name': item['name'], 'category': item['category']}
+            for item in stats['never_worn']
+        ]
         
         # Calculate versatility score
-        total_items = items.count()
+        total_items = stats['available_count']
         versatility_score = min(total_items / 20.0, 1.0)  # Scale: 20 items = 100%
         
         return Response({
             'total_items': total_items,
             'versatility_score': round(versatility_score * 100),
-            'category_distribution': dict(category_counts),
-            'color_distribution': dict(color_counts),
+            'category_distribution': stats['available_by_category'],
+            'color_distribution': stats['available_by_color'],
             'underutilized_items': underutilized[:10],
             'wardrobe_health': 'Excellent' if versatility_score > 0.8 else 
                               'Good' if versatility_score > 0.5 else 'Needs Expansion'
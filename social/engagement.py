@@ -0,0 +1,175 @@
+"""
+Post Engagement Service for Tailora
+
+Likes, saves and comments counters on LookbookPost are updated with atomic
+F() increments, never read-modify-write, so concurrent likes cannot lose
+updates.
+
+With settings.SOCIAL_ENGAGEMENT_WRITE_BEHIND enabled, counter deltas are
+coalesced in an in-process buffer (once their transaction commits) and
+written FLUSH_INTERVAL seconds after the first buffered change, one UPDATE
+per distinct delta instead of one per like on hot posts. Buffered deltas can be lost if a worker dies before a
+flush; the nightly reconcile_post_counters job recounts from
+PostLike/PostSave/PostComment and repairs any drift.
+"""
+
+import atexit
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import LookbookPost, PostLike, PostSave
+
+
+COUNTER_FIELDS = ('likes_count', 'saves_count', 'comments_count')
+
+
+class EngagementBuffer:
+    """
+    In-process write-behind buffer of post counter deltas
+    """
+
+    FLUSH_INTERVAL = 10  # Seconds between flushes
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        self._timer = None
+
+    def add(self, post_id, **deltas):
+        """Buffer deltas for a post; the first write schedules the next flush"""
+        with self._lock:
+            pending = self._deltas[post_id]
+            for field, delta in deltas.items():
+                pending[field] += delta
+            if self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_INTERVAL, self._scheduled_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _scheduled_flush(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own connection: don't leak it
+            connections.close_all()
+
+    def pending(self, post_id, field):
+        """Delta not yet written to the database"""
+        with self._lock:
+            return self._deltas[post_id][field] if post_id in self._deltas else 0
+
+    def flush(self):
+        """Write all buffered deltas, returns the number of posts updated"""
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        # Posts with the same deltas share one UPDATE
+        groups = defaultdict(list)
+        for post_id, pending in deltas.items():
+            key = tuple(pending[field] for field in COUNTER_FIELDS)
+            if any(key):
+                groups[key].append(post_id)
+
+        for key, post_ids in groups.items():
+            EngagementService.apply(post_ids, **dict(zip(COUNTER_FIELDS, key)))
+        return sum(len(post_ids) for post_ids in groups.values())
+
+
+_buffer = EngagementBuffer()
+atexit.register(_buffer.flush)
+
+
+class EngagementService:
+    """
+    Like/save toggles and post counters
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @staticmethod
+    def write_behind():
+        return getattr(settings, 'SOCIAL_ENGAGEMENT_WRITE_BEHIND', False)
+
+    @staticmethod
+    def apply(post_ids, **deltas):
+        """Atomically add deltas to the counters of posts (never below zero)"""
+        updates = {
+            field: Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items() if delta
+        }
+        if updates:
+            LookbookPost.objects.filter(pk__in=post_ids).update(**updates)
+
+    @classmethod
+    def adjust(cls, post, **deltas):
+        """
+        Add deltas to a post's counters, directly or through the buffer
+
+        Also updates the in-memory post so the caller can display the new
+        counts without another query.
+        """
+        if cls.write_behind():
+            # Buffered only once the like/save row is committed: a rollback
+            # must not leave its delta behind
+            transaction.on_commit(lambda: _buffer.add(post.pk, **deltas))
+            # The loaded value lags by everything still buffered for this post
+            for field, delta in deltas.items():
+                pending = _buffer.pending(post.pk, field)
+                setattr(post, field, max(0, getattr(post, field) + pending + delta))
+            return
+
+        cls.apply([post.pk], **deltas)
+        for field, delta in deltas.items():
+            setattr(post, field, max(0, getattr(post, field) + delta))
+
+    @staticmethod
+    def flush():
+        """Write buffered counter deltas now"""
+        return _buffer.flush()
+
+    def _toggle(self, model, post, field):
+        with transaction.atomic():
+            deleted, _ = model.objects.filter(user=self.user, post=post).delete()
+            if deleted:
+                active, delta = False, -1
+            else:
+                try:
+                    with transaction.atomic():
+                        model.objects.create(user=self.user, post=post)
+                    active, delta = True, 1
+                except IntegrityError:
+                    # A concurrent request got there first: already active, nothing to count
+                    active, delta = True, 0
+
+            if delta:
+                self.adjust(post, **{field: delta})
+        return active
+
+    def toggle_like(self, post):
+        """
+        Like or unlike a post
+
+        Returns:
+            tuple: (liked, likes_count)
+        """
+        liked = self._toggle(PostLike, post, 'likes_count')
+        return liked, post.likes_count
+
+    def toggle_save(self, post):
+        """
+        Save or unsave a post
+
+        Returns:
+            tuple: (saved, saves_count)
+        """
+        saved = self._toggle(PostSave, post, 'saves_count')
+        return saved, post.saves_count
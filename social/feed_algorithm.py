@@ -1,39 +1,124 @@
-from django.db.models import Q, Count, Exists, OuterRef
-from django.core.cache import cache
+import atexit
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
 from datetime import timedelta
 from django.utils import timezone
-from .models import LookbookPost, UserFollow, PostLike, PostSave
+from .hashtags import HashtagIndex
+from .ranking import TrendingRanker
+from .timeline import TimelineService, hydrate_posts
 
 
 class FeedAlgorithm:
     """
     Personalized feed algorithm for the social hub
+
+    Caches the post ids of each user's following feed, never the posts
+    themselves: posts, counts and the viewer's like/save flags are hydrated
+    fresh on every read. Cached ids are invalidated by social.signals when
+    a followed user posts or deletes, or when the user follows/unfollows.
+
+    The id cache is only used on in-memory or Redis backends: on anything
+    slower (e.g. the database cache) a hit costs more than reading the
+    timeline itself. Across processes it needs Redis (settings REDIS_URL),
+    or invalidations stay in the process that made them.
+
+    Hit/miss counts are kept in-process and added to the cache at most every
+    STATS_FLUSH_INTERVAL seconds, not on every read.
     """
-    
+
+    CACHE_TIMEOUT = 300
+    CACHED_POSTS = 100  # Ids cached per feed; longer pages bypass the cache
+
+    STATS_KEYS = {'hits': 'feed_cache_hits', 'misses': 'feed_cache_misses'}
+    STATS_FLUSH_INTERVAL = 30  # Seconds between counter writes to the cache
+
+    _stats = Counter()
+    _stats_lock = threading.Lock()
+    _stats_flushed_at = time.monotonic()
+
+    @staticmethod
+    def cache_enabled():
+        """Whether the default cache is fast enough to be worth a lookup"""
+        return isinstance(caches['default'], (LocMemCache, RedisCache))
+
+    @staticmethod
+    def cache_key(user_id):
+        return f'feed_ids_{user_id}'
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """Drop the cached feeds of these users once the transaction commits"""
+        keys = [cls.cache_key(user_id) for user_id in user_ids]
+        if keys:
+            # Before the commit, another process could re-cache the old feed
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def _count(cls, outcome):
+        with cls._stats_lock:
+            cls._stats[outcome] += 1
+            due = time.monotonic() - cls._stats_flushed_at >= cls.STATS_FLUSH_INTERVAL
+        if due:
+            cls.flush_stats()
+
+    @classmethod
+    def flush_stats(cls):
+        """Add this process's pending hit/miss counts to the cached totals"""
+        with cls._stats_lock:
+            pending, cls._stats = cls._stats, Counter()
+            cls._stats_flushed_at = time.monotonic()
+        for outcome, count in pending.items():
+            key = cls.STATS_KEYS[outcome]
+            cache.add(key, 0, None)
+            cache.incr(key, count)
+
+    @classmethod
+    def cache_stats(cls):
+        """Feed cache hits, misses and hit rate since the counters were last reset"""
+        cls.flush_stats()
+        counts = cache.get_many(cls.STATS_KEYS.values())
+        hits = counts.get(cls.STATS_KEYS['hits'], 0)
+        misses = counts.get(cls.STATS_KEYS['misses'], 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 3) if total else None,
+        }
+
+    @classmethod
+    def reset_cache_stats(cls):
+        with cls._stats_lock:
+            cls._stats = Counter()
+        cache.delete_many(list(cls.STATS_KEYS.values()))
+
+    def get_post_ids(self, user, limit=20):
+        """Ids of the user's feed posts, newest first (cached)"""
+        if limit > self.CACHED_POSTS or not self.cache_enabled():
+            return TimelineService(user).get_post_ids(limit=limit)
+
+        key = self.cache_key(user.id)
+        post_ids = cache.get(key)
+        if post_ids is None:
+            self._count('misses')
+            post_ids = TimelineService(user).get_post_ids(limit=self.CACHED_POSTS)
+            cache.set(key, post_ids, self.CACHE_TIMEOUT)
+        else:
+            self._count('hits')
+        return post_ids[:limit]
+
     def get_personalized_feed(self, user, limit=20):
         """Get personalized feed - posts from followed users and own posts"""
-        cache_key = f'feed_{user.id}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-
-        # Get IDs of users being followed
-        following_ids = UserFollow.objects.filter(
-            follower=user
-        ).values_list('following_id', flat=True)
-
-        # Get posts from followed users and own posts
-        posts = LookbookPost.objects.filter(
-            Q(user_id__in=following_ids) | Q(user=user),
-            visibility__in=['public', 'followers']
-        ).select_related('user', 'outfit').prefetch_related('likes', 'comments').annotate(
-            is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=user)),
-            is_saved=Exists(PostSave.objects.filter(post=OuterRef('pk'), user=user))
-        ).order_by('-created_at')[:limit]
-
-        # Cache for 5 minutes
-        cache.set(cache_key, posts, 300)
-        return posts
+        return hydrate_posts(self.get_post_ids(user, limit), user)
+
+
+atexit.register(FeedAlgorithm.flush_stats)
 
 
 class HashtagSystem:
@@ -49,16 +134,16 @@ class HashtagSystem:
 
     @staticmethod
     def get_trending_hashtags(limit=10):
-        """Get trending hashtags from recent posts"""
-        from collections import Counter
-        
-        recent_posts = LookbookPost.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).values_list('hashtags', flat=True)
-
-        all_hashtags = []
-        for tags in recent_posts:
-            if tags:
-                all_hashtags.extend(tags)
-
-        return Counter(all_hashtags).most_common(limit)
+        """Get trending hashtags from recent posts (precomputed by the rank_posts job)"""
+        return TrendingRanker.trending_hashtags(limit)
+
+    @staticmethod
+    def get_hashtag_posts(tag):
+        """Public posts using a hashtag, newest first"""
+        return HashtagIndex.posts(tag)
+
+    @staticmethod
+    def get_hashtag_count(tag, days=None):
+        """Number of public posts using a hashtag, optionally over the last days"""
+        since = timezone.now() - timedelta(days=days) if days else None
+        return HashtagIndex.count(tag, since)
@@ -0,0 +1,126 @@
+"""
+Follow Graph Cache for Tailora
+
+Each user's following and follower id sets are cached in a compact form:
+the UUIDs' 16 raw bytes, sorted and concatenated. Counts are then O(1)
+(length / 16) and membership and intersections are set operations in
+Python instead of UserFollow queries. Entries are invalidated by
+social.signals on follow and unfollow, once the transaction commits, in the
+shared cache (settings.CACHES).
+
+Use it for display (counts, follow buttons, "followed by"), not for access
+control: visibility checks query UserFollow so they never act on a stale set.
+"""
+
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UserFollow
+
+
+ID_SIZE = 16  # Bytes per packed UUID
+
+
+def pack_ids(ids) -> bytes:
+    """Sorted, de-duplicated ids packed as raw 16-byte UUIDs"""
+    return b''.join(sorted({uuid.UUID(str(user_id)).bytes for user_id in ids}))
+
+
+def unpack_ids(packed: bytes) -> frozenset:
+    return frozenset(
+        uuid.UUID(bytes=packed[offset:offset + ID_SIZE])
+        for offset in range(0, len(packed), ID_SIZE)
+    )
+
+
+class FollowGraph:
+    """
+    Cached follow graph lookups
+
+    One instance memoizes the sets it has loaded, so a view can ask many
+    questions about the same users for one cache read each.
+    """
+
+    CACHE_TIMEOUT = 3600
+
+    FOLLOWING = 'following'
+    FOLLOWERS = 'followers'
+
+    def __init__(self):
+        self._packed = {}
+        self._sets = {}
+
+    # ==================== Invalidation ====================
+
+    @staticmethod
+    def cache_key(direction, user_id):
+        return f"follow_graph_{direction}_{user_id}"
+
+    @classmethod
+    def invalidate(cls, follower_id, following_id):
+        """A follow between these users was created or removed"""
+        keys = [
+            cls.cache_key(cls.FOLLOWING, follower_id),
+            cls.cache_key(cls.FOLLOWERS, following_id),
+        ]
+        # Deleting before the commit would let a reader re-cache the old set
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    # ==================== Loading ====================
+
+    def _load(self, direction, user_id) -> bytes:
+        key = self.cache_key(direction, user_id)
+        packed = self._packed.get(key)
+        if packed is None:
+            packed = cache.get(key)
+        if packed is None:
+            if direction == self.FOLLOWING:
+                ids = UserFollow.objects.filter(follower_id=user_id).values_list('following_id', flat=True)
+            else:
+                ids = UserFollow.objects.filter(following_id=user_id).values_list('follower_id', flat=True)
+            packed = pack_ids(ids)
+            cache.set(key, packed, self.CACHE_TIMEOUT)
+        self._packed[key] = packed
+        return packed
+
+    def _ids(self, direction, user_id) -> frozenset:
+        key = self.cache_key(direction, user_id)
+        if key not in self._sets:
+            self._sets[key] = unpack_ids(self._load(direction, user_id))
+        return self._sets[key]
+
+    # ==================== Sets and counts ====================
+
+    def following_ids(self, user_id) -> frozenset:
+        """Ids of the users this user follows"""
+        return self._ids(self.FOLLOWING, user_id)
+
+    def follower_ids(self, user_id) -> frozenset:
+        """Ids of the users following this user"""
+        return self._ids(self.FOLLOWERS, user_id)
+
+    def following_count(self, user_id) -> int:
+        return len(self._load(self.FOLLOWING, user_id)) // ID_SIZE
+
+    def follower_count(self, user_id) -> int:
+        return len(self._load(self.FOLLOWERS, user_id)) // ID_SIZE
+
+    # ==================== Relationships ====================
+
+    def is_following(self, follower_id, following_id) -> bool:
+        return uuid.UUID(str(following_id)) in self.following_ids(follower_id)
+
+    def follow_states(self, viewer_id, user_ids) -> dict:
+        """Whether the viewer follows each user, for follow buttons"""
+        following = self.following_ids(viewer_id)
+        return {user_id: uuid.UUID(str(user_id)) in following for user_id in user_ids}
+
+    def mutual_ids(self, user_id) -> frozenset:
+        """Users who follow this user back"""
+        return self.following_ids(user_id) & self.follower_ids(user_id)
+
+    def followed_by_followed(self, viewer_id, user_id) -> frozenset:
+        """People the viewer follows who follow this user ("followed by ...")"""
+        return self.following_ids(viewer_id) & self.follower_ids(user_id)
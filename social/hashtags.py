@@ -0,0 +1,164 @@
+"""
+Hashtag Index for Tailora
+
+LookbookPost.hashtags stays the source of truth (a JSON list shown on the
+post); PostHashtag mirrors it as one row per (post, tag) with the post's
+author, visibility and creation date copied in, so tag pages, counts over
+a time window and top-tags queries run in SQL on the (hashtag, created_at)
+and (created_at) indexes instead of loading posts and iterating JSON.
+
+Maintained by social.signals on post save; bulk writers that bypass
+signals must call HashtagIndex.index_posts() themselves. Existing posts are
+indexed with the backfill_hashtags command.
+"""
+
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Hashtag, LookbookPost, PostHashtag
+
+
+class HashtagIndex:
+    """
+    Normalized hashtag index of lookbook posts
+    """
+
+    MAX_LENGTH = 100
+    BATCH_SIZE = 1000
+
+    @classmethod
+    def normalize(cls, tag) -> Optional[str]:
+        """'OOTD', '#ootd ' -> '#ootd'; None for empty or oversized tags"""
+        tag = str(tag).strip().lower().lstrip('#')
+        if not tag:
+            return None
+        tag = f'#{tag}'
+        return tag if len(tag) <= cls.MAX_LENGTH else None
+
+    @classmethod
+    def normalize_all(cls, tags) -> List[str]:
+        """Normalized, de-duplicated tags in their original order"""
+        seen = []
+        for tag in tags or []:
+            tag = cls.normalize(tag)
+            if tag and tag not in seen:
+                seen.append(tag)
+        return seen
+
+    # ==================== Writes ====================
+
+    @staticmethod
+    def _hashtag_ids(names) -> dict:
+        """Ids of these hashtags by name, creating the missing ones"""
+        names = set(names)
+        if not names:
+            return {}
+        Hashtag.objects.bulk_create([Hashtag(name=name) for name in names], ignore_conflicts=True)
+        return dict(Hashtag.objects.filter(name__in=names).values_list('name', 'id'))
+
+    @classmethod
+    def index_posts(cls, posts: Iterable[LookbookPost]) -> int:
+        """(Re)build the index rows of posts, returns rows written"""
+        posts = list(posts)
+        if not posts:
+            return 0
+
+        tags = {post.id: cls.normalize_all(post.hashtags) for post in posts}
+        hashtag_ids = cls._hashtag_ids(name for names in tags.values() for name in names)
+        links = [
+            PostHashtag(
+                post_id=post.id,
+                hashtag_id=hashtag_ids[name],
+                user_id=post.user_id,
+                visibility=post.visibility,
+                created_at=post.created_at,
+            )
+            for post in posts
+            for name in tags[post.id]
+        ]
+
+        with transaction.atomic():
+            PostHashtag.objects.filter(post_id__in=[post.id for post in posts]).delete()
+            PostHashtag.objects.bulk_create(links, batch_size=cls.BATCH_SIZE)
+        return len(links)
+
+    @classmethod
+    def sync(cls, post):
+        """Bring one post's index rows in line with its hashtags and visibility"""
+        wanted = set(cls.normalize_all(post.hashtags))
+        current = dict(
+            PostHashtag.objects.filter(post_id=post.id).values_list('hashtag__name', 'id')
+        )
+
+        removed = [link_id for name, link_id in current.items() if name not in wanted]
+        if removed:
+            PostHashtag.objects.filter(id__in=removed).delete()
+
+        PostHashtag.objects.filter(post_id=post.id).exclude(
+            visibility=post.visibility
+        ).update(visibility=post.visibility)
+
+        added = wanted - set(current)
+        if added:
+            hashtag_ids = cls._hashtag_ids(added)
+            PostHashtag.objects.bulk_create([
+                PostHashtag(
+                    post_id=post.id,
+                    hashtag_id=hashtag_ids[name],
+                    user_id=post.user_id,
+                    visibility=post.visibility,
+                    created_at=post.created_at,
+                )
+                for name in added
+            ], ignore_conflicts=True)
+
+    # ==================== Reads ====================
+
+    @classmethod
+    def _links(cls, since=None, user=None, public_only=True):
+        links = PostHashtag.objects.all()
+        if since is not None:
+            links = links.filter(created_at__gte=since)
+        if user is not None:
+            links = links.filter(user=user)
+        if public_only:
+            links = links.filter(visibility='public')
+        return links
+
+    @classmethod
+    def top_tags(cls, limit=10, since=None, user=None, public_only=True) -> List[tuple]:
+        """
+        Most used hashtags as (tag, count) pairs
+
+        Args:
+            limit: Number of tags
+            since: Only count posts created after this datetime
+            user: Only count this user's posts
+            public_only: Ignore followers-only and private posts
+        """
+        return list(
+            cls._links(since, user, public_only).values('hashtag__name').annotate(
+                uses=Count('id')
+            ).order_by('-uses', 'hashtag__name').values_list('hashtag__name', 'uses')[:limit]
+        )
+
+    @classmethod
+    def count(cls, tag, since=None) -> int:
+        """Number of public posts using a tag, optionally since a datetime"""
+        tag = cls.normalize(tag)
+        if not tag:
+            return 0
+        return cls._links(since).filter(hashtag__name=tag).count()
+
+    @classmethod
+    def posts(cls, tag):
+        """Public posts using a tag, newest first"""
+        tag = cls.normalize(tag)
+        if not tag:
+            return LookbookPost.objects.none()
+        return LookbookPost.objects.filter(
+            hashtag_links__hashtag__name=tag,
+            hashtag_links__visibility='public'
+        ).order_by('-hashtag_links__created_at')
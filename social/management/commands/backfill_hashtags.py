@@ -0,0 +1,53 @@
+"""
+Django Management Command: Backfill Hashtags
+
+Builds the PostHashtag index (social.hashtags) from LookbookPost.hashtags
+for existing posts. New and edited posts are indexed on save, so this is
+only needed once after the index is introduced, or to repair it.
+
+Usage:
+    # Index all posts
+    python manage.py backfill_hashtags
+
+    # Smaller batches
+    python manage.py backfill_hashtags --batch-size 200
+"""
+
+from django.core.management.base import BaseCommand
+
+from social.hashtags import HashtagIndex
+from social.models import LookbookPost
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the hashtag index of all lookbook posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Posts indexed per transaction (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        posts = LookbookPost.objects.only(
+            'id', 'user_id', 'hashtags', 'visibility', 'created_at'
+        ).order_by('pk')
+
+        self.stdout.write(f"🏷️ Indexing hashtags of {posts.count()} posts...")
+
+        indexed = 0
+        links = 0
+        batch = []
+        for post in posts.iterator(chunk_size=batch_size):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                links += HashtagIndex.index_posts(batch)
+                indexed += len(batch)
+                batch = []
+        links += HashtagIndex.index_posts(batch)
+        indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Done! Indexed {links} hashtags on {indexed} posts"))
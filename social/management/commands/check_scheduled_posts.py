@@ -1,31 +1,13 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from social.models import PostDraft, LookbookPost
+from social.publisher import ScheduledPostPublisher
 
 class Command(BaseCommand):
     help = 'Check and publish scheduled posts'
 
     def handle(self, *args, **options):
-        scheduled_posts = PostDraft.objects.filter(
-            status='scheduled',
-            scheduled_for__lte=timezone.now()
-        )
-
-        count = 0
-        for draft in scheduled_posts:
-            # Publish the draft
-            post = LookbookPost.objects.create(
-                user=draft.user,
-                outfit=draft.outfit,
-                caption=draft.caption,
-                hashtags=draft.hashtags,
-                enhanced_images=draft.enhanced_images,
-                visibility=draft.visibility
-            )
-            draft.status = 'published'
-            draft.save()
-            count += 1
+        published = ScheduledPostPublisher.publish_due()
 
+        for draft, post in published:
             self.stdout.write(f'Published: {post.id}')
 
-        self.stdout.write(self.style.SUCCESS(f'Published {count} scheduled posts'))
+        self.stdout.write(self.style.SUCCESS(f'Published {len(published)} scheduled posts'))
@@ -0,0 +1,47 @@
+"""
+Django Management Command: Compute Follow Suggestions
+
+Recomputes the "people to follow" shown on the community feed (see
+social.suggestions) from second-degree connections, shared hashtags and
+style profile similarity, keeping the top 20 per user.
+
+Usage:
+    # Recompute for all active users
+    python manage.py compute_follow_suggestions
+
+    # Recompute for one user
+    python manage.py compute_follow_suggestions --email user@example.com
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Nightly at 4:00 AM: 0 4 * * * cd /path/to/tailora && python manage.py compute_follow_suggestions
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from social.suggestions import SuggestionEngine
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Precompute follow suggestions for users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email',
+            type=str,
+            help='Only compute suggestions for this user'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        email = options.get('email')
+        if email:
+            users = users.filter(email=email)
+            if not users.exists():
+                raise CommandError(f"No active user with email '{email}'")
+
+        self.stdout.write('🤝 Loading follow graph, hashtags and style profiles...')
+        result = SuggestionEngine().run(users)
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! Stored {result['suggestions']} suggestions for {result['users']} users"
+        ))
@@ -0,0 +1,43 @@
+"""
+Django Management Command: Feed Cache Stats
+
+Reports the hit rate of the following-feed id cache (FeedAlgorithm).
+Web processes add their counts to the cache every
+FeedAlgorithm.STATS_FLUSH_INTERVAL seconds, so totals can lag by that much.
+The counts only reach this command through a shared cache (REDIS_URL).
+
+Usage:
+    # Show hits, misses and hit rate
+    python manage.py feed_cache_stats
+
+    # Show, then reset the counters
+    python manage.py feed_cache_stats --reset
+"""
+
+from django.core.management.base import BaseCommand
+
+from social.feed_algorithm import FeedAlgorithm
+
+
+class Command(BaseCommand):
+    help = 'Show feed cache hit/miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after reporting'
+        )
+
+    def handle(self, *args, **options):
+        stats = FeedAlgorithm.cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else 'n/a'
+
+        self.stdout.write(self.style.NOTICE('📊 Feed cache'))
+        self.stdout.write(f"  Hits:     {stats['hits']}")
+        self.stdout.write(f"  Misses:   {stats['misses']}")
+        self.stdout.write(f"  Hit rate: {hit_rate}")
+
+        if options['reset']:
+            FeedAlgorithm.reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from social.models import PostDraft, LookbookPost
+from social.publisher import ScheduledPostPublisher
 
 
 class Command(BaseCommand):
@@ -20,10 +20,7 @@ class Command(BaseCommand):
         self.stdout.write(f'Checking scheduled posts at {now}...')
 
         # Find all scheduled drafts that are due
-        scheduled_drafts = PostDraft.objects.filter(
-            status='scheduled',
-            scheduled_for__lte=now
-        ).select_related('user', 'outfit')
+        scheduled_drafts = ScheduledPostPublisher.due(now).select_related('user', 'outfit')
 
         count = scheduled_drafts.count()
 
@@ -33,43 +30,20 @@ class Command(BaseCommand):
 
         self.stdout.write(f'Found {count} scheduled post(s) to publish...')
 
-        published = 0
-        errors = 0
-
-        for draft in scheduled_drafts:
-            try:
-                if dry_run:
-                    self.stdout.write(
-                        f'  [DRY RUN] Would publish: "{draft.outfit.name}" by {draft.user.email}'
-                    )
-                else:
-                    # Create the post
-                    post = LookbookPost.objects.create(
-                        user=draft.user,
-                        outfit=draft.outfit,
-                        caption=draft.caption,
-                        hashtags=draft.hashtags,
-                        enhanced_images=draft.enhanced_images,
-                        visibility=draft.visibility
-                    )
-
-                    # Mark draft as published
-                    draft.status = 'published'
-                    draft.save()
-
-                    self.stdout.write(
-                        self.style.SUCCESS(f'  ✓ Published: "{draft.outfit.name}" by {draft.user.email}')
-                    )
-
-                published += 1
-
-            except Exception as e:
-                errors += 1
+        if dry_run:
+            for draft in scheduled_drafts:
                 self.stdout.write(
-                    self.style.ERROR(f'  ✗ Error publishing draft {draft.id}: {e}')
+                    f'  [DRY RUN] Would publish: "{draft.outfit.name}" by {draft.user.email}'
                 )
+            self.stdout.write(self.style.WARNING(f'\n[DRY RUN] Would have published {count} posts.'))
+            return
 
-        if dry_run:
-            self.stdout.write(self.style.WARNING(f'\n[DRY RUN] Would have published {published} posts.'))
-        else:
-            self.stdout.write(self.style.SUCCESS(f'\nDone! Published {published} posts, {errors} errors.'))
+        published = ScheduledPostPublisher.publish_due(now)
+        for draft, post in published:
+            self.stdout.write(
+                self.style.SUCCESS(f'  ✓ Published: "{draft.outfit.name}" by {draft.user.email}')
+            )
+
+        # Drafts that are still due failed to publish (see the log for errors)
+        errors = ScheduledPostPublisher.due(now).count()
+        self.stdout.write(self.style.SUCCESS(f'\nDone! Published {len(published)} posts, {errors} errors.'))
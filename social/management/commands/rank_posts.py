@@ -0,0 +1,28 @@
+"""
+Django Management Command: Rank Posts
+
+Recomputes the time-decayed trending score of recent public posts and the
+trending hashtags used by the discover page (see social.ranking).
+
+Usage:
+    # Recompute scores and trending hashtags
+    python manage.py rank_posts
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Every 5 minutes: */5 * * * * cd /path/to/tailora && python manage.py rank_posts
+"""
+
+from django.core.management.base import BaseCommand
+
+from social.ranking import TrendingRanker
+
+
+class Command(BaseCommand):
+    help = 'Recompute trending scores for discovery and trending hashtags'
+
+    def handle(self, *args, **options):
+        self.stdout.write('📈 Ranking recent public posts...')
+        result = TrendingRanker.rank()
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! Scored {result['scored']} posts, expired {result['expired']}"
+        ))
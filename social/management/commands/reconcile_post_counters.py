@@ -0,0 +1,82 @@
+"""
+Django Management Command: Reconcile Post Counters
+
+Post engagement counters (likes, saves, comments) are maintained
+incrementally by social.engagement, optionally through a write-behind
+buffer. Lost buffered deltas or writes that bypass the service can make
+them drift; this command recounts them from PostLike, PostSave and
+PostComment and repairs any post whose counters are off.
+
+Usage:
+    # Repair all posts
+    python manage.py reconcile_post_counters
+
+    # Only report drifted posts
+    python manage.py reconcile_post_counters --dry-run
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Nightly at 3:30 AM: 30 3 * * * cd /path/to/tailora && python manage.py reconcile_post_counters
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from social.models import LookbookPost, PostComment, PostLike, PostSave
+
+
+def counted(model):
+    """Correlated COUNT(*) of model rows attached to the outer post"""
+    counts = model.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def actual_counts():
+    return {
+        'likes_count': counted(PostLike),
+        'saves_count': counted(PostSave),
+        'comments_count': counted(PostComment),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Recount post likes/saves/comments counters and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted posts without writing'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Posts repaired per UPDATE (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        counts = actual_counts()
+
+        drift = Q()
+        for field in counts:
+            drift |= ~Q(**{field: F(f'actual_{field}')})
+
+        drifted = list(
+            LookbookPost.objects.annotate(
+                **{f'actual_{field}': expression for field, expression in counts.items()}
+            ).filter(drift).values_list('pk', flat=True)
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"[DRY RUN] {len(drifted)} posts have drifted counters")
+            return
+
+        batch_size = max(1, options['batch_size'])
+        for start in range(0, len(drifted), batch_size):
+            # Recount at write time so concurrent likes are not lost
+            LookbookPost.objects.filter(pk__in=drifted[start:start + batch_size]).update(**actual_counts())
+
+        self.stdout.write(self.style.SUCCESS(f"Done! Repaired counters for {len(drifted)} posts"))
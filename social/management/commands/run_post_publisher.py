@@ -0,0 +1,70 @@
+"""
+Django Management Command: Run Post Publisher
+
+Long-running worker that publishes scheduled drafts as they fall due
+(see social.publisher). Several workers can run at once: each claims
+different drafts, so nothing is posted twice.
+
+Usage:
+    # Run forever, polling every 15 seconds
+    python manage.py run_post_publisher
+
+    # Poll every 5 seconds
+    python manage.py run_post_publisher --interval 5
+
+    # Publish what is due now and exit (e.g. from cron)
+    python manage.py run_post_publisher --once
+
+Run under a process supervisor (systemd, supervisord) in production:
+    ExecStart=/path/to/venv/bin/python /path/to/tailora/manage.py run_post_publisher
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from social.publisher import ScheduledPostPublisher
+
+
+class Command(BaseCommand):
+    help = 'Publish scheduled drafts as they fall due (long-running worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=ScheduledPostPublisher.POLL_INTERVAL,
+            help=f'Seconds between polls (default: {ScheduledPostPublisher.POLL_INTERVAL})'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Publish due drafts once and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            published = self.publish()
+            self.stdout.write(self.style.SUCCESS(f"Done! Published {published} scheduled posts"))
+            return
+
+        interval = max(1.0, options['interval'])
+        self.stdout.write(f"📬 Post publisher started (polling every {interval:g}s, Ctrl+C to stop)")
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    self.publish()
+                except Exception as e:
+                    # Keep polling through transient database errors
+                    self.stdout.write(self.style.ERROR(f'  ✗ Publish run failed: {e}'))
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Post publisher stopped'))
+
+    def publish(self):
+        published = ScheduledPostPublisher.publish_due()
+        for draft, post in published:
+            self.stdout.write(f'  ✓ Published {post.id} from draft {draft.id} ({draft.user.email})')
+        return len(published)
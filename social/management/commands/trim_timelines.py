@@ -0,0 +1,59 @@
+"""
+Django Management Command: Trim Timelines
+
+Caps every user's materialized following feed at TimelineService.MAX_ENTRIES
+entries, or rebuilds timelines from the follow graph.
+
+Usage:
+    # Trim all timelines
+    python manage.py trim_timelines
+
+    # Rebuild one user's timeline from scratch
+    python manage.py trim_timelines --rebuild --email user@example.com
+
+    # Rebuild everyone's timeline
+    python manage.py trim_timelines --rebuild
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Every hour: 0 * * * * cd /path/to/tailora && python manage.py trim_timelines
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from social.timeline import TimelineService
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Trim following-feed timelines to their maximum length, or rebuild them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Rebuild timelines from the follow graph instead of trimming'
+        )
+        parser.add_argument(
+            '--email',
+            type=str,
+            help='Only process this user'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        email = options.get('email')
+        if email:
+            users = users.filter(email=email)
+            if not users.exists():
+                raise CommandError(f"No user with email '{email}'")
+
+        if options['rebuild']:
+            total = 0
+            for user in users.iterator():
+                total += TimelineService.rebuild(user)
+            self.stdout.write(self.style.SUCCESS(f"Done! Rebuilt timelines with {total} entries"))
+            return
+
+        owner_ids = users.values_list('id', flat=True) if email else None
+        deleted = TimelineService.trim(owner_ids)
+        self.stdout.write(self.style.SUCCESS(f"Done! Trimmed {deleted} timeline entries"))
@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-18 21:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_timelines(apps, schema_editor):
+    """Materialize every user's following feed (latest 500 posts)"""
+    User = apps.get_model('users', 'User')
+    UserFollow = apps.get_model('social', 'UserFollow')
+    LookbookPost = apps.get_model('social', 'LookbookPost')
+    TimelineEntry = apps.get_model('social', 'TimelineEntry')
+
+    for user_id in User.objects.values_list('id', flat=True).iterator():
+        authors = list(
+            UserFollow.objects.filter(follower_id=user_id).values_list('following_id', flat=True)
+        ) + [user_id]
+        recent = LookbookPost.objects.filter(
+            user_id__in=authors,
+            visibility__in=['public', 'followers']
+        ).order_by('-created_at').values_list('id', 'user_id', 'created_at')[:500]
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(owner_id=user_id, post_id=post_id, author_id=author_id, created_at=created_at)
+            for post_id, author_id, created_at in recent
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0005_add_enhancement_style'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='social.lookbookpost')),
+            ],
+            options={
+                'db_table': 'timeline_entries',
+                'indexes': [models.Index(fields=['owner', '-created_at'], name='timeline_en_owner_i_231075_idx'), models.Index(fields=['owner', 'author'], name='timeline_en_owner_i_4da6fc_idx')],
+                'unique_together': {('owner', 'post')},
+            },
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-18 21:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0005_alter_userbadge_user'),
+        ('social', '0006_timelineentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lookbookpost',
+            name='trending_score',
+            field=models.FloatField(default=1.0),
+        ),
+        migrations.AddIndex(
+            model_name='lookbookpost',
+            index=models.Index(fields=['visibility', '-trending_score'], name='lookbook_po_visibil_4ee697_idx'),
+        ),
+    ]
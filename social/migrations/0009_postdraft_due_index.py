@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-18 21:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outfits', '0005_alter_userbadge_user'),
+        ('social', '0008_hashtag_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='postdraft',
+            index=models.Index(fields=['status', 'scheduled_for'], name='post_drafts_status_3fe42e_idx'),
+        ),
+    ]
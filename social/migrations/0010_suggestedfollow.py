@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-18 21:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0009_postdraft_due_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuggestedFollow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('reason', models.CharField(choices=[('network', 'Followed by people you follow'), ('hashtags', 'Uses your hashtags'), ('style', 'Similar style'), ('popular', 'Popular creator')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('suggested', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follow_suggestions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'suggested_follows',
+                'indexes': [models.Index(fields=['user', '-score'], name='suggested_f_user_id_9a3737_idx')],
+                'unique_together': {('user', 'suggested')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0011_create_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postdraft',
+            name='publish_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='postdraft',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Brouillon'), ('scheduled', 'Programmé'), ('published', 'Publié'), ('failed', 'Échec')], default='draft', max_length=20),
+        ),
+    ]
@@ -56,6 +56,10 @@ class LookbookPost(models.Model):
     comments_count = models.IntegerField(default=0)
     saves_count = models.IntegerField(default=0)
     
+    # Time-decayed engagement score for discovery, recomputed by the rank_posts job
+    # (1.0 is the score of a brand-new post with no engagement)
+    trending_score = models.FloatField(default=1.0)
+    
     # Optional: Link to style challenge
     challenge = models.ForeignKey('StyleChallenge', on_delete=models.SET_NULL, null=True, blank=True, related_name='submissions')
     
@@ -71,12 +75,104 @@ class LookbookPost(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['visibility', '-created_at']),
+            models.Index(fields=['visibility', '-trending_score']),
         ]
     
     def __str__(self):
         return f"Post by {self.user.email} - {self.outfit.name}"
 
 
+class TimelineEntry(models.Model):
+    """
+    Materialized "following" feed: one row per post in each reader's timeline
+    Written on post creation (fan-out on write) by social.timeline
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries')
+    post = models.ForeignKey(LookbookPost, on_delete=models.CASCADE, related_name='timeline_entries')
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField()  # Copied from the post: the timeline sort key
+    
+    class Meta:
+        db_table = 'timeline_entries'
+        unique_together = [['owner', 'post']]
+        indexes = [
+            models.Index(fields=['owner', '-created_at']),
+            models.Index(fields=['owner', 'author']),
+        ]
+    
+    def __str__(self):
+        return f"Post {self.post_id} in {self.owner_id}'s timeline"
+
+
+class Hashtag(models.Model):
+    """
+    Normalized hashtag, e.g. "#ootd" (lowercase, with the leading #)
+    """
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'hashtags'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class PostHashtag(models.Model):
+    """
+    Relational index of LookbookPost.hashtags: one row per tag of each post
+    Kept in sync on post save by social.hashtags
+    """
+    post = models.ForeignKey(LookbookPost, on_delete=models.CASCADE, related_name='hashtag_links')
+    hashtag = models.ForeignKey(Hashtag, on_delete=models.CASCADE, related_name='post_links')
+    # Copied from the post so tag pages and counts don't join lookbook_posts
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    visibility = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'post_hashtags'
+        unique_together = [['post', 'hashtag']]
+        indexes = [
+            models.Index(fields=['hashtag', '-created_at']),
+            models.Index(fields=['created_at']),
+            models.Index(fields=['user', 'hashtag']),
+        ]
+
+    def __str__(self):
+        return f"{self.hashtag_id} on post {self.post_id}"
+
+
+class SuggestedFollow(models.Model):
+    """
+    Precomputed "people to follow" for a user (top SuggestionEngine.MAX_SUGGESTIONS)
+    Written by the compute_follow_suggestions job, read by the community feed
+    """
+    REASON_CHOICES = [
+        ('network', 'Followed by people you follow'),
+        ('hashtags', 'Uses your hashtags'),
+        ('style', 'Similar style'),
+        ('popular', 'Popular creator'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='follow_suggestions')
+    suggested = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)  # Strongest signal
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'suggested_follows'
+        unique_together = [['user', 'suggested']]
+        indexes = [
+            models.Index(fields=['user', '-score']),
+        ]
+    
+    def __str__(self):
+        return f"Suggest {self.suggested_id} to {self.user_id} ({self.reason})"
+
+
 class PostLike(models.Model):
     """
     Likes on lookbook posts
@@ -193,6 +289,7 @@ class PostDraft(models.Model):
         ('draft', 'Brouillon'),
         ('scheduled', 'Programmé'),
         ('published', 'Publié'),
+        ('failed', 'Échec'),
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -214,6 +311,7 @@ class PostDraft(models.Model):
     # Scheduling
     scheduled_for = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
+    publish_attempts = models.PositiveSmallIntegerField(default=0)  # Failed publishes so far
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
@@ -224,20 +322,29 @@ class PostDraft(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Brouillon de Publication'
         verbose_name_plural = 'Brouillons de Publication'
+        indexes = [
+            # Due scheduled drafts, polled by the publisher worker
+            models.Index(fields=['status', 'scheduled_for']),
+        ]
     
     def __str__(self):
         return f"Draft by {self.user.email} - {self.status}"
     
-    def publish(self):
-        """Convert draft to published post"""
-        post = LookbookPost.objects.create(
-            user=self.user,
-            outfit=self.outfit,
+    def build_post(self):
+        """Unsaved LookbookPost with this draft's content"""
+        return LookbookPost(
+            user_id=self.user_id,
+            outfit_id=self.outfit_id,
             caption=self.caption,
             hashtags=self.hashtags,
             enhanced_images=self.enhanced_images,
             visibility=self.visibility
         )
+    
+    def publish(self):
+        """Convert draft to published post"""
+        post = self.build_post()
+        post.save()
         
         self.status = 'published'
         self.save()
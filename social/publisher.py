@@ -0,0 +1,180 @@
+"""
+Scheduled Post Publisher for Tailora
+
+The one place due scheduled drafts are turned into posts. It is driven by
+the run_post_publisher worker command; the manual/AJAX checks and the
+legacy commands and tasks all call it too, so nothing publishes inside an
+unrelated user's request.
+
+Drafts are claimed with select_for_update(skip_locked=True), so several
+workers can run side by side and each takes a different batch. The claim
+is confirmed by a conditional UPDATE of the drafts' status. That makes
+double-posting impossible even on databases without row locks (SQLite
+ignores select_for_update).
+
+A batch is published in one transaction: posts are bulk_created and drafts
+bulk-updated. bulk_create skips post_save, so the work social.signals and
+users.signals do per post runs once for the whole batch instead: user post
+counters, timeline fan-out, hashtag indexing and post badges.
+
+A draft that fails to publish counts an attempt and is not retried in the
+same run. Drafts with failed attempts sort after healthy ones, so they
+can't hold back newer drafts. After MAX_ATTEMPTS a draft is marked
+'failed' and is no longer due.
+"""
+
+import logging
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import User
+
+from .feed_algorithm import FeedAlgorithm
+from .hashtags import HashtagIndex
+from .models import LookbookPost, PostDraft
+from .timeline import TimelineService
+from .utils.post_badges import PostBadgeSystem
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledPostPublisher:
+    """
+    Publishes due scheduled drafts
+    """
+
+    BATCH_SIZE = 200  # Drafts claimed and published per transaction
+    POLL_INTERVAL = 15  # Seconds between worker polls
+    MAX_ATTEMPTS = 3  # Failed publishes before a draft is given up on
+
+    @staticmethod
+    def due(now=None, user=None):
+        """Scheduled drafts whose time has come, oldest first, previously failed ones last"""
+        drafts = PostDraft.objects.filter(
+            status='scheduled',
+            scheduled_for__isnull=False,
+            scheduled_for__lte=now or timezone.now()
+        )
+        if user is not None:
+            drafts = drafts.filter(user=user)
+        return drafts.order_by('publish_attempts', 'scheduled_for')
+
+    @classmethod
+    def publish_due(cls, now=None, user=None):
+        """
+        Publish all due drafts, batch by batch
+
+        Args:
+            now: Publish drafts scheduled up to this time (default: now)
+            user: Only publish this user's drafts
+
+        Returns:
+            list: (draft, post) pairs that were published
+        """
+        now = now or timezone.now()
+        published = []
+        failed = set()  # Not retried in this run
+        while True:
+            claimed, batch = cls._publish_batch(now, user, failed)
+            if batch is None:
+                continue  # Lost a race for some drafts: claim again
+            published.extend(batch)
+            if claimed < cls.BATCH_SIZE:
+                return published
+
+    @classmethod
+    def _publish_batch(cls, now, user, failed):
+        """
+        Claim and publish one batch, skipping drafts that failed in this run
+
+        Returns:
+            tuple: (drafts claimed, published pairs), or (drafts claimed, None)
+            when another worker took some of the drafts first
+        """
+        with transaction.atomic():
+            drafts = list(
+                cls.due(now, user).exclude(pk__in=failed)
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('user', 'outfit')[:cls.BATCH_SIZE]
+            )
+            if not drafts:
+                return 0, []
+
+            try:
+                with transaction.atomic():
+                    if not cls._claim(drafts):
+                        transaction.set_rollback(True)
+                        return len(drafts), None
+                    posts = cls._create_posts(drafts)
+            except Exception as e:
+                # One bad draft must not hold back the batch: publish one by one
+                logger.error(f"Batch publish failed, retrying drafts one by one: {e}")
+                return len(drafts), cls._publish_each(drafts, failed)
+
+        logger.info(f"Published {len(posts)} scheduled posts")
+        return len(drafts), list(zip(drafts, posts))
+
+    @staticmethod
+    def _claim(drafts):
+        """Mark drafts published, only if they all still are scheduled"""
+        claimed = PostDraft.objects.filter(
+            pk__in=[draft.pk for draft in drafts],
+            status='scheduled'
+        ).update(status='published', updated_at=timezone.now())
+        for draft in drafts:
+            draft.status = 'published'
+        return claimed == len(drafts)
+
+    @staticmethod
+    def _create_posts(drafts):
+        """bulk_create the drafts' posts and do what post_save would have done"""
+        posts = LookbookPost.objects.bulk_create([draft.build_post() for draft in drafts])
+
+        for user_id, count in Counter(post.user_id for post in posts).items():
+            User.adjust_counters(user_id, posts_count=count)
+
+        readers = TimelineService.fan_out(posts)
+        transaction.on_commit(lambda: FeedAlgorithm.invalidate(readers))
+
+        HashtagIndex.index_posts(posts)
+
+        for post in posts:
+            PostBadgeSystem.update_post_badge(post)
+        return posts
+
+    @classmethod
+    def _publish_each(cls, drafts, failed):
+        """Publish drafts one at a time (signals handle the side effects)"""
+        published = []
+        for draft in drafts:
+            try:
+                with transaction.atomic():
+                    if not PostDraft.objects.filter(pk=draft.pk, status='scheduled').update(
+                        status='published', updated_at=timezone.now()
+                    ):
+                        continue  # Another worker published it
+                    draft.status = 'published'
+                    post = draft.build_post()
+                    post.save()
+                published.append((draft, post))
+                logger.info(f"Published scheduled post {post.id} from draft {draft.id}")
+            except Exception as e:
+                logger.error(f"Error publishing draft {draft.id}: {e}")
+                failed.add(draft.pk)
+                cls._record_failure(draft)
+        return published
+
+    @classmethod
+    def _record_failure(cls, draft):
+        """Count a failed attempt; mark the draft failed after MAX_ATTEMPTS"""
+        draft.publish_attempts += 1
+        draft.status = 'failed' if draft.publish_attempts >= cls.MAX_ATTEMPTS else 'scheduled'
+        PostDraft.objects.filter(pk=draft.pk, status='scheduled').update(
+            status=draft.status,
+            publish_attempts=draft.publish_attempts,
+            updated_at=timezone.now()
+        )
+        if draft.status == 'failed':
+            logger.warning(f"Giving up on draft {draft.id} after {draft.publish_attempts} attempts")
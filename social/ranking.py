@@ -0,0 +1,126 @@
+"""
+Discovery Ranking for Tailora
+
+Public posts are ranked for the discover page by a time-decayed engagement
+score stored in LookbookPost.trending_score:
+
+    score = (1 + likes * LIKE_WEIGHT + saves * SAVE_WEIGHT + comments * COMMENT_WEIGHT)
+            * 0.5 ** (age_hours / HALF_LIFE_HOURS)
+
+so a post needs twice the engagement to keep its place every HALF_LIFE_HOURS
+and old popular posts stop dominating. Scores are recomputed in batches by
+the rank_posts command (every few minutes); discover reads the top of the
+(visibility, -trending_score) index. Posts older than WINDOW_DAYS get a zero
+score.
+
+The same run caches the trending hashtags, counted in SQL over the
+PostHashtag index (social.hashtags). Web processes only see the job's
+result through a shared cache (REDIS_URL); otherwise, or if the job stops,
+the first reader recounts and caches them for a few minutes.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .hashtags import HashtagIndex
+from .models import LookbookPost
+
+
+class TrendingRanker:
+    """
+    Computes trending scores and trending hashtags
+    """
+
+    LIKE_WEIGHT = 1.0
+    SAVE_WEIGHT = 2.0  # Saving is a stronger signal than liking
+    COMMENT_WEIGHT = 1.5
+    HALF_LIFE_HOURS = 24
+
+    WINDOW_DAYS = 14  # Older posts are not ranked
+    HASHTAG_WINDOW_DAYS = 7
+    BATCH_SIZE = 500
+
+    TRENDING_HASHTAGS_KEY = 'social_trending_hashtags'
+    TRENDING_HASHTAGS_CACHED = 50
+    TRENDING_HASHTAGS_TIMEOUT = 3600  # Falls back to a live count if the job stops
+    TRENDING_HASHTAGS_FALLBACK_TIMEOUT = 300  # Live counts cached until the job catches up
+
+    @classmethod
+    def score(cls, likes, saves, comments, created_at, now=None):
+        """Time-decayed engagement score of a post"""
+        now = now or timezone.now()
+        age_hours = max((now - created_at).total_seconds() / 3600, 0)
+        engagement = 1 + likes * cls.LIKE_WEIGHT + saves * cls.SAVE_WEIGHT + comments * cls.COMMENT_WEIGHT
+        return engagement * 0.5 ** (age_hours / cls.HALF_LIFE_HOURS)
+
+    @classmethod
+    def rank(cls):
+        """
+        Recompute trending scores and trending hashtags
+
+        Returns:
+            dict: Number of posts scored and expired
+        """
+        now = timezone.now()
+        window_start = now - timedelta(days=cls.WINDOW_DAYS)
+
+        batch = []
+        scored = 0
+        recent = LookbookPost.objects.filter(
+            visibility='public',
+            created_at__gte=window_start
+        ).values_list('id', 'likes_count', 'saves_count', 'comments_count', 'created_at')
+
+        for post_id, likes, saves, comments, created_at in recent.iterator(chunk_size=cls.BATCH_SIZE):
+            batch.append(LookbookPost(
+                id=post_id,
+                trending_score=cls.score(likes, saves, comments, created_at, now)
+            ))
+            if len(batch) >= cls.BATCH_SIZE:
+                scored += cls._save_scores(batch)
+                batch = []
+        scored += cls._save_scores(batch)
+
+        # Posts that left the window (or became non-public) drop out of discover
+        expired = LookbookPost.objects.filter(trending_score__gt=0).exclude(
+            visibility='public', created_at__gte=window_start
+        ).update(trending_score=0)
+
+        cache.set(
+            cls.TRENDING_HASHTAGS_KEY,
+            cls._count_trending_hashtags(cls.TRENDING_HASHTAGS_CACHED, now),
+            cls.TRENDING_HASHTAGS_TIMEOUT
+        )
+        return {'scored': scored, 'expired': expired}
+
+    @staticmethod
+    def _save_scores(posts):
+        if posts:
+            LookbookPost.objects.bulk_update(posts, ['trending_score'])
+        return len(posts)
+
+    @classmethod
+    def _count_trending_hashtags(cls, limit, now=None):
+        since = (now or timezone.now()) - timedelta(days=cls.HASHTAG_WINDOW_DAYS)
+        return HashtagIndex.top_tags(limit=limit, since=since)
+
+    @classmethod
+    def trending_hashtags(cls, limit=10):
+        """Top hashtags of public posts from the last HASHTAG_WINDOW_DAYS as (tag, count) pairs"""
+        if limit > cls.TRENDING_HASHTAGS_CACHED:
+            return cls._count_trending_hashtags(limit)
+        hashtags = cache.get(cls.TRENDING_HASHTAGS_KEY)
+        if hashtags is None:
+            hashtags = cls._count_trending_hashtags(cls.TRENDING_HASHTAGS_CACHED)
+            # add() so a concurrent rank() result is not overwritten
+            cache.add(cls.TRENDING_HASHTAGS_KEY, hashtags, cls.TRENDING_HASHTAGS_FALLBACK_TIMEOUT)
+        return hashtags[:limit]
+
+    @staticmethod
+    def top_posts(queryset=None):
+        """Public posts ordered by trending score, newest first on ties"""
+        if queryset is None:
+            queryset = LookbookPost.objects.all()
+        return queryset.filter(visibility='public').order_by('-trending_score', '-created_at')
@@ -65,37 +65,39 @@ class LookbookPostSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     outfit = OutfitSerializer(read_only=True)
     outfit_id = serializers.UUIDField(write_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     is_saved = serializers.SerializerMethodField()
     
     class Meta:
         model = LookbookPost
         fields = [
-            'id', 'user', 'outfit', 'outfit_id', 'caption', 'image',
-            'likes_count', 'comments_count', 'is_liked', 'is_saved',
+            'id', 'user', 'outfit', 'outfit_id', 'caption', 'hashtags', 'visibility',
+            'likes_count', 'comments_count', 'saves_count', 'is_liked', 'is_saved',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'user', 'likes_count', 'comments_count', 'saves_count',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'user', 'likes_count', 'comments_count', 'created_at', 'updated_at']
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
+    # Counts come from the denormalized counters on the post; is_liked/is_saved
+    # from the viewset's Exists annotations (LookbookPostViewSet.annotate_viewer),
+    # falling back to a query for posts loaded without them.
 
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    def _viewer_flag(self, obj, attr, model):
+        flag = getattr(obj, attr, None)
+        if flag is not None:
+            return flag
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            return model.objects.filter(post=obj, user=request.user).exists()
+        return False
 
     def get_is_liked(self, obj):
-        user = self.context.get('request').user
-        if user.is_authenticated:
-            return PostLike.objects.filter(post=obj, user=user).exists()
-        return False
+        return self._viewer_flag(obj, 'is_liked', PostLike)
 
     def get_is_saved(self, obj):
-        user = self.context.get('request').user
-        if user.is_authenticated:
-            return PostSave.objects.filter(post=obj, user=user).exists()
-        return False
+        return self._viewer_flag(obj, 'is_saved', PostSave)
     
     def create(self, validated_data):
         user = self.context['request'].user
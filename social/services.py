@@ -3,7 +3,6 @@ import random
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.core.cache import cache
-from collections import Counter
 
 
 class AIEngagementOptimizer:
@@ -304,17 +303,11 @@ class AIEngagementOptimizer:
 
     def _get_user_top_hashtags(self):
         """Get user's top performing hashtags"""
-        from .models import LookbookPost
+        from .hashtags import HashtagIndex
 
-        user_posts = LookbookPost.objects.filter(user=self.user)
-        all_hashtags = []
-
-        for post in user_posts:
-            all_hashtags.extend(post.hashtags)
-
-        # Count and return top hashtags
-        counter = Counter(all_hashtags)
-        return [hashtag for hashtag, _ in counter.most_common(10)]
+        # Counted in SQL over the user's rows of the hashtag index
+        top_tags = HashtagIndex.top_tags(limit=10, user=self.user, public_only=False)
+        return [hashtag for hashtag, _ in top_tags]
 
 
 class PostScheduler:
@@ -325,20 +318,9 @@ class PostScheduler:
     @staticmethod
     def process_scheduled_posts():
         """Check and publish scheduled posts"""
-        from .models import PostDraft
-
-        now = timezone.now()
-        scheduled_posts = PostDraft.objects.filter(
-            status='scheduled',
-            scheduled_for__lte=now
-        )
-
-        published_count = 0
-        for draft in scheduled_posts:
-            draft.publish()
-            published_count += 1
+        from .publisher import ScheduledPostPublisher
 
-        return published_count
+        return len(ScheduledPostPublisher.publish_due())
 
     @staticmethod
     def get_upcoming_schedules(user):
@@ -1,9 +1,97 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from .models import LookbookPost
+from .feed_algorithm import FeedAlgorithm
+from .follow_graph import FollowGraph
+from .hashtags import HashtagIndex
+from .models import LookbookPost, TimelineEntry, UserFollow
+from .timeline import TimelineService
 from .utils.post_badges import PostBadgeSystem
 
 @receiver(post_save, sender=LookbookPost)
 def update_post_badge_on_save(sender, instance, **kwargs):
     """Update badge when a post is saved"""
     PostBadgeSystem.update_post_badge(instance)
+
+
+# ==================== Following-feed timelines and feed cache ====================
+
+@receiver(post_init, sender=LookbookPost)
+def remember_visibility(sender, instance, **kwargs):
+    instance._saved_visibility = instance.__dict__.get('visibility')
+
+
+@receiver(post_save, sender=LookbookPost)
+def fan_out_post(sender, instance, created, **kwargs):
+    """Fan new posts out to followers; follow visibility changes afterwards"""
+    was_visible = not created and instance._saved_visibility in TimelineService.VISIBLE
+    is_visible = instance.visibility in TimelineService.VISIBLE
+
+    if is_visible and not was_visible:
+        FeedAlgorithm.invalidate(TimelineService.fan_out([instance]))
+    elif was_visible and not is_visible:
+        FeedAlgorithm.invalidate(TimelineService.remove_post(instance.id))
+    instance._saved_visibility = instance.visibility
+
+
+# ==================== Hashtag index ====================
+
+def _indexed_state(instance):
+    hashtags = instance.__dict__.get('hashtags')
+    return (
+        list(hashtags) if isinstance(hashtags, list) else hashtags,
+        instance.__dict__.get('visibility'),
+    )
+
+
+@receiver(post_init, sender=LookbookPost)
+def remember_indexed_hashtags(sender, instance, **kwargs):
+    instance._indexed_state = _indexed_state(instance)
+
+
+@receiver(post_save, sender=LookbookPost)
+def index_post_hashtags(sender, instance, created, **kwargs):
+    """Keep PostHashtag in sync when a post's hashtags or visibility change"""
+    if created:
+        HashtagIndex.index_posts([instance])
+    elif _indexed_state(instance) != instance._indexed_state:
+        HashtagIndex.sync(instance)
+    instance._indexed_state = _indexed_state(instance)
+
+
+@receiver(pre_delete, sender=LookbookPost)
+def remember_post_readers(sender, instance, **kwargs):
+    # Timeline entries are cascade-deleted with the post: collect readers first
+    instance._timeline_owners = set(
+        TimelineEntry.objects.filter(post_id=instance.id).values_list('owner_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=LookbookPost)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    FeedAlgorithm.invalidate(getattr(instance, '_timeline_owners', ()))
+
+
+@receiver(post_save, sender=UserFollow)
+def add_followed_posts(sender, instance, created, **kwargs):
+    if created:
+        TimelineService.follow(instance.follower_id, instance.following_id)
+        FeedAlgorithm.invalidate([instance.follower_id])
+
+
+@receiver(post_delete, sender=UserFollow)
+def remove_unfollowed_posts(sender, instance, **kwargs):
+    TimelineService.unfollow(instance.follower_id, instance.following_id)
+    FeedAlgorithm.invalidate([instance.follower_id])
+
+
+# ==================== Follow graph cache ====================
+
+@receiver(post_save, sender=UserFollow)
+def invalidate_follow_graph_on_follow(sender, instance, created, **kwargs):
+    if created:
+        FollowGraph.invalidate(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=UserFollow)
+def invalidate_follow_graph_on_unfollow(sender, instance, **kwargs):
+    FollowGraph.invalidate(instance.follower_id, instance.following_id)
@@ -0,0 +1,201 @@
+"""
+Follow Suggestions for Tailora
+
+Computes each user's "people to follow" offline and stores the top
+MAX_SUGGESTIONS in SuggestedFollow. The community feed only reads the
+stored rows, so no request aggregates users, follows and posts.
+
+Candidates are active users with at least one post, scored from:
+- network: followed by people the user follows (second-degree connections)
+- hashtags: shared hashtags, generic tags weighted down (inverse frequency)
+- style: Jaccard similarity of style profiles (styles, colors, brands),
+  ignoring tokens so common they say nothing about taste
+- popularity: a small log(followers) bonus, also used to fill short lists
+
+The follow graph, hashtag index and style profiles are loaded once per
+run, so the job costs a handful of queries plus one write per batch of
+users. Run it with the compute_follow_suggestions command.
+"""
+
+import math
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from users.models import StyleProfile, User
+
+from .models import PostHashtag, SuggestedFollow, UserFollow
+
+
+class SuggestionEngine:
+    """
+    Offline follow suggestion scoring
+    """
+
+    MAX_SUGGESTIONS = 20
+
+    NETWORK_WEIGHT = 3.0  # Per followed user who follows the candidate
+    HASHTAG_WEIGHT = 2.0  # Per shared tag, divided by log(users of the tag)
+    STYLE_WEIGHT = 4.0  # Times style profile similarity (0..1)
+    POPULAR_WEIGHT = 0.1  # Times log(1 + followers)
+
+    MAX_TAG_USERS = 500  # Tags used by more users say nothing about taste
+    MAX_STYLE_TOKEN_USERS = 500  # Same for styles, colors and brands
+    BATCH_SIZE = 200  # Users written per transaction
+
+    def __init__(self):
+        self.following = defaultdict(set)
+        for follower_id, following_id in UserFollow.objects.values_list(
+            'follower_id', 'following_id'
+        ).iterator(chunk_size=5000):
+            self.following[follower_id].add(following_id)
+
+        # Eligible candidates and their follower counts, most followed first
+        self.popularity = dict(
+            User.objects.filter(is_active=True, posts_count__gt=0).order_by(
+                '-followers_count'
+            ).values_list('id', 'followers_count')
+        )
+
+        self.user_tags = defaultdict(set)
+        self.tag_users = defaultdict(set)
+        for user_id, hashtag_id in PostHashtag.objects.filter(
+            visibility='public'
+        ).values_list('user_id', 'hashtag_id').distinct().iterator(chunk_size=5000):
+            self.user_tags[user_id].add(hashtag_id)
+            self.tag_users[hashtag_id].add(user_id)
+
+        self.style = {}
+        self.token_users = defaultdict(set)
+        for user_id, styles, colors, brands in StyleProfile.objects.values_list(
+            'user_id', 'preferred_styles', 'favorite_colors', 'favorite_brands'
+        ):
+            tokens = self._style_tokens(styles, colors, brands)
+            if tokens:
+                self.style[user_id] = tokens
+                for token in tokens:
+                    self.token_users[token].add(user_id)
+
+    @staticmethod
+    def _style_tokens(styles, colors, brands):
+        tokens = set()
+        for prefix, values in (('style', styles), ('color', colors), ('brand', brands)):
+            for value in values or []:
+                if isinstance(value, str) and value.strip():
+                    tokens.add(f'{prefix}:{value.strip().lower()}')
+        return tokens
+
+    # ==================== Scoring ====================
+
+    def suggestions_for(self, user_id):
+        """
+        Top suggestions for a user
+
+        Returns:
+            list: (suggested_id, score, reason) tuples, best first
+        """
+        excluded = self.following[user_id] | {user_id}
+        signals = defaultdict(Counter)  # candidate -> reason -> score
+
+        for followed_id in self.following[user_id]:
+            for candidate in self.following[followed_id]:
+                signals[candidate]['network'] += self.NETWORK_WEIGHT
+
+        for hashtag_id in self.user_tags[user_id]:
+            users = self.tag_users[hashtag_id]
+            if len(users) > self.MAX_TAG_USERS:
+                continue
+            weight = self.HASHTAG_WEIGHT / math.log(1 + len(users))
+            for candidate in users:
+                signals[candidate]['hashtags'] += weight
+
+        tokens = self.style.get(user_id)
+        if tokens:
+            overlap = Counter()
+            for token in tokens:
+                users = self.token_users[token]
+                # Overlap counted only on distinctive tokens; the Jaccard
+                # denominator still uses full profiles
+                if len(users) <= self.MAX_STYLE_TOKEN_USERS:
+                    overlap.update(users)
+            for candidate, shared in overlap.items():
+                union = len(tokens) + len(self.style[candidate]) - shared
+                signals[candidate]['style'] += self.STYLE_WEIGHT * shared / union
+
+        scored = []
+        for candidate, reasons in signals.items():
+            if candidate in excluded or candidate not in self.popularity:
+                continue
+            reason, _ = reasons.most_common(1)[0]
+            scored.append((candidate, sum(reasons.values()) + self._popularity_bonus(candidate), reason))
+        scored.sort(key=lambda suggestion: suggestion[1], reverse=True)
+        scored = scored[:self.MAX_SUGGESTIONS]
+
+        # Short lists (new users) are filled with the most followed creators
+        if len(scored) < self.MAX_SUGGESTIONS:
+            seen = excluded | {candidate for candidate, _, _ in scored}
+            for candidate in self.popularity:
+                if len(scored) >= self.MAX_SUGGESTIONS:
+                    break
+                if candidate not in seen:
+                    scored.append((candidate, self._popularity_bonus(candidate), 'popular'))
+        return scored
+
+    def _popularity_bonus(self, user_id):
+        return self.POPULAR_WEIGHT * math.log1p(self.popularity[user_id])
+
+    # ==================== Storage ====================
+
+    def run(self, users=None) -> dict:
+        """
+        Recompute and store suggestions
+
+        Args:
+            users: Queryset of users to compute for (default: all active users)
+
+        Returns:
+            dict: Number of users processed and suggestions written
+        """
+        if users is None:
+            users = User.objects.filter(is_active=True)
+        user_ids = list(users.values_list('id', flat=True))
+
+        written = 0
+        for start in range(0, len(user_ids), self.BATCH_SIZE):
+            batch = user_ids[start:start + self.BATCH_SIZE]
+            rows = [
+                SuggestedFollow(user_id=user_id, suggested_id=suggested_id, score=score, reason=reason)
+                for user_id in batch
+                for suggested_id, score, reason in self.suggestions_for(user_id)
+            ]
+            with transaction.atomic():
+                SuggestedFollow.objects.filter(user_id__in=batch).delete()
+                SuggestedFollow.objects.bulk_create(rows)
+            written += len(rows)
+        return {'users': len(user_ids), 'suggestions': written}
+
+    # ==================== Reads ====================
+
+    @staticmethod
+    def suggested_users(user, following_ids=(), limit=5):
+        """
+        Stored suggestions for a user, minus accounts followed or
+        deactivated since the last run; falls back to popular creators
+        when none are left (or before the first run)
+        """
+        excluded = list(following_ids) + [user.id]
+        suggestions = SuggestedFollow.objects.filter(
+            user=user,
+            suggested__is_active=True
+        ).exclude(
+            suggested_id__in=excluded
+        ).select_related('suggested').order_by('-score')[:limit]
+        suggested = [suggestion.suggested for suggestion in suggestions]
+        if suggested:
+            return suggested
+
+        return list(
+            User.objects.filter(is_active=True, posts_count__gt=0).exclude(
+                id__in=excluded
+            ).order_by('-followers_count')[:limit]
+        )
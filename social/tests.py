@@ -1,3 +1,316 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from outfits.models import Outfit
+from users.models import User
+
+from .engagement import EngagementService
+from .feed_algorithm import FeedAlgorithm
+from .models import LookbookPost, PostDraft, PostLike, PostSave, UserFollow
+from .publisher import ScheduledPostPublisher
+from .suggestions import SuggestionEngine
+
+
+class LookbookPostApiQueryCountTests(TestCase):
+    """
+    Post list endpoints must not issue queries per post (likes/saves/counts)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = User.objects.create_user(username='viewer', email='viewer@example.com', password='x')
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        UserFollow.objects.create(follower=cls.viewer, following=cls.author)
+
+    def setUp(self):
+        self.client.force_login(self.viewer)
+
+    def add_posts(self, count):
+        for i in range(count):
+            outfit = Outfit.objects.create(user=self.author, name=f'Outfit {i}')
+            post = LookbookPost.objects.create(user=self.author, outfit=outfit, caption=f'Post {i}')
+            if i % 2:
+                PostLike.objects.create(user=self.viewer, post=post)
+            else:
+                PostSave.objects.create(user=self.viewer, post=post)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()['results']
+
+    def assert_constant_queries(self, url):
+        self.add_posts(2)
+        small, results = self.count_queries(url)
+        self.assertEqual(len(results), 2)
+
+        self.add_posts(8)
+        large, results = self.count_queries(url)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(small, large)
+        return results
+
+    def test_feed_queries_do_not_grow_with_page_size(self):
+        results = self.assert_constant_queries('/social/api/posts/feed/')
+        self.assertEqual(sum(post['is_liked'] for post in results), 5)
+        self.assertEqual(sum(post['is_saved'] for post in results), 5)
+
+    def test_discover_queries_do_not_grow_with_page_size(self):
+        results = self.assert_constant_queries('/social/api/posts/discover/')
+        self.assertEqual(sum(post['is_liked'] for post in results), 5)
+        self.assertTrue(all('likes_count' in post for post in results))
+
+
+class FollowVisibilityTests(TestCase):
+    """
+    Followers-only posts are checked against UserFollow, not the follow graph cache
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = User.objects.create_user(username='viewer', email='viewer@example.com', password='x')
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        outfit = Outfit.objects.create(user=cls.author, name='Outfit')
+        cls.post = LookbookPost.objects.create(user=cls.author, outfit=outfit, visibility='followers')
+
+    def setUp(self):
+        self.client.force_login(self.viewer)
+
+    def test_unfollow_revokes_access_immediately(self):
+        url = f'/social/post/{self.post.id}/'
+        follow = UserFollow.objects.create(follower=self.viewer, following=self.author)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get('/social/api/posts/').json()['count'], 1)
+
+        follow.delete()
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(self.client.get('/social/api/posts/').json()['count'], 0)
+
+    def test_unfollow_hides_followers_only_posts_on_profile(self):
+        url = f'/social/profile/{self.author.id}/'
+        follow = UserFollow.objects.create(follower=self.viewer, following=self.author)
+        self.assertEqual(list(self.client.get(url).context['posts']), [self.post])
+
+        follow.delete()
+        response = self.client.get(url)
+        self.assertFalse(response.context['is_following'])
+        self.assertEqual(list(response.context['posts']), [])
+
+    def test_follow_lists_are_most_recent_first(self):
+        others = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        for other in others:
+            UserFollow.objects.create(follower=other, following=self.author)
+            UserFollow.objects.create(follower=self.author, following=other)
+
+        response = self.client.get(f'/social/profile/{self.author.id}/followers/')
+        self.assertEqual(list(response.context['users']), others[::-1])
+        response = self.client.get(f'/social/profile/{self.author.id}/following/')
+        self.assertEqual(list(response.context['users']), others[::-1])
+
+
+class ScheduledPostPublisherTests(TestCase):
+    """
+    A draft that keeps failing must not block the drafts behind it
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        outfit = Outfit.objects.create(user=cls.author, name='Outfit')
+        due = timezone.now() - timedelta(minutes=5)
+        cls.broken = PostDraft.objects.create(
+            user=cls.author, outfit=outfit, caption='broken', status='scheduled',
+            scheduled_for=due - timedelta(hours=1)
+        )
+        cls.healthy = PostDraft.objects.create(
+            user=cls.author, outfit=outfit, caption='healthy', status='scheduled', scheduled_for=due
+        )
+
+    def publish_due(self):
+        build_post = PostDraft.build_post
+
+        def failing_build_post(draft):
+            if draft.caption == 'broken':
+                raise ValueError('broken draft')
+            return build_post(draft)
+
+        with patch.object(PostDraft, 'build_post', failing_build_post):
+            return ScheduledPostPublisher.publish_due()
+
+    def test_failing_draft_goes_last_and_is_given_up_on(self):
+        with patch.object(ScheduledPostPublisher, 'BATCH_SIZE', 1):
+            published = self.publish_due()
+        self.assertEqual([draft.caption for draft, _ in published], ['healthy'])
+
+        self.broken.refresh_from_db()
+        self.assertEqual((self.broken.status, self.broken.publish_attempts), ('scheduled', 1))
+        self.assertEqual(list(ScheduledPostPublisher.due()), [self.broken])
+
+        for _ in range(ScheduledPostPublisher.MAX_ATTEMPTS - 1):
+            self.assertEqual(self.publish_due(), [])
+        self.broken.refresh_from_db()
+        self.assertEqual(self.broken.status, 'failed')
+        self.assertFalse(ScheduledPostPublisher.due().exists())
+
+
+class SuggestionEngineTests(TestCase):
+    """
+    Style suggestions ignore ubiquitous tokens; stored suggestions skip inactive users
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = []
+        for name, brands in [('ana', ['rare']), ('ben', ['rare']), ('cleo', [])]:
+            user = User.objects.create_user(username=name, email=f'{name}@example.com', password='x')
+            user.style_profile.preferred_styles = ['casual']
+            user.style_profile.favorite_brands = brands
+            user.style_profile.save()
+            outfit = Outfit.objects.create(user=user, name='Outfit')
+            LookbookPost.objects.create(user=user, outfit=outfit)
+            cls.users.append(user)
+
+    @patch.object(SuggestionEngine, 'MAX_STYLE_TOKEN_USERS', 2)
+    def test_common_style_tokens_are_ignored(self):
+        ana, ben, cleo = self.users
+        reasons = {suggested: reason for suggested, _, reason in SuggestionEngine().suggestions_for(ana.id)}
+        self.assertEqual(reasons, {ben.id: 'style', cleo.id: 'popular'})
+
+    def test_inactive_users_are_not_suggested(self):
+        ana, ben, cleo = self.users
+        SuggestionEngine().run()
+        ben.is_active = False
+        ben.save(update_fields=['is_active'])
+
+        self.assertEqual(SuggestionEngine.suggested_users(ana), [cleo])
+
+    def test_popular_creators_fill_in_when_suggestions_run_out(self):
+        ana, ben, cleo = self.users
+        SuggestionEngine().run()
+        dana = User.objects.create_user(username='dana', email='dana@example.com', password='x')
+        User.objects.filter(pk=dana.pk).update(posts_count=1)
+
+        self.assertEqual(SuggestionEngine.suggested_users(ana, following_ids=[ben.id, cleo.id]), [dana])
+
+
+class FeedCacheTests(TestCase):
+    """
+    The feed id cache must be cheaper than the timeline query it replaces
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+
+    def setUp(self):
+        cache.clear()
+        FeedAlgorithm.reset_cache_stats()
+
+    def test_cached_read_needs_no_queries(self):
+        FeedAlgorithm().get_post_ids(self.user)
+        with self.assertNumQueries(0):
+            FeedAlgorithm().get_post_ids(self.user)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'tailora_cache'
+    }})
+    def test_slow_backends_are_bypassed(self):
+        with self.assertNumQueries(1):
+            FeedAlgorithm().get_post_ids(self.user)
+
+    @patch.object(FeedAlgorithm, 'STATS_FLUSH_INTERVAL', 3600)
+    def test_counts_are_written_in_batches(self):
+        for _ in range(3):
+            FeedAlgorithm().get_post_ids(self.user)
+
+        self.assertIsNone(cache.get(FeedAlgorithm.STATS_KEYS['hits']))
+        stats = FeedAlgorithm.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+
+class EngagementServiceTests(TestCase):
+    """
+    Like/save toggles keep post counters right, directly or write-behind
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        cls.fans = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        outfit = Outfit.objects.create(user=cls.author, name='Outfit')
+        cls.posts = [LookbookPost.objects.create(user=cls.author, outfit=outfit) for _ in range(2)]
+
+    def tearDown(self):
+        EngagementService.flush()  # Never leave a flush timer running
+
+    def likes(self, post):
+        return LookbookPost.objects.values_list('likes_count', flat=True).get(pk=post.pk)
+
+    def test_like_then_unlike(self):
+        post = self.posts[0]
+        service = EngagementService(self.fans[0])
+
+        self.assertEqual(service.toggle_like(post), (True, 1))
+        self.assertEqual(self.likes(post), 1)
+        self.assertEqual(service.toggle_like(post), (False, 0))
+        self.assertEqual(self.likes(post), 0)
+        self.assertFalse(PostLike.objects.exists())
+
+    def test_concurrent_like_is_not_counted_twice(self):
+        post = self.posts[0]
+        # Another request inserted the like between our delete and create
+        with patch.object(PostLike.objects, 'create', side_effect=IntegrityError):
+            liked = EngagementService(self.fans[0]).toggle_like(post)
+
+        self.assertEqual(liked, (True, 0))
+        self.assertEqual(self.likes(post), 0)
+
+    @override_settings(SOCIAL_ENGAGEMENT_WRITE_BEHIND=True)
+    def test_buffered_deltas_are_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for post in self.posts:
+                EngagementService(self.fans[0]).toggle_like(post)
+        self.assertEqual(self.likes(self.posts[0]), 0)
+
+        # Both posts got +1 like: one UPDATE
+        with self.assertNumQueries(1):
+            self.assertEqual(EngagementService.flush(), 2)
+        self.assertEqual([self.likes(post) for post in self.posts], [1, 1])
+
+    @override_settings(SOCIAL_ENGAGEMENT_WRITE_BEHIND=True)
+    def test_rolled_back_toggle_is_not_buffered(self):
+        post = self.posts[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                EngagementService(self.fans[0]).toggle_like(post)
+                transaction.set_rollback(True)
+
+        self.assertEqual(EngagementService.flush(), 0)
+        self.assertFalse(PostLike.objects.exists())
+        self.assertEqual(self.likes(post), 0)
+
+    def test_reconcile_repairs_drift(self):
+        post = self.posts[0]
+        for fan in self.fans[:2]:
+            PostLike.objects.create(user=fan, post=post)
+        LookbookPost.objects.filter(pk=post.pk).update(likes_count=7, saves_count=3)
+
+        call_command('reconcile_post_counters', stdout=StringIO())
+
+        post.refresh_from_db()
+        self.assertEqual((post.likes_count, post.saves_count, post.comments_count), (2, 0, 0))
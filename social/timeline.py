@@ -0,0 +1,195 @@
+"""
+Following-feed Timelines for Tailora
+
+Each user's "following" feed is materialized in TimelineEntry: when a post
+is created it is fanned out to its author and every follower, so reading a
+feed page is a range scan on (owner, created_at) plus one batched hydrate
+instead of an IN over the follow list.
+
+Maintained by social.signals; bulk writers that bypass signals
+(bulk_create) must call TimelineService.fan_out() themselves. Timelines are
+capped at MAX_ENTRIES by the trim_timelines command.
+"""
+
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from django.db.models import CharField, F, Value, Window
+from django.db.models.functions import RowNumber
+
+from .models import LookbookPost, PostLike, PostSave, TimelineEntry, UserFollow
+
+
+class TimelineService:
+    """
+    Fan-out-on-write timelines for the following feed
+    """
+
+    MAX_ENTRIES = 500  # Timeline length kept per user
+    FOLLOW_BACKFILL = 50  # Recent posts copied in when following someone
+    BATCH_SIZE = 1000
+
+    # Posts that appear in followers' timelines (private posts never do)
+    VISIBLE = ('public', 'followers')
+
+    def __init__(self, user):
+        self.user = user
+
+    # ==================== Writes ====================
+
+    @classmethod
+    def _insert(cls, entries):
+        TimelineEntry.objects.bulk_create(entries, batch_size=cls.BATCH_SIZE, ignore_conflicts=True)
+
+    @classmethod
+    def fan_out(cls, posts: Iterable[LookbookPost]) -> set:
+        """Add posts to their authors' and all their followers' timelines, returns the owners"""
+        posts = [post for post in posts if post.visibility in cls.VISIBLE]
+        if not posts:
+            return set()
+
+        followers = defaultdict(list)
+        for following_id, follower_id in UserFollow.objects.filter(
+            following_id__in={post.user_id for post in posts}
+        ).values_list('following_id', 'follower_id').iterator(chunk_size=cls.BATCH_SIZE):
+            followers[following_id].append(follower_id)
+
+        entries = []
+        owners = set()
+        for post in posts:
+            for owner_id in [post.user_id, *followers[post.user_id]]:
+                owners.add(owner_id)
+                entries.append(TimelineEntry(
+                    owner_id=owner_id,
+                    post_id=post.id,
+                    author_id=post.user_id,
+                    created_at=post.created_at,
+                ))
+                if len(entries) >= cls.BATCH_SIZE:
+                    cls._insert(entries)
+                    entries = []
+        cls._insert(entries)
+        return owners
+
+    @staticmethod
+    def remove_post(post_id) -> set:
+        """Take a post out of every timeline (e.g. it became private), returns the owners"""
+        entries = TimelineEntry.objects.filter(post_id=post_id)
+        owners = set(entries.values_list('owner_id', flat=True))
+        entries.delete()
+        return owners
+
+    @classmethod
+    def follow(cls, follower_id, following_id):
+        """Copy the followed user's recent posts into the follower's timeline"""
+        recent = LookbookPost.objects.filter(
+            user_id=following_id,
+            visibility__in=cls.VISIBLE
+        ).order_by('-created_at').values_list('id', 'created_at')[:cls.FOLLOW_BACKFILL]
+
+        cls._insert([
+            TimelineEntry(owner_id=follower_id, post_id=post_id, author_id=following_id, created_at=created_at)
+            for post_id, created_at in recent
+        ])
+
+    @staticmethod
+    def unfollow(follower_id, following_id):
+        TimelineEntry.objects.filter(owner_id=follower_id, author_id=following_id).delete()
+
+    @classmethod
+    def rebuild(cls, user) -> int:
+        """Rebuild a user's timeline from scratch, returns entries written"""
+        TimelineEntry.objects.filter(owner=user).delete()
+
+        authors = list(
+            UserFollow.objects.filter(follower=user).values_list('following_id', flat=True)
+        ) + [user.id]
+        recent = LookbookPost.objects.filter(
+            user_id__in=authors,
+            visibility__in=cls.VISIBLE
+        ).order_by('-created_at').values_list('id', 'user_id', 'created_at')[:cls.MAX_ENTRIES]
+
+        entries = [
+            TimelineEntry(owner_id=user.id, post_id=post_id, author_id=author_id, created_at=created_at)
+            for post_id, author_id, created_at in recent
+        ]
+        cls._insert(entries)
+        return len(entries)
+
+    @classmethod
+    def trim(cls, owner_ids: Optional[Iterable] = None) -> int:
+        """Delete entries beyond MAX_ENTRIES per timeline, returns rows deleted"""
+        entries = TimelineEntry.objects.all()
+        if owner_ids is not None:
+            entries = entries.filter(owner_id__in=list(owner_ids))
+
+        overflow = entries.annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F('owner_id')],
+                order_by=[F('created_at').desc(), F('id').desc()]
+            )
+        ).filter(position__gt=cls.MAX_ENTRIES).values_list('id', flat=True)
+
+        overflow_ids = list(overflow)
+        deleted = 0
+        for start in range(0, len(overflow_ids), cls.BATCH_SIZE):
+            count, _ = TimelineEntry.objects.filter(id__in=overflow_ids[start:start + cls.BATCH_SIZE]).delete()
+            deleted += count
+        return deleted
+
+    # ==================== Reads ====================
+
+    def get_post_ids(self, limit=30, before=None) -> List:
+        """
+        Post ids of a timeline page, newest first
+
+        Args:
+            limit: Page size
+            before: Only posts created before this datetime (next page)
+        """
+        entries = TimelineEntry.objects.filter(owner=self.user)
+        if before is not None:
+            entries = entries.filter(created_at__lt=before)
+        return list(entries.order_by('-created_at', '-id').values_list('post_id', flat=True)[:limit])
+
+    def get_posts(self, limit=30, before=None) -> List[LookbookPost]:
+        """Hydrated timeline page, with the viewer's is_liked/is_saved flags"""
+        return hydrate_posts(self.get_post_ids(limit, before), self.user)
+
+
+def hydrate_posts(post_ids, viewer) -> List[LookbookPost]:
+    """
+    Load posts by id, in the given order, with the viewer's flags
+
+    Sets is_liked/is_saved on each post from a single query over the
+    viewer's likes and saves of these posts.
+    """
+    if not post_ids:
+        return []
+
+    posts = LookbookPost.objects.filter(id__in=post_ids).select_related(
+        'user', 'outfit'
+    ).prefetch_related('outfit__items')
+    by_id = {post.id: post for post in posts}
+
+    flags = PostLike.objects.filter(user=viewer, post_id__in=post_ids).values_list(
+        'post_id', Value('like', output_field=CharField())
+    ).union(
+        PostSave.objects.filter(user=viewer, post_id__in=post_ids).values_list(
+            'post_id', Value('save', output_field=CharField())
+        ),
+        all=True
+    )
+    liked, saved = set(), set()
+    for post_id, kind in flags:
+        (liked if kind == 'like' else saved).add(post_id)
+
+    ordered = []
+    for post_id in post_ids:
+        post = by_id.get(post_id)
+        if post is not None:
+            post.is_liked = post.id in liked
+            post.is_saved = post.id in saved
+            ordered.append(post)
+    return ordered
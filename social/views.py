@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count, Exists, OuterRef
+from django.db.models import Q, Exists, OuterRef
 from django.http import JsonResponse
 from django.utils import timezone
 from django.urls import reverse
@@ -12,6 +12,13 @@ from django.core.cache import cache
 
 from .models import LookbookPost, PostLike, PostComment, PostSave, UserFollow, StyleChallenge, PostDraft, AIEngagementData
 from .services import AIEngagementOptimizer
+from .feed_algorithm import FeedAlgorithm
+from .engagement import EngagementService
+from .follow_graph import FollowGraph
+from .hashtags import HashtagIndex
+from .publisher import ScheduledPostPublisher
+from .ranking import TrendingRanker
+from .suggestions import SuggestionEngine
 from outfits.models import Outfit
 from users.models import User
 
@@ -22,39 +29,30 @@ def feed_view(request):
     # Get feed type from query param (default to 'community' for better discovery)
     feed_type = request.GET.get('feed', 'community')
     
-    # Get users the current user follows
-    following_ids = UserFollow.objects.filter(
-        follower=request.user
-    ).values_list('following_id', flat=True)
+    # Get users the current user follows (cached follow graph)
+    following_ids = FollowGraph().following_ids(request.user.id)
     
     if feed_type == 'following':
-        # Show posts from followed users + own posts
-        posts = LookbookPost.objects.filter(
-            Q(user_id__in=following_ids) | Q(user=request.user),
-            visibility__in=['public', 'followers']
-        ).select_related('user', 'outfit').prefetch_related('likes', 'comments').annotate(
-            is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=request.user)),
-            is_saved=Exists(PostSave.objects.filter(post=OuterRef('pk'), user=request.user))
-        ).order_by('-created_at')[:30]
+        # Posts from followed users + own posts (cached timeline ids, fresh posts)
+        posts = FeedAlgorithm().get_personalized_feed(request.user, limit=30)
     else:
         # Community feed - show all public posts from everyone
         posts = LookbookPost.objects.filter(
             visibility='public'
         ).exclude(
             user=request.user  # Optionally exclude own posts in community view
-        ).select_related('user', 'outfit').prefetch_related('likes', 'comments').annotate(
+        ).select_related('user', 'outfit').prefetch_related('outfit__items').annotate(
             is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=request.user)),
-            is_saved=Exists(PostSave.objects.filter(post=OuterRef('pk'), user=request.user)),
-            is_following=Exists(UserFollow.objects.filter(follower=request.user, following=OuterRef('user')))
+            is_saved=Exists(PostSave.objects.filter(post=OuterRef('pk'), user=request.user))
         ).order_by('-created_at')[:30]
     
     # Get active challenges
     active_challenges = StyleChallenge.objects.filter(status='active')[:3]
     
-    # User stats
-    followers_count = UserFollow.objects.filter(following=request.user).count()
-    following_count = UserFollow.objects.filter(follower=request.user).count()
-    posts_count = LookbookPost.objects.filter(user=request.user).count()
+    # User stats (denormalized counters, see users.signals)
+    followers_count = request.user.followers_count
+    following_count = request.user.following_count
+    posts_count = request.user.posts_count
     
     # Community stats
     total_community_posts = LookbookPost.objects.filter(visibility='public').count()
@@ -76,19 +74,11 @@ def feed_view(request):
         scheduled_for__gt=timezone.now()
     ).order_by('scheduled_for')[:3]
     
-    # Suggested users to follow (for community tab)
+    # Suggested users to follow (for community tab), precomputed by the
+    # compute_follow_suggestions job
     suggested_users = []
     if feed_type == 'community':
-        suggested_users = User.objects.exclude(
-            id=request.user.id
-        ).exclude(
-            id__in=following_ids
-        ).annotate(
-            num_followers=Count('followers'),
-            num_posts=Count('lookbook_posts')
-        ).filter(
-            num_posts__gt=0  # Only suggest users with posts
-        ).order_by('-num_followers')[:5]
+        suggested_users = SuggestionEngine.suggested_users(request.user, following_ids, limit=5)
     
     context = {
         'posts': posts,
@@ -112,13 +102,11 @@ def feed_view(request):
 @login_required
 def discover_view(request):
     """Discover page showing trending and popular posts"""
-    # Get all public posts
-    posts = LookbookPost.objects.filter(
-        visibility='public'
-    ).select_related('user', 'outfit').prefetch_related('likes').annotate(
+    # Top public posts by time-decayed engagement (scored by the rank_posts job)
+    posts = TrendingRanker.top_posts().select_related('user', 'outfit').annotate(
         is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=request.user)),
         is_saved=Exists(PostSave.objects.filter(post=OuterRef('pk'), user=request.user))
-    ).order_by('-likes_count', '-created_at')[:30]
+    )[:30]
     
     context = {
         'posts': posts,
@@ -341,9 +329,10 @@ def post_detail(request, post_id):
         return redirect('social:feed')
     
     if post.visibility == 'followers':
+        # Access control: ask the database, never the follow graph cache
         is_following = UserFollow.objects.filter(
             follower=request.user,
-            following=post.user
+            following_id=post.user_id
         ).exists()
         if not is_following and post.user != request.user:
             messages.error(request, 'This post is only visible to followers.')
@@ -405,20 +394,10 @@ def toggle_like(request, post_id):
     """Like or unlike a post"""
     post = get_object_or_404(LookbookPost, id=post_id)
     
-    like, created = PostLike.objects.get_or_create(user=request.user, post=post)
-    
-    if not created:
-        like.delete()
-        post.likes_count = max(0, post.likes_count - 1)
-        liked = False
-    else:
-        post.likes_count += 1
-        liked = True
-    
-    post.save(update_fields=['likes_count'])
+    liked, likes_count = EngagementService(request.user).toggle_like(post)
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return JsonResponse({'liked': liked, 'likes_count': post.likes_count})
+        return JsonResponse({'liked': liked, 'likes_count': likes_count})
     
     return redirect('social:post_detail', post_id=post_id)
 
@@ -428,20 +407,10 @@ def toggle_save(request, post_id):
     """Save or unsave a post"""
     post = get_object_or_404(LookbookPost, id=post_id)
     
-    save, created = PostSave.objects.get_or_create(user=request.user, post=post)
-    
-    if not created:
-        save.delete()
-        post.saves_count = max(0, post.saves_count - 1)
-        saved = False
-    else:
-        post.saves_count += 1
-        saved = True
-    
-    post.save(update_fields=['saves_count'])
+    saved, saves_count = EngagementService(request.user).toggle_save(post)
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return JsonResponse({'saved': saved, 'saves_count': post.saves_count})
+        return JsonResponse({'saved': saved, 'saves_count': saves_count})
     
     return redirect('social:post_detail', post_id=post_id)
 
@@ -462,8 +431,7 @@ def add_comment(request, post_id):
                 content=content,
                 parent_comment_id=parent_id if parent_id else None
             )
-            post.comments_count += 1
-            post.save(update_fields=['comments_count'])
+            EngagementService.adjust(post, comments_count=1)
             
             messages.success(request, 'Comment added!')
     
@@ -478,8 +446,7 @@ def delete_comment(request, comment_id):
     
     if request.method == 'POST':
         comment.delete()
-        post.comments_count = max(0, post.comments_count - 1)
-        post.save(update_fields=['comments_count'])
+        EngagementService.adjust(post, comments_count=-1)
         messages.success(request, 'Comment deleted!')
     
     return redirect('social:post_detail', post_id=post.id)
@@ -491,12 +458,17 @@ def profile_view(request, user_id):
     from users.models import User
     profile_user = get_object_or_404(User, id=user_id)
     
-    # Check if current user follows this profile
+    # Check if current user follows this profile (access control: ask the database)
     is_following = UserFollow.objects.filter(
         follower=request.user,
         following=profile_user
     ).exists() if request.user != profile_user else False
     
+    # People the current user follows who follow this profile
+    graph = FollowGraph()
+    followed_by_ids = graph.followed_by_followed(request.user.id, profile_user.id) - {request.user.id}
+    followed_by = list(User.objects.filter(id__in=followed_by_ids).order_by('first_name')[:3])
+    
     # Get user's posts
     if profile_user == request.user:
         posts = LookbookPost.objects.filter(user=profile_user)
@@ -512,8 +484,8 @@ def profile_view(request, user_id):
     ).order_by('-created_at')
     
     # Stats
-    followers_count = UserFollow.objects.filter(following=profile_user).count()
-    following_count = UserFollow.objects.filter(follower=profile_user).count()
+    followers_count = profile_user.followers_count
+    following_count = profile_user.following_count
     posts_count = posts.count()
     
     # Extract username from email
@@ -528,6 +500,8 @@ def profile_view(request, user_id):
         'following_count': following_count,
         'posts_count': posts_count,
         'username': username,
+        'followed_by': followed_by,
+        'followed_by_others': max(len(followed_by_ids) - len(followed_by), 0),
     }
     
     return render(request, 'social/profile.html', context)
@@ -563,14 +537,11 @@ def followers_list(request, user_id):
     from users.models import User
     profile_user = get_object_or_404(User, id=user_id)
     
-    # Get followers and extract the follower user objects
-    follower_relationships = UserFollow.objects.filter(following=profile_user).select_related('follower')
-    followers = [relationship.follower for relationship in follower_relationships]
+    # Get followers, most recent first
+    followers = User.objects.filter(following__following=profile_user).order_by('-following__created_at')
     
     # Get IDs of users that current user is following
-    following_ids = UserFollow.objects.filter(
-        follower=request.user
-    ).values_list('following_id', flat=True)
+    following_ids = FollowGraph().following_ids(request.user.id)
     
     context = {
         'profile_user': profile_user,
@@ -588,14 +559,11 @@ def following_list(request, user_id):
     from users.models import User
     profile_user = get_object_or_404(User, id=user_id)
     
-    # Get following relationships and extract the followed user objects
-    following_relationships = UserFollow.objects.filter(follower=profile_user).select_related('following')
-    following_users = [relationship.following for relationship in following_relationships]
+    # Get followed users, most recently followed first
+    following_users = User.objects.filter(followers__follower=profile_user).order_by('-followers__created_at')
     
     # Get IDs of users that current user is following
-    following_ids = UserFollow.objects.filter(
-        follower=request.user
-    ).values_list('following_id', flat=True)
+    following_ids = FollowGraph().following_ids(request.user.id)
     
     context = {
         'profile_user': profile_user,
@@ -711,38 +679,16 @@ def draft_list(request):
     """List all drafts and scheduled posts"""
     now = timezone.now()
     
-    # Check and publish overdue scheduled posts
-    check_time = now + timedelta(seconds=30)
-    overdue_drafts = PostDraft.objects.filter(
-        user=request.user,
-        status='scheduled',
-        scheduled_for__isnull=False,
-        scheduled_for__lte=check_time
-    )
-    
-    for draft in overdue_drafts:
-        try:
-            post = LookbookPost.objects.create(
-                user=draft.user,
-                outfit=draft.outfit,
-                caption=draft.caption,
-                hashtags=draft.hashtags,
-                enhanced_images=draft.enhanced_images,
-                visibility=draft.visibility
-            )
-            draft.status = 'published'
-            draft.save()
-        except Exception as e:
-            pass
+    # Due scheduled drafts are published by the run_post_publisher worker
     
-    # Get active drafts only
+    # Get active drafts only (failed ones are back to the user to edit)
     drafts = PostDraft.objects.filter(
         user=request.user,
-        status__in=['draft', 'scheduled']
+        status__in=['draft', 'scheduled', 'failed']
     ).select_related('outfit').order_by('-created_at')
     
     # Separate drafts and scheduled posts
-    draft_list = [d for d in drafts if d.status == 'draft']
+    draft_list = [d for d in drafts if d.status in ('draft', 'failed')]
     scheduled_list = [d for d in drafts if d.status == 'scheduled']
     
     context = {
@@ -822,6 +768,7 @@ def draft_detail(request, draft_id):
                 draft.status = 'draft'
                 draft.scheduled_for = None
             
+            draft.publish_attempts = 0  # Edited: earlier failures no longer apply
             draft.save()
             messages.success(request, 'Draft updated!')
         
@@ -1033,32 +980,11 @@ def check_scheduled_posts_ajax(request):
     """Check and publish scheduled posts (AJAX)"""
     now_utc = timezone.now()
     
-    drafts_to_publish = PostDraft.objects.filter(
-        user=request.user,
-        status='scheduled',
-        scheduled_for__isnull=False,
-        scheduled_for__lte=now_utc
-    ).select_related('outfit')
-    
-    published = []
-    for draft in drafts_to_publish:
-        try:
-            post = LookbookPost.objects.create(
-                user=draft.user,
-                outfit=draft.outfit,
-                caption=draft.caption,
-                hashtags=draft.hashtags,
-                enhanced_images=draft.enhanced_images,
-                visibility=draft.visibility
-            )
-            draft.status = 'published'
-            draft.save()
-            published.append({
-                'draft_id': str(draft.id),
-                'post_id': str(post.id),
-            })
-        except Exception as e:
-            pass
+    # Publishes only this user's due drafts, in case the worker lags behind
+    published = [
+        {'draft_id': str(draft.id), 'post_id': str(post.id)}
+        for draft, post in ScheduledPostPublisher.publish_due(now_utc, user=request.user)
+    ]
     
     return JsonResponse({
         'status': 'success',
@@ -1073,27 +999,10 @@ def manual_check_scheduled(request):
     """Manually check and publish scheduled posts"""
     if request.method == 'POST':
         now = timezone.now()
-        scheduled_drafts = PostDraft.objects.filter(
-            status='scheduled',
-            scheduled_for__lte=now
-        ).select_related('user', 'outfit')
-        
-        published = []
-        for draft in scheduled_drafts:
-            post = LookbookPost.objects.create(
-                user=draft.user,
-                outfit=draft.outfit,
-                caption=draft.caption,
-                hashtags=draft.hashtags,
-                enhanced_images=draft.enhanced_images,
-                visibility=draft.visibility
-            )
-            draft.status = 'published'
-            draft.save()
-            published.append({
-                'draft': draft,
-                'post': post
-            })
+        published = [
+            {'draft': draft, 'post': post}
+            for draft, post in ScheduledPostPublisher.publish_due(now)
+        ]
         
         context = {
             'published': published,
@@ -1150,6 +1059,7 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
     Custom actions:
     - GET /api/social/posts/feed/ - Personalized feed
     - GET /api/social/posts/discover/ - Discover trending posts
+    - GET /api/social/posts/tagged/?tag= - Posts with a hashtag
     - POST /api/social/posts/{id}/like/ - Like/unlike post
     - POST /api/social/posts/{id}/save/ - Save/unsave post
     """
@@ -1162,12 +1072,26 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'likes_count']
     ordering = ['-created_at']
     
+    def annotate_viewer(self, queryset):
+        """
+        Load what the serializer renders in a constant number of queries:
+        is_liked/is_saved as Exists subqueries, outfit items prefetched
+        (counts are the denormalized counters on the post)
+        """
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(
+                is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=user)),
+                is_saved=Exists(PostSave.objects.filter(post=OuterRef('pk'), user=user)),
+            )
+        return queryset.select_related('user', 'outfit').prefetch_related('outfit__items')
+    
     def get_queryset(self):
         """
         Return appropriate posts based on visibility
         """
         user = self.request.user
-        queryset = LookbookPost.objects.select_related('user', 'outfit')
+        queryset = self.annotate_viewer(LookbookPost.objects.all())
         
         if self.action in ['list', 'retrieve']:
             if user.is_authenticated:
@@ -1193,14 +1117,11 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
         Get personalized feed for current user
         GET /api/social/posts/feed/
         """
-        user = request.user
-        following_ids = UserFollow.objects.filter(follower=user).values_list('following_id', flat=True)
-        
-        # Feed logic: Posts from followed users + own posts
-        feed_posts = LookbookPost.objects.filter(
-            Q(user_id__in=following_ids) | Q(user=user),
-            visibility__in=['public', 'followers']
-        ).select_related('user', 'outfit').order_by('-created_at')
+        # Feed logic: Posts from followed users + own posts, read from the
+        # materialized timeline (range scan on owner, created_at)
+        feed_posts = self.annotate_viewer(LookbookPost.objects.filter(
+            timeline_entries__owner=request.user
+        )).order_by('-timeline_entries__created_at')
         
         page = self.paginate_queryset(feed_posts)
         if page is not None:
@@ -1216,10 +1137,8 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
         Get trending/popular posts
         GET /api/social/posts/discover/
         """
-        # Discover logic: Public posts sorted by likes and recency
-        discover_posts = LookbookPost.objects.filter(
-            visibility='public'
-        ).select_related('user', 'outfit').order_by('-likes_count', '-created_at')
+        # Discover logic: Public posts by time-decayed engagement score
+        discover_posts = self.annotate_viewer(TrendingRanker.top_posts())
         
         page = self.paginate_queryset(discover_posts)
         if page is not None:
@@ -1229,6 +1148,22 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(discover_posts, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def tagged(self, request):
+        """
+        Get public posts with a hashtag, newest first
+        GET /api/social/posts/tagged/?tag=ootd
+        """
+        tagged_posts = self.annotate_viewer(HashtagIndex.posts(request.query_params.get('tag', '')))
+        
+        page = self.paginate_queryset(tagged_posts)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+            
+        serializer = self.get_serializer(tagged_posts, many=True)
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def like(self, request, pk=None):
         """
@@ -1236,22 +1171,12 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
         POST /api/social/posts/{id}/like/
         """
         post = self.get_object()
-        like, created = PostLike.objects.get_or_create(user=request.user, post=post)
-        
-        if not created:
-            like.delete()
-            post.likes_count = max(0, post.likes_count - 1)
-            liked = False
-        else:
-            post.likes_count += 1
-            liked = True
-            
-        post.save(update_fields=['likes_count'])
+        liked, likes_count = EngagementService(request.user).toggle_like(post)
         
         return Response({
             'status': 'success',
             'liked': liked,
-            'likes_count': post.likes_count
+            'likes_count': likes_count
         })
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
@@ -1261,22 +1186,12 @@ class LookbookPostViewSet(viewsets.ModelViewSet):
         POST /api/social/posts/{id}/save/
         """
         post = self.get_object()
-        save, created = PostSave.objects.get_or_create(user=request.user, post=post)
-        
-        if not created:
-            save.delete()
-            post.saves_count = max(0, post.saves_count - 1)
-            saved = False
-        else:
-            post.saves_count += 1
-            saved = True
-            
-        post.save(update_fields=['saves_count'])
+        saved, saves_count = EngagementService(request.user).toggle_save(post)
         
         return Response({
             'status': 'success',
             'saved': saved,
-            'saves_count': post.saves_count
+            'saves_count': saves_count
         })
 
 
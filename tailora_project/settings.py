@@ -67,7 +67,6 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'social.middleware.ScheduledPostsMiddleware',  # Auto-publish scheduled posts
 ]
 
 ROOT_URLCONF = 'tailora_project.urls'
@@ -102,6 +101,29 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Set REDIS_URL in any deployment with more than one web process or worker:
+# feed and follow-graph invalidations, category versions, cache statistics
+# and job outputs (trending hashtags) are written in one process and read in
+# others. Without it each process keeps its own in-memory cache, which is
+# only correct for a single-process server (runserver, tests).
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -207,3 +229,8 @@ FRONTEND_URL = 'http://127.0.0.1:8000'  # Fallback base; request.build_absolute_
 
 # Password Reset Token Expiry
 PASSWORD_RESET_TIMEOUT = 3600  # 1 hour in seconds
+
+# Social engagement counters
+# Coalesce like/save counter updates in-process and flush them every few
+# seconds (see social.engagement); reconcile_post_counters repairs drift
+SOCIAL_ENGAGEMENT_WRITE_BEHIND = os.getenv('SOCIAL_ENGAGEMENT_WRITE_BEHIND', 'False') == 'True'
@@ -0,0 +1,86 @@
+"""
+Django Management Command: Reconcile User Counters
+
+The user statistics counters (wardrobe items, outfits, posts, followers,
+following) are maintained incrementally by signals. Writes that bypass
+signals (bulk deletes, raw SQL, admin fixes) can make them drift; this
+command recounts them and repairs any user whose counters are off.
+
+Usage:
+    # Repair all users
+    python manage.py reconcile_user_counters
+
+    # Only report drifted users
+    python manage.py reconcile_user_counters --dry-run
+
+Schedule with cron (Linux) or Task Scheduler (Windows):
+    # Nightly at 3 AM: 0 3 * * * cd /path/to/tailora && python manage.py reconcile_user_counters
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from outfits.models import Outfit
+from social.models import LookbookPost, UserFollow
+from users.models import User
+from wardrobe.models import ClothingItem
+
+
+def counted(queryset, owner_field):
+    """Correlated COUNT(*) of queryset rows owned by the outer user"""
+    counts = queryset.filter(
+        **{owner_field: OuterRef('pk')}
+    ).order_by().values(owner_field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def actual_counts():
+    return {
+        'wardrobe_items_count': counted(ClothingItem.objects.all(), 'user'),
+        'outfits_created_count': counted(Outfit.objects.all(), 'user'),
+        'posts_count': counted(LookbookPost.objects.all(), 'user'),
+        'followers_count': counted(UserFollow.objects.all(), 'following'),
+        'following_count': counted(UserFollow.objects.all(), 'follower'),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Recount user statistics counters and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted users without writing'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Users repaired per UPDATE (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        counts = actual_counts()
+
+        drift = Q()
+        for field in counts:
+            drift |= ~Q(**{field: F(f'actual_{field}')})
+
+        drifted = list(
+            User.objects.annotate(
+                **{f'actual_{field}': expression for field, expression in counts.items()}
+            ).filter(drift).values_list('pk', flat=True)
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"[DRY RUN] {len(drifted)} users have drifted counters")
+            return
+
+        batch_size = max(1, options['batch_size'])
+        for start in range(0, len(drifted), batch_size):
+            # Recount at write time so concurrent increments are not lost
+            User.objects.filter(pk__in=drifted[start:start + batch_size]).update(**actual_counts())
+
+        self.stdout.write(self.style.SUCCESS(f"Done! Repaired counters for {len(drifted)} users"))
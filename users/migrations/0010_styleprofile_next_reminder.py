@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-18 21:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_styleprofile_ai_palette'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='styleprofile',
+            name='next_reminder_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='styleprofile',
+            name='next_reminder_type',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='styleprofile',
+            index=models.Index(fields=['next_reminder_at'], name='style_profi_next_re_031397_idx'),
+        ),
+    ]
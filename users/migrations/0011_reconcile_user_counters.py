@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def reconcile_counters(apps, schema_editor):
+    """Counters are signal-maintained from now on: start from accurate values"""
+    User = apps.get_model('users', 'User')
+    sources = {
+        'wardrobe_items_count': (apps.get_model('wardrobe', 'ClothingItem'), 'user'),
+        'outfits_created_count': (apps.get_model('outfits', 'Outfit'), 'user'),
+        'posts_count': (apps.get_model('social', 'LookbookPost'), 'user'),
+        'followers_count': (apps.get_model('social', 'UserFollow'), 'following'),
+        'following_count': (apps.get_model('social', 'UserFollow'), 'follower'),
+    }
+
+    counts = {}
+    for field, (model, owner_field) in sources.items():
+        total = model.objects.filter(
+            **{owner_field: OuterRef('pk')}
+        ).order_by().values(owner_field).annotate(total=Count('pk')).values('total')
+        counts[field] = Coalesce(Subquery(total, output_field=IntegerField()), 0)
+
+    User.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_styleprofile_next_reminder'),
+        ('wardrobe', '0005_clothingitem_gallery_keyset_index'),
+        ('outfits', '0005_alter_userbadge_user'),
+        ('social', '0005_add_enhancement_style'),
+    ]
+
+    operations = [
+        migrations.RunPython(reconcile_counters, migrations.RunPython.noop),
+    ]
@@ -173,20 +173,67 @@ class User(AbstractUser):
         """Check if account is active and not suspended/banned"""
         return self.status == 'active' and self.is_active
     
-    def increment_wardrobe_count(self):
-        """Increment wardrobe items count"""
-        self.wardrobe_items_count += 1
-        self.save(update_fields=['wardrobe_items_count'])
-    
-    def increment_outfits_count(self):
-        """Increment outfits created count"""
-        self.outfits_created_count += 1
-        self.save(update_fields=['outfits_created_count'])
-    
-    def increment_posts_count(self):
-        """Increment posts count"""
-        self.posts_count += 1
-        self.save(update_fields=['posts_count'])
+    # Statistics counters kept in sync by users.signals
+    COUNTER_FIELDS = [
+        'wardrobe_items_count', 'outfits_created_count', 'posts_count',
+        'followers_count', 'following_count',
+    ]
+    
+    @classmethod
+    def adjust_counters(cls, user_id, **deltas):
+        """
+        Atomically add deltas to statistics counters (never below zero)
+        
+        Args:
+            user_id: User primary key
+            **deltas: Counter field name -> amount, e.g. wardrobe_items_count=1
+        """
+        from django.db.models import F
+        from django.db.models.functions import Greatest
+        
+        cls.objects.filter(pk=user_id).update(**{
+            field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()
+        })
+    
+    def save(self, *args, **kwargs):
+        """
+        Counters are written on insert or when named in update_fields only.
+        A full save of a user loaded earlier in the request would otherwise
+        overwrite concurrent adjust_counters() updates with stale values.
+        """
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+    
+    def can_add_wardrobe_items(self, count=1):
+        """
+        Check the wardrobe limit against the counter while holding a row lock
+        
+        Must run inside transaction.atomic(): the lock is held until the items
+        are created, so concurrent uploads cannot both pass the check.
+        """
+        self.wardrobe_items_count = User.objects.select_for_update().values_list(
+            'wardrobe_items_count', flat=True
+        ).get(pk=self.pk)
+        return self.wardrobe_items_count + count <= self.get_max_wardrobe_items()
+    
+    def increment_wardrobe_count(self, by=1):
+        """Increment wardrobe items count (only for writes that bypass signals, e.g. bulk_create)"""
+        User.adjust_counters(self.pk, wardrobe_items_count=by)
+        self.wardrobe_items_count += by
+    
+    def increment_outfits_count(self, by=1):
+        """Increment outfits created count (only for writes that bypass signals)"""
+        User.adjust_counters(self.pk, outfits_created_count=by)
+        self.outfits_created_count += by
+    
+    def increment_posts_count(self, by=1):
+        """Increment posts count (only for writes that bypass signals)"""
+        User.adjust_counters(self.pk, posts_count=by)
+        self.posts_count += by
 
 
 class StyleProfile(models.Model):
@@ -259,24 +306,94 @@ class StyleProfile(models.Model):
     #   "outfit_reminder": True,
     #   "reminder_time": "evening",  # "morning" | "evening" | "both"
     #   "email_notifications": True,
-    #   "weekly_digest": False
+    #   "weekly_digest": False,
+    #   "timezone": "Africa/Tunis"  # IANA name, used for sharded reminders
     # }
     
+    # Sharded reminder scheduling (send_outfit_reminders --sharded)
+    next_reminder_at = models.DateTimeField(null=True, blank=True)
+    next_reminder_type = models.CharField(max_length=10, blank=True)  # "morning" | "evening"
+    
+    # Local time of each reminder; users are spread over the following hour
+    REMINDER_LOCAL_TIMES = {
+        'morning': (7, 0),
+        'evening': (20, 0),
+    }
+    REMINDER_SPREAD_MINUTES = 60
+    
     def get_notification_prefs(self):
         """Get notification preferences with defaults"""
+        from django.conf import settings
         defaults = {
             'outfit_reminder': True,
             'reminder_time': 'evening',
             'email_notifications': True,
             'weekly_digest': False,
+            'timezone': settings.TIME_ZONE,
         }
         prefs = self.notification_preferences or {}
         return {**defaults, **prefs}
     
+    def get_reminder_timezone(self):
+        """User's reminder time zone, falling back to the site time zone"""
+        from django.conf import settings
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+        try:
+            return ZoneInfo(self.get_notification_prefs()['timezone'])
+        except (ZoneInfoNotFoundError, ValueError, TypeError):
+            return ZoneInfo(settings.TIME_ZONE)
+    
+    def schedule_next_reminder(self, after=None):
+        """
+        Set next_reminder_at/next_reminder_type to the next local reminder
+        time strictly after `after` (default: now). Does not save.
+        Clears the schedule when outfit reminders are turned off.
+        """
+        from datetime import datetime, time, timedelta, timezone as dt_timezone
+        from django.utils import timezone
+        
+        prefs = self.get_notification_prefs()
+        self.next_reminder_at = None
+        self.next_reminder_type = ''
+        if not prefs['outfit_reminder'] or not prefs['email_notifications']:
+            return None
+        
+        if prefs['reminder_time'] == 'both':
+            kinds = ['morning', 'evening']
+        else:
+            kinds = [prefs['reminder_time']]
+        
+        tz = self.get_reminder_timezone()
+        local_now = (after or timezone.now()).astimezone(tz)
+        # Stable per-user offset so a time zone's users do not all land in one tick
+        spread = timedelta(minutes=self.user_id.int % self.REMINDER_SPREAD_MINUTES)
+        
+        upcoming = []
+        for kind in kinds:
+            if kind not in self.REMINDER_LOCAL_TIMES:
+                continue
+            hour, minute = self.REMINDER_LOCAL_TIMES[kind]
+            for day_offset in (0, 1):
+                local_at = datetime.combine(
+                    local_now.date() + timedelta(days=day_offset), time(hour, minute), tzinfo=tz
+                ) + spread
+                if local_at > local_now:
+                    upcoming.append((local_at, kind))
+                    break
+        
+        if upcoming:
+            local_at, kind = min(upcoming)
+            self.next_reminder_at = local_at.astimezone(dt_timezone.utc)
+            self.next_reminder_type = kind
+        return self.next_reminder_at
+    
     class Meta:
         db_table = 'style_profiles'
         verbose_name = 'Style Profile'
         verbose_name_plural = 'Style Profiles'
+        indexes = [
+            models.Index(fields=['next_reminder_at']),
+        ]
     
     def __str__(self):
         return f"Style Profile - {self.user.email}"
@@ -412,7 +529,10 @@ def create_user_related_models(sender, instance, created, **kwargs):
     """
     if created:
         FashionIQ.objects.get_or_create(user=instance)
-        StyleProfile.objects.get_or_create(user=instance)
+        profile, profile_created = StyleProfile.objects.get_or_create(user=instance)
+        if profile_created:
+            profile.schedule_next_reminder()
+            profile.save(update_fields=['next_reminder_at', 'next_reminder_type'])
 
 @receiver(post_save, sender=User)
 def save_user_related_models(sender, instance, **kwargs):
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from outfits.models import Outfit
+from social.models import LookbookPost, UserFollow
+from wardrobe.models import ClothingItem
+from .models import User
+
+
+# Model -> counter it drives on its owner
+OWNED_COUNTERS = {
+    ClothingItem: 'wardrobe_items_count',
+    Outfit: 'outfits_created_count',
+    LookbookPost: 'posts_count',
+}
+
+
+@receiver(post_save, sender=ClothingItem)
+@receiver(post_save, sender=Outfit)
+@receiver(post_save, sender=LookbookPost)
+def count_created(sender, instance, created, **kwargs):
+    if created:
+        User.adjust_counters(instance.user_id, **{OWNED_COUNTERS[sender]: 1})
+
+
+@receiver(post_delete, sender=ClothingItem)
+@receiver(post_delete, sender=Outfit)
+@receiver(post_delete, sender=LookbookPost)
+def count_deleted(sender, instance, **kwargs):
+    User.adjust_counters(instance.user_id, **{OWNED_COUNTERS[sender]: -1})
+
+
+@receiver(post_save, sender=UserFollow)
+def count_follow(sender, instance, created, **kwargs):
+    if created:
+        User.adjust_counters(instance.follower_id, following_count=1)
+        User.adjust_counters(instance.following_id, followers_count=1)
+
+
+@receiver(post_delete, sender=UserFollow)
+def count_unfollow(sender, instance, **kwargs):
+    User.adjust_counters(instance.follower_id, following_count=-1)
+    User.adjust_counters(instance.following_id, followers_count=-1)
@@ -1,3 +1,29 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .models import User
+
+
+class UserCounterTests(TestCase):
+    """
+    Saving a user must not overwrite counters maintained with adjust_counters()
+    """
+
+    def test_full_save_keeps_concurrent_counter_updates(self):
+        user = User.objects.create_user(username='counted', email='counted@example.com', password='x')
+        # Another request counts an item after this one loaded the user
+        User.adjust_counters(user.pk, wardrobe_items_count=2, followers_count=1)
+
+        user.first_name = 'Ada'
+        user.save()
+
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, 'Ada')
+        self.assertEqual((user.wardrobe_items_count, user.followers_count), (2, 1))
+
+    def test_counters_can_be_saved_explicitly(self):
+        user = User.objects.create_user(username='counted', email='counted@example.com', password='x')
+        user.posts_count = 4
+        user.save(update_fields=['posts_count'])
+
+        user.refresh_from_db()
+        self.assertEqual(user.posts_count, 4)
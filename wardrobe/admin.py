@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ClothingCategory, ClothingItem
+from .models import ClothingCategory, ClothingItem, WardrobeImportJob
 
 
 @admin.register(ClothingCategory)
@@ -18,3 +18,12 @@ class ClothingItemAdmin(admin.ModelAdmin):
     raw_id_fields = ['user', 'category']
     date_hierarchy = 'created_at'
     readonly_fields = ['times_worn', 'last_worn']
+
+
+@admin.register(WardrobeImportJob)
+class WardrobeImportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'status', 'processed_files', 'total_files', 'created_at', 'finished_at']
+    list_filter = ['status']
+    search_fields = ['user__email']
+    raw_id_fields = ['user']
+    readonly_fields = ['created_items', 'errors', 'started_at', 'finished_at']
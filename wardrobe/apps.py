@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WardrobeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'wardrobe'
+
+    def ready(self):
+        # Import signals to register them
+        import wardrobe.signals  # noqa
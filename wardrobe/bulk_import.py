@@ -0,0 +1,387 @@
+"""
+Bulk Wardrobe Import for Tailora
+
+Imports a directory or zip archive of clothing photos in one go: files are
+streamed one at a time, downscaled, stored and analyzed by a pool of worker
+threads, auto-categorized, then inserted with bulk_create in batches.
+
+Workers never touch the ORM; categories are resolved and rows written on
+the calling thread, so the import is safe on SQLite's single writer.
+
+Uploads through the API are not imported inside the request: the archive
+is stored as a WardrobeImportJob and WardrobeImportQueue runs it from the
+run_wardrobe_imports worker, recording progress the client polls.
+"""
+
+import io
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from .ai_image_analyzer import get_image_analyzer
+from .category_detector import CategoryDetector
+from .category_mapper import CategoryMapper
+from .models import ClothingItem, WardrobeImportJob
+from .stats_service import WardrobeStatsService
+from . import search_index
+
+
+logger = logging.getLogger(__name__)
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+# Same limits as the single-item upload
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_DIMENSION = 1920
+
+
+class BulkImportError(Exception):
+    """The import source itself cannot be read (per-file problems are reported, not raised)"""
+
+
+class WardrobeBulkImporter:
+    """
+    Import many clothing photos into a user's wardrobe
+    """
+
+    DEFAULT_WORKERS = 4
+    BATCH_SIZE = 50  # Items per bulk_create
+
+    def __init__(self, user, workers: int = DEFAULT_WORKERS, analyze: bool = True,
+                 progress: Optional[Callable] = None):
+        """
+        Args:
+            user: Owner of the imported items
+            workers: Threads decoding, storing and analyzing images
+            analyze: Run AI analysis and category detection (otherwise items
+                     are named after their file and left uncategorized)
+            progress: Optional callback(done, name, error) called after each file
+        """
+        self.user = user
+        self.workers = max(1, workers)
+        self.analyze = analyze
+        self.progress = progress
+        self.image_field = ClothingItem._meta.get_field('image')
+        self._category_cache = {}
+
+    # ==================== Sources ====================
+
+    @staticmethod
+    def iter_directory(path) -> Iterator[Tuple[str, Callable]]:
+        """Yield (name, open) for every image under a directory, in name order"""
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if Path(filename).suffix.lower() in IMAGE_EXTENSIONS and not filename.startswith('.'):
+                    full_path = os.path.join(root, filename)
+                    yield os.path.relpath(full_path, path), (lambda p=full_path: open(p, 'rb'))
+
+    @staticmethod
+    def iter_zip(archive: zipfile.ZipFile) -> Iterator[Tuple[str, Callable]]:
+        """Yield (name, open) for every image member of an archive"""
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith('__MACOSX/') or Path(name).name.startswith('.'):
+                continue
+            if Path(name).suffix.lower() in IMAGE_EXTENSIONS:
+                yield name, (lambda member=info: archive.open(member))
+
+    def import_path(self, path) -> dict:
+        """Import from a directory or a .zip file on disk"""
+        if os.path.isdir(path):
+            return self.import_files(self.iter_directory(path))
+        try:
+            with zipfile.ZipFile(path) as archive:
+                return self.import_files(self.iter_zip(archive))
+        except (zipfile.BadZipFile, OSError) as e:
+            raise BulkImportError(f"Cannot read {path}: {e}")
+
+    def import_zip(self, file_obj) -> dict:
+        """Import from an uploaded zip archive (any seekable file object)"""
+        try:
+            with zipfile.ZipFile(file_obj) as archive:
+                return self.import_files(self.iter_zip(archive))
+        except zipfile.BadZipFile as e:
+            raise BulkImportError(f"Not a valid zip archive: {e}")
+
+    # ==================== Pipeline ====================
+
+    def import_files(self, sources: Iterator[Tuple[str, Callable]]) -> dict:
+        """
+        Run the import pipeline over (name, open) pairs
+
+        Returns:
+            dict: 'created' (item ids), 'errors' (list of {'file', 'error'}),
+                  'processed' (files seen)
+        """
+        report = {'created': [], 'errors': [], 'processed': 0}
+        max_items = self.user.get_max_wardrobe_items()
+        if self.analyze:
+            get_image_analyzer()  # Initialize the shared analyzer before the workers race for it
+
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = []
+            for name, opener in sources:
+                if self.user.wardrobe_items_count >= max_items:
+                    # Don't spend analysis time on files that can't be added
+                    self._record(report, name, f"Wardrobe limit of {max_items} items reached")
+                    continue
+
+                # Read on this thread (zip members are not thread-safe), process in the pool
+                try:
+                    data = self._read(opener)
+                except ValueError as e:
+                    self._record(report, name, str(e))
+                    continue
+                in_flight.append((name, executor.submit(self._prepare, name, data)))
+
+                # Bound memory: keep at most two files per worker in flight
+                if len(in_flight) >= self.workers * 2:
+                    self._collect(in_flight.pop(0), pending, report)
+                if len(pending) >= self.BATCH_SIZE:
+                    self._flush(pending, report, max_items)
+
+            for entry in in_flight:
+                self._collect(entry, pending, report)
+        self._flush(pending, report, max_items)
+
+        if report['created']:
+            WardrobeStatsService.invalidate(self.user.id)
+        return report
+
+    @staticmethod
+    def _read(opener) -> bytes:
+        with opener() as handle:
+            data = handle.read(MAX_IMAGE_BYTES + 1)
+        if len(data) > MAX_IMAGE_BYTES:
+            raise ValueError('Image size must not exceed 5 MB')
+        return data
+
+    def _prepare(self, name: str, data: bytes) -> dict:
+        """Worker: downscale, store and analyze one image (no database access)"""
+        try:
+            image = Image.open(io.BytesIO(data))
+            # Let the JPEG decoder downscale while decoding: much cheaper than a full decode
+            image.draft('RGB', (MAX_DIMENSION, MAX_DIMENSION))
+            image.load()
+        except (UnidentifiedImageError, OSError):
+            raise ValueError('Not a readable image')
+
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        if image.width > MAX_DIMENSION or image.height > MAX_DIMENSION:
+            image.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        image.save(output, format='JPEG', quality=85, optimize=True)
+        jpeg = output.getvalue()
+
+        # Analyze the optimized copy, not the original camera-sized photo
+        analysis = get_image_analyzer().analyze_image(io.BytesIO(jpeg)) if self.analyze else {}
+
+        stem = Path(name).stem
+        stored_name = self.image_field.storage.save(
+            self.image_field.generate_filename(None, f"{stem}.jpg"),
+            ContentFile(jpeg)
+        )
+        return {'name': stem, 'image': stored_name, 'analysis': analysis}
+
+    def _collect(self, entry, pending, report):
+        name, future = entry
+        try:
+            pending.append((name, future.result()))
+        except Exception as e:
+            self._record(report, name, str(e))
+
+    def _flush(self, pending, report, max_items):
+        """Create the pending items, within the remaining wardrobe slots"""
+        if not pending:
+            return
+
+        batch = list(pending)
+        pending.clear()
+
+        try:
+            with transaction.atomic():
+                # Refresh the count under a row lock so concurrent uploads can't overshoot
+                self.user.can_add_wardrobe_items(len(batch))
+                slots = max(0, max_items - self.user.wardrobe_items_count)
+
+                accepted, rejected = batch[:slots], batch[slots:]
+                items = [self._build_item(prepared) for _, prepared in accepted]
+                ClothingItem.objects.bulk_create(items)
+                # bulk_create skips signals: maintain the counter and search index here
+                if items:
+                    self.user.increment_wardrobe_count(by=len(items))
+                    search_index.index_items(items)
+        except Exception as e:
+            for name, prepared in batch:
+                self.image_field.storage.delete(prepared['image'])
+                self._record(report, name, f"Could not save item ({e})")
+            return
+
+        for name, prepared in rejected:
+            self.image_field.storage.delete(prepared['image'])
+            self._record(report, name, f"Wardrobe limit of {max_items} items reached")
+
+        for (name, _), item in zip(accepted, items):
+            report['created'].append(item.id)
+            self._record(report, name)
+
+    def _build_item(self, prepared: dict) -> ClothingItem:
+        analysis = prepared['analysis']
+        item_type = analysis.get('item_type') or ''
+        color = (analysis.get('color') or '').strip()
+
+        if item_type and item_type != 'clothing item':
+            name = f"{color} {item_type}".strip().title()
+        else:
+            name = prepared['name'].replace('_', ' ').replace('-', ' ').strip().title()
+
+        tags = analysis.get('tags') or []
+        condition = analysis.get('condition')
+        if condition not in dict(ClothingItem.CONDITION_CHOICES):
+            condition = 'good'
+        return ClothingItem(
+            user=self.user,
+            name=name[:200] or 'Imported item',
+            description=analysis.get('description', '') or '',
+            category=self._resolve_category(item_type, analysis.get('category', '')) if self.analyze else None,
+            image=prepared['image'],
+            color=color[:50] or 'unknown',
+            color_hex=(analysis.get('color_hex') or '')[:7],
+            pattern=(analysis.get('pattern') or '')[:50],
+            material=(analysis.get('material') or '')[:100],
+            seasons=analysis.get('seasons') or [],
+            occasions=analysis.get('occasions') or [],
+            condition=condition,
+            tags=[str(tag) for tag in tags if tag],
+        )
+
+    def _resolve_category(self, item_type: str, ai_category: str):
+        """Category for an AI detection, cached for the duration of the import"""
+        key = (item_type.lower(), ai_category.lower())
+        if key not in self._category_cache:
+            category = CategoryDetector.detect_category(f"{item_type} {ai_category}", user=self.user)
+            if category is None:
+                category = CategoryMapper.get_category_for_ai_detection(ai_category, item_type, self.user)
+            self._category_cache[key] = category
+        return self._category_cache[key]
+
+    def _record(self, report, name, error=None):
+        report['processed'] += 1
+        if error:
+            report['errors'].append({'file': name, 'error': error})
+        if self.progress:
+            self.progress(report['processed'], name, error)
+
+
+class WardrobeImportQueue:
+    """
+    Runs queued WardrobeImportJobs outside the request cycle
+    """
+
+    POLL_INTERVAL = 5  # Seconds between worker polls
+    PROGRESS_EVERY = 5  # Files between progress writes
+    STALE_AFTER = timedelta(hours=2)  # A running job this old lost its worker
+
+    @staticmethod
+    def enqueue(user, archive) -> WardrobeImportJob:
+        """Store an uploaded archive and queue its import"""
+        job = WardrobeImportJob(user=user)
+        job.archive.save(f"{job.id}.zip", archive, save=False)
+        job.save()
+        return job
+
+    @classmethod
+    def run_queued(cls) -> list:
+        """
+        Claim and run queued jobs, oldest first, until none are left
+
+        Returns:
+            list: Jobs that were run
+        """
+        cls.fail_stale()
+        jobs = []
+        while True:
+            job = cls._claim_next()
+            if job is None:
+                return jobs
+            cls.run(job)
+            jobs.append(job)
+
+    @staticmethod
+    def _claim_next():
+        """Next queued job, marked running; the conditional UPDATE makes the claim exclusive"""
+        for job in WardrobeImportJob.objects.filter(status='queued').order_by('created_at')[:10]:
+            now = timezone.now()
+            if WardrobeImportJob.objects.filter(pk=job.pk, status='queued').update(
+                status='running', started_at=now
+            ):
+                job.status, job.started_at = 'running', now
+                return job
+        return None
+
+    @classmethod
+    def fail_stale(cls):
+        """Running jobs whose worker died never finish: report them as failed"""
+        return WardrobeImportJob.objects.filter(
+            status='running',
+            started_at__lt=timezone.now() - cls.STALE_AFTER
+        ).update(
+            status='failed',
+            error_message='The import was interrupted',
+            finished_at=timezone.now()
+        )
+
+    @classmethod
+    def run(cls, job, **importer_options):
+        """Import a claimed job's archive, recording progress on the job"""
+        def progress(done, name, error):
+            if error:
+                job.errors.append({'file': name, 'error': error})
+            if error or done % cls.PROGRESS_EVERY == 0:
+                WardrobeImportJob.objects.filter(pk=job.pk).update(processed_files=done, errors=job.errors)
+
+        importer = WardrobeBulkImporter(job.user, progress=progress, **importer_options)
+        try:
+            with job.archive.open('rb') as handle, zipfile.ZipFile(handle) as archive:
+                job.total_files = sum(1 for _ in importer.iter_zip(archive))
+                WardrobeImportJob.objects.filter(pk=job.pk).update(total_files=job.total_files)
+                report = importer.import_files(importer.iter_zip(archive))
+        except zipfile.BadZipFile as e:
+            cls._finish(job, 'failed', error_message=f"Not a valid zip archive: {e}")
+        except Exception as e:
+            logger.exception(f"Wardrobe import {job.id} failed")
+            cls._finish(job, 'failed', error_message=f"Import failed: {e}")
+        else:
+            job.processed_files = report['processed']
+            job.created_items = [str(item_id) for item_id in report['created']]
+            job.errors = report['errors']
+            cls._finish(job, 'done')
+        return job
+
+    @staticmethod
+    def _finish(job, status, error_message=''):
+        job.status = status
+        job.error_message = error_message
+        job.finished_at = timezone.now()
+        job.archive.delete(save=False)
+        job.save()
@@ -1,7 +1,7 @@
 """
 AI Category Detector - Maps AI detection results to simplified categories
 """
-from wardrobe.models import ClothingCategory
+from wardrobe.category_resolver import CategoryResolver
 
 
 class CategoryDetector:
@@ -37,15 +37,12 @@ class CategoryDetector:
             return None
         
         text_lower = ai_result_text.lower()
+        resolver = CategoryResolver(user)
         
         # Check each category's keywords
         for category_name, keywords in cls.CATEGORY_MAP.items():
             if any(keyword in text_lower for keyword in keywords):
-                # Get or create the category
-                category = ClothingCategory.objects.filter(
-                    name=category_name,
-                    is_custom=False
-                ).first()
+                category = resolver.get_global(category_name)
                 
                 if category:
                     return category
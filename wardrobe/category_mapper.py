@@ -1,7 +1,7 @@
 """
 Category Mapper - Maps AI-detected item types to database categories
 """
-from .models import ClothingCategory
+from .category_resolver import CategoryResolver
 
 
 class CategoryMapper:
@@ -87,12 +87,14 @@ class CategoryMapper:
         Returns:
             ClothingCategory object or None
         """
+        resolver = CategoryResolver(user)
+        
         # Try item type first (more specific)
         if item_type:
             item_type_lower = item_type.lower().strip()
             if item_type_lower in cls.ITEM_TYPE_TO_CATEGORY:
                 category_name = cls.ITEM_TYPE_TO_CATEGORY[item_type_lower]
-                category = cls._find_category(category_name, user)
+                category = resolver.find(category_name)
                 if category:
                     return category
         
@@ -102,7 +104,7 @@ class CategoryMapper:
             if ai_category_lower in cls.AI_TO_DB_MAPPING:
                 possible_names = cls.AI_TO_DB_MAPPING[ai_category_lower]
                 for name in possible_names:
-                    category = cls._find_category(name, user)
+                    category = resolver.find(name)
                     if category:
                         return category
         
@@ -120,31 +122,8 @@ class CategoryMapper:
         Returns:
             ClothingCategory object or None
         """
-        # Try exact match first
-        try:
-            # Try global category first
-            return ClothingCategory.objects.get(name=name, is_custom=False, user=None)
-        except ClothingCategory.DoesNotExist:
-            pass
-        
-        # Try user custom category
-        if user:
-            try:
-                return ClothingCategory.objects.get(name=name, user=user, is_custom=True)
-            except ClothingCategory.DoesNotExist:
-                pass
-        
-        # Try case-insensitive match
-        try:
-            return ClothingCategory.objects.filter(
-                name__iexact=name,
-                is_custom=False,
-                user=None
-            ).first()
-        except:
-            pass
-        
-        return None
+        # Exact global, exact custom, then case-insensitive global (cached, no queries)
+        return CategoryResolver(user).find(name)
     
     @classmethod
     def get_suggested_categories(cls, ai_category, item_type=None):
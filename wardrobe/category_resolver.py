@@ -0,0 +1,205 @@
+"""
+Category Resolver for Tailora
+
+Resolves clothing category names and ids for a user without querying
+ClothingCategory on every detection or form render. Built-in categories
+are kept in-process, each user's custom categories in a small in-process
+LRU; both are versioned through the Django cache so category saves and
+deletes (see wardrobe.signals) expire them in other worker processes too.
+Versions are read with one get_many and then trusted in-process for
+VERSION_CHECK_INTERVAL seconds, so a warm resolver costs no cache round
+trip; other processes see a change within that interval. Across processes
+this needs a shared cache (settings REDIS_URL); with the per-process
+default other workers keep serving stale categories.
+
+Returned categories are shared between requests: treat them as read-only.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from .models import ClothingCategory
+
+
+# Same version key as the gallery filter options (WardrobeStatsService)
+GLOBAL_VERSION_KEY = 'wardrobe_categories_version'
+
+
+class _CategorySet:
+    """Categories with name and id lookups"""
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self.by_id = {category.id: category for category in self.categories}
+        self.by_name = {}
+        self.by_lower_name = {}
+        for category in self.categories:
+            self.by_name.setdefault(category.name, category)
+            self.by_lower_name.setdefault(category.name.lower(), category)
+
+
+class CategoryResolver:
+    """
+    Category lookups for one user (or built-in categories only)
+    """
+
+    MAX_CACHED_USERS = 512
+    VERSION_CHECK_INTERVAL = 5  # Seconds a version read from the cache is trusted
+
+    _lock = threading.Lock()
+    _global = None  # (version, _CategorySet)
+    _custom = OrderedDict()  # user_id -> (version, _CategorySet), least recently used first
+    _versions = {}  # version key -> (version, time.monotonic() when read)
+
+    def __init__(self, user=None):
+        self.user = user
+        self._global_set = None
+        self._custom_set = None
+        self._version_map = None
+
+    # ==================== Invalidation ====================
+
+    @staticmethod
+    def user_version_key(user_id):
+        return f"wardrobe_custom_categories_version_{user_id}"
+
+    @classmethod
+    def invalidate_user(cls, user_id):
+        """A user's custom categories changed"""
+        try:
+            cache.incr(cls.user_version_key(user_id))
+        except ValueError:
+            cache.set(cls.user_version_key(user_id), 1, None)
+        with cls._lock:
+            cls._custom.pop(user_id, None)
+            cls._versions.pop(cls.user_version_key(user_id), None)
+
+    @classmethod
+    def invalidate_global(cls):
+        """
+        Built-in categories changed: drop this process's copy. Other
+        processes follow the GLOBAL_VERSION_KEY bump made by
+        WardrobeStatsService.invalidate_shared_categories()
+        """
+        with cls._lock:
+            cls._global = None
+            cls._versions.pop(GLOBAL_VERSION_KEY, None)
+
+    # ==================== Versions ====================
+
+    @classmethod
+    def _read_versions(cls, keys):
+        """
+        Versions of these keys: recently read ones from memory, the rest
+        with a single get_many
+        """
+        now = time.monotonic()
+        versions = {}
+        with cls._lock:
+            for key in keys:
+                entry = cls._versions.get(key)
+                if entry is not None and now - entry[1] < cls.VERSION_CHECK_INTERVAL:
+                    versions[key] = entry[0]
+        stale = [key for key in keys if key not in versions]
+        if stale:
+            fetched = cache.get_many(stale)
+            for key in stale:
+                if key not in fetched:
+                    # add() never overwrites a concurrent bump
+                    cache.add(key, 1, None)
+                    fetched[key] = 1
+            with cls._lock:
+                for key in stale:
+                    cls._versions[key] = (fetched[key], now)
+            versions.update(fetched)
+        return versions
+
+    def _version(self, key):
+        """Version of a key, read once per resolver for both keys together"""
+        if self._version_map is None:
+            keys = [GLOBAL_VERSION_KEY]
+            if self.user:
+                keys.append(self.user_version_key(self.user.id))
+            self._version_map = self._read_versions(keys)
+        return self._version_map[key]
+
+    # ==================== Loading ====================
+
+    @classmethod
+    def _load_global(cls, version):
+        with cls._lock:
+            if cls._global is not None and cls._global[0] == version:
+                return cls._global[1]
+
+        category_set = _CategorySet(ClothingCategory.objects.filter(is_custom=False))
+        with cls._lock:
+            cls._global = (version, category_set)
+        return category_set
+
+    @classmethod
+    def _load_custom(cls, user_id, version):
+        with cls._lock:
+            entry = cls._custom.get(user_id)
+            if entry is not None and entry[0] == version:
+                cls._custom.move_to_end(user_id)
+                return entry[1]
+
+        category_set = _CategorySet(ClothingCategory.objects.filter(user_id=user_id, is_custom=True))
+        with cls._lock:
+            cls._custom[user_id] = (version, category_set)
+            cls._custom.move_to_end(user_id)
+            while len(cls._custom) > cls.MAX_CACHED_USERS:
+                evicted, _ = cls._custom.popitem(last=False)
+                cls._versions.pop(cls.user_version_key(evicted), None)
+        return category_set
+
+    @property
+    def global_set(self):
+        if self._global_set is None:
+            self._global_set = self._load_global(self._version(GLOBAL_VERSION_KEY))
+        return self._global_set
+
+    @property
+    def custom_set(self):
+        if self._custom_set is None:
+            if self.user:
+                user_id = self.user.id
+                self._custom_set = self._load_custom(user_id, self._version(self.user_version_key(user_id)))
+            else:
+                self._custom_set = _CategorySet([])
+        return self._custom_set
+
+    # ==================== Lookups ====================
+
+    def categories(self):
+        """Built-in categories followed by the user's custom ones"""
+        return self.global_set.categories + self.custom_set.categories
+
+    def get_by_id(self, category_id):
+        """Category available to the user with this id, or None"""
+        try:
+            category_id = ClothingCategory._meta.pk.to_python(category_id)
+        except Exception:
+            return None
+        return self.global_set.by_id.get(category_id) or self.custom_set.by_id.get(category_id)
+
+    def get_global(self, name):
+        """Built-in category with exactly this name, or None"""
+        return self.global_set.by_name.get(name)
+
+    def find(self, name):
+        """
+        Find a category by name: exact built-in, exact custom, then
+        case-insensitive built-in match
+
+        Returns:
+            ClothingCategory object or None
+        """
+        return (
+            self.global_set.by_name.get(name)
+            or self.custom_set.by_name.get(name)
+            or self.global_set.by_lower_name.get(name.lower())
+        )
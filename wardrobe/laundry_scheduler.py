@@ -8,7 +8,8 @@ Tracks clothing wear/wash cycles and alerts users when:
 """
 
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, F, Case, When, Value, IntegerField
+from django.db.models.functions import Greatest
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 
@@ -82,9 +83,85 @@ class LaundrySchedulerAI:
     # Default threshold if category not found
     DEFAULT_THRESHOLD = 3
     
+    # Max item ids per bulk UPDATE
+    UPDATE_CHUNK_SIZE = 500
+    
+    # Statuses that mean the item is away being cleaned
+    LAUNDRY_STATUSES = ['washing', 'drying', 'dry_cleaning']
+    
+    # Load capacity (items) and cycle length (hours) per care type.
+    # Only machine washes compete for the same appliance.
+    LOAD_PROFILES = {
+        'machine_wash': {'capacity': 12, 'cycle_hours': 2, 'shared': True},
+        'hand_wash': {'capacity': 6, 'cycle_hours': 1, 'shared': False},
+        'dry_clean': {'capacity': 15, 'cycle_hours': 48, 'shared': False},
+        'spot_clean': {'capacity': 10, 'cycle_hours': 1, 'shared': False},
+    }
+    
+    # Items in the same load dry together, so loads only mix items whose
+    # drying time falls in the same band (hours)
+    DRYING_BANDS = [4, 12, 24, 48]
+    
+    # Planned outfits must be clean and dry by this hour on the day
+    NEED_BY_HOUR = 7
+    
     def __init__(self, user: User):
         self.user = user
     
+    @staticmethod
+    def annotate_urgency(queryset):
+        """
+        Annotate `urgency` with the same levels as ClothingItem.urgency_level(),
+        computed in SQL. Ratios are cross-multiplied to stay in integers:
+        wears/max >= 1.5  <=>  2*wears >= 3*max, and >= 0.7  <=>  10*wears >= 7*max.
+        """
+        limit = Greatest(F('max_wears_before_wash'), Value(1))
+        wears = F('wears_since_wash')
+        return queryset.alias(
+            urgency_overdue=wears * 2 - limit * 3,
+            urgency_due=wears - limit,
+            urgency_approaching=wears * 10 - limit * 7,
+        ).annotate(
+            urgency=Case(
+                When(wears_since_wash__lte=0, then=Value(0)),
+                When(urgency_overdue__gte=0, then=Value(3)),
+                When(urgency_due__gte=0, then=Value(2)),
+                When(urgency_approaching__gte=0, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+    
+    def get_laundry_buckets(self) -> Dict[str, List[ClothingItem]]:
+        """
+        Every laundry bucket from one query: available items by urgency
+        (served by the (user, status, wears_since_wash) index) plus items
+        away at the laundry by status.
+        """
+        buckets = {
+            'overdue': [],
+            'needs_wash': [],
+            'approaching': [],
+            'washing': [],
+            'drying': [],
+            'dry_cleaning': [],
+        }
+        items = self.annotate_urgency(
+            ClothingItem.objects.filter(user=self.user)
+        ).filter(
+            Q(status='available', wears_since_wash__gt=0, urgency__gte=1) |
+            Q(status__in=self.LAUNDRY_STATUSES)
+        ).order_by('-urgency', '-wears_since_wash')
+        
+        urgency_buckets = {3: 'overdue', 2: 'needs_wash', 1: 'approaching'}
+        for item in items:
+            if item.status == 'available':
+                buckets[urgency_buckets[item.urgency]].append(item)
+            else:
+                buckets[item.status].append(item)
+        
+        return buckets
+    
     def get_wash_threshold(self, item: ClothingItem) -> int:
         """
         Get recommended wash threshold for an item based on its category/name.
@@ -94,19 +171,21 @@ class LaundrySchedulerAI:
         if item.max_wears_before_wash != 3:  # 3 is the default
             return item.max_wears_before_wash
         
-        # Try to match category
-        category_name = ''
-        if item.category:
-            category_name = item.category.name.lower()
-        
-        item_name = item.name.lower()
+        category_name = item.category.name if item.category else ''
+        return self.recommend_threshold(category_name, item.name)
+    
+    @classmethod
+    def recommend_threshold(cls, category_name: Optional[str], item_name: str) -> int:
+        """AI recommendation from the category and item names"""
+        category_name = (category_name or '').lower()
+        item_name = (item_name or '').lower()
         
         # Check both category and item name for matches
-        for key, threshold in self.WASH_THRESHOLDS.items():
+        for key, threshold in cls.WASH_THRESHOLDS.items():
             if key in category_name or key in item_name:
                 return threshold
         
-        return self.DEFAULT_THRESHOLD
+        return cls.DEFAULT_THRESHOLD
     
     def auto_set_wash_threshold(self, item: ClothingItem) -> int:
         """
@@ -119,42 +198,82 @@ class LaundrySchedulerAI:
             item.save(update_fields=['max_wears_before_wash'])
         return threshold
     
+    @classmethod
+    def bulk_set_wash_thresholds(cls, queryset, dry_run: bool = False) -> Dict[int, int]:
+        """
+        Auto-set thresholds for every item in `queryset` still on the default.
+        
+        Thresholds are computed from (id, name, category name) rows without
+        loading model instances, then written as one UPDATE per threshold
+        value (chunked to stay under SQL parameter limits).
+        
+        Returns:
+            dict: {threshold: number of items set to it}
+        """
+        ids_by_threshold = {}
+        rows = queryset.filter(
+            max_wears_before_wash=cls.DEFAULT_THRESHOLD
+        ).values_list('id', 'name', 'category__name').iterator(chunk_size=2000)
+        
+        for item_id, name, category_name in rows:
+            threshold = cls.recommend_threshold(category_name, name)
+            if threshold != cls.DEFAULT_THRESHOLD:
+                ids_by_threshold.setdefault(threshold, []).append(item_id)
+        
+        updated = {}
+        for threshold, ids in ids_by_threshold.items():
+            if dry_run:
+                updated[threshold] = len(ids)
+                continue
+            
+            updated[threshold] = 0
+            for start in range(0, len(ids), cls.UPDATE_CHUNK_SIZE):
+                # Re-check the default so concurrent user edits are not overwritten
+                updated[threshold] += ClothingItem.objects.filter(
+                    id__in=ids[start:start + cls.UPDATE_CHUNK_SIZE],
+                    max_wears_before_wash=cls.DEFAULT_THRESHOLD
+                ).update(max_wears_before_wash=threshold)
+        
+        return updated
+    
+    def auto_set_all_thresholds(self) -> int:
+        """Auto-set thresholds for all of the user's items, returns items updated"""
+        updated = self.bulk_set_wash_thresholds(
+            ClothingItem.objects.filter(user=self.user)
+        )
+        return sum(updated.values())
+    
     def get_items_needing_wash(self) -> List[ClothingItem]:
         """Get all items that need washing"""
-        items = ClothingItem.objects.filter(
-            user=self.user,
-            status='available'
-        )
-        return [item for item in items if item.needs_washing()]
+        return list(self.annotate_urgency(
+            ClothingItem.objects.filter(
+                user=self.user,
+                status='available',
+                wears_since_wash__gt=0
+            )
+        ).filter(urgency__gte=2).order_by('-urgency', '-wears_since_wash'))
     
     def get_items_approaching_wash(self) -> List[ClothingItem]:
         """Get items approaching their wash limit (70%+ of threshold)"""
-        items = ClothingItem.objects.filter(
-            user=self.user,
-            status='available'
-        )
-        return [item for item in items if item.urgency_level() == 1]
+        return list(self.annotate_urgency(
+            ClothingItem.objects.filter(
+                user=self.user,
+                status='available',
+                wears_since_wash__gt=0
+            )
+        ).filter(urgency=1).order_by('-wears_since_wash'))
     
     def get_items_at_laundry(self) -> Dict[str, List[ClothingItem]]:
         """Get items currently being washed or at dry cleaners"""
-        washing = list(ClothingItem.objects.filter(
-            user=self.user,
-            status='washing'
-        ))
-        drying = list(ClothingItem.objects.filter(
-            user=self.user,
-            status='drying'
-        ))
-        dry_cleaning = list(ClothingItem.objects.filter(
+        at_laundry = {status: [] for status in self.LAUNDRY_STATUSES}
+        items = ClothingItem.objects.filter(
             user=self.user,
-            status='dry_cleaning'
-        ))
+            status__in=self.LAUNDRY_STATUSES
+        )
+        for item in items:
+            at_laundry[item.status].append(item)
         
-        return {
-            'washing': washing,
-            'drying': drying,
-            'dry_cleaning': dry_cleaning,
-        }
+        return at_laundry
     
     def check_outfit_laundry_status(self, outfit) -> Dict:
         """
@@ -195,7 +314,12 @@ class LaundrySchedulerAI:
         """
         conflicts = []
         
-        for slot in weekly_plan.daily_slots.all():
+        # Slots, outfits and their items in three queries regardless of plan size
+        slots = weekly_plan.daily_slots.select_related(
+            'primary_outfit'
+        ).prefetch_related('primary_outfit__items').order_by('date')
+        
+        for slot in slots:
             if not slot.primary_outfit:
                 continue
             
@@ -219,10 +343,18 @@ class LaundrySchedulerAI:
         Create LaundryAlert objects for all conflicts in a weekly plan.
         Returns list of created alerts.
         """
-        from planner.models import DailyPlanSlot
-        
         conflicts = self.check_weekly_plan_conflicts(weekly_plan)
-        alerts_created = []
+        if not conflicts:
+            return []
+        
+        # Load the week's unresolved alerts once instead of an exists() per item
+        existing = set(LaundryAlert.objects.filter(
+            user=self.user,
+            planned_date__in=[conflict['date'] for conflict in conflicts],
+            is_resolved=False
+        ).values_list('clothing_item_id', 'planned_date'))
+        
+        new_alerts = []
         
         for conflict in conflicts:
             slot = conflict['slot']
@@ -237,58 +369,47 @@ class LaundrySchedulerAI:
             
             # Create alerts for items needing wash
             for item in conflict['needs_wash']:
-                # Check if alert already exists
-                existing = LaundryAlert.objects.filter(
+                if (item.id, planned_date) in existing:
+                    continue
+                existing.add((item.id, planned_date))
+                
+                new_alerts.append(LaundryAlert(
                     user=self.user,
                     clothing_item=item,
                     planned_date=planned_date,
-                    is_resolved=False
-                ).exists()
-                
-                if not existing:
-                    alert = LaundryAlert.objects.create(
-                        user=self.user,
-                        clothing_item=item,
-                        planned_date=planned_date,
-                        daily_slot=slot,
-                        alert_type='needs_washing',
-                        priority='high' if item.urgency_level() >= 3 else 'medium',
-                        message=f"'{item.name}' needs washing before {slot.day_name}. "
-                                f"Worn {item.wears_since_wash}/{item.max_wears_before_wash} times since last wash.",
-                        deadline=deadline,
-                    )
-                    alerts_created.append(alert)
+                    daily_slot=slot,
+                    alert_type='needs_washing',
+                    priority='high' if item.urgency_level() >= 3 else 'medium',
+                    message=f"'{item.name}' needs washing before {slot.day_name}. "
+                            f"Worn {item.wears_since_wash}/{item.max_wears_before_wash} times since last wash.",
+                    deadline=deadline,
+                ))
             
             # Create alerts for unavailable items
             for item in conflict['unavailable']:
-                existing = LaundryAlert.objects.filter(
+                if (item.id, planned_date) in existing:
+                    continue
+                existing.add((item.id, planned_date))
+                
+                if item.status == 'dry_cleaning':
+                    alert_type = 'at_cleaners'
+                    msg = f"'{item.name}' is at the dry cleaners. Pick it up before {slot.day_name}."
+                else:
+                    alert_type = 'drying_time'
+                    msg = f"'{item.name}' is currently {item.get_status_display()}. Make sure it's ready by {slot.day_name}."
+                
+                new_alerts.append(LaundryAlert(
                     user=self.user,
                     clothing_item=item,
                     planned_date=planned_date,
-                    is_resolved=False
-                ).exists()
-                
-                if not existing:
-                    if item.status == 'dry_cleaning':
-                        alert_type = 'at_cleaners'
-                        msg = f"'{item.name}' is at the dry cleaners. Pick it up before {slot.day_name}."
-                    else:
-                        alert_type = 'drying_time'
-                        msg = f"'{item.name}' is currently {item.get_status_display()}. Make sure it's ready by {slot.day_name}."
-                    
-                    alert = LaundryAlert.objects.create(
-                        user=self.user,
-                        clothing_item=item,
-                        planned_date=planned_date,
-                        daily_slot=slot,
-                        alert_type=alert_type,
-                        priority='high',
-                        message=msg,
-                        deadline=deadline,
-                    )
-                    alerts_created.append(alert)
-        
-        return alerts_created
+                    daily_slot=slot,
+                    alert_type=alert_type,
+                    priority='high',
+                    message=msg,
+                    deadline=deadline,
+                ))
+        
+        return LaundryAlert.objects.bulk_create(new_alerts)
     
     def get_active_alerts(self) -> List[LaundryAlert]:
         """Get all unresolved laundry alerts for user"""
@@ -318,15 +439,243 @@ class LaundrySchedulerAI:
         item.mark_worn()
         return item
     
+    @classmethod
+    def _drying_band(cls, care_type: str, drying_hours: int) -> int:
+        """Drying band an item belongs to (dry cleaning comes back dry)"""
+        if care_type == 'dry_clean':
+            return 0
+        for band in cls.DRYING_BANDS:
+            if drying_hours <= band:
+                return band
+        return drying_hours
+    
+    @classmethod
+    def pack_wash_loads(cls, tasks: List[Dict], now: datetime, horizon_end: datetime) -> List[Dict]:
+        """
+        Group wash tasks into few loads, scheduled to meet their deadlines.
+        
+        Machine-wash loads share a single machine and run one after the
+        other; hand wash, dry cleaning and spot cleaning loads can all start
+        now. A load only mixes items of one care type and drying band.
+        
+        Loads are built earliest-deadline-first on that timeline: the task
+        with the earliest latest start that can still make its deadline
+        opens a load at the next free machine slot, and the load is filled
+        with tasks of the same group, in deadline order, as long as every
+        item in it stays on time. Tasks that can no longer make it are
+        scheduled after those that can, so they don't push others late.
+        Optional tasks then top up on-time loads that have spare room.
+        
+        Args:
+            tasks: Dicts with 'item', 'care_type', 'drying_hours',
+                   'need_by' (datetime or None), 'mandatory' and 'priority'
+            now: Earliest possible start
+            horizon_end: Deadline used for tasks with no planned wear
+        
+        Returns:
+            list: Load dicts ordered by start time. 'infeasible_items' could
+                  not be ready in time even if washed alone right now;
+                  'late_items' could have been, but the shared machine is
+                  busy until too late.
+        """
+        entries = []
+        for task in tasks:
+            care_type = task['care_type'] if task['care_type'] in cls.LOAD_PROFILES else 'machine_wash'
+            entries.append({
+                'task': task,
+                'key': (care_type, cls._drying_band(care_type, task['drying_hours'])),
+                'need_by': task['need_by'] or horizon_end,
+                # Dry cleaning comes back dry
+                'drying_hours': 0 if care_type == 'dry_clean' else task['drying_hours'],
+            })
+        
+        def ready_at(start, key, drying_hours):
+            return start + timedelta(hours=cls.LOAD_PROFILES[key[0]]['cycle_hours'] + drying_hours)
+        
+        def latest_start(entry):
+            return entry['need_by'] - (ready_at(now, entry['key'], entry['drying_hours']) - now)
+        
+        pending = sorted((e for e in entries if e['task']['mandatory']), key=latest_start)
+        optional = sorted(
+            (e for e in entries if not e['task']['mandatory']),
+            key=lambda e: -e['task']['priority']
+        )
+        
+        loads = []
+        machine_free = now
+        
+        def start_for(entry):
+            return machine_free if cls.LOAD_PROFILES[entry['key'][0]]['shared'] else now
+        
+        while pending:
+            seed = next(
+                (e for e in pending if ready_at(start_for(e), e['key'], e['drying_hours']) <= e['need_by']),
+                pending[0]
+            )
+            key = seed['key']
+            start = start_for(seed)
+            on_time = ready_at(start, key, seed['drying_hours']) <= seed['need_by']
+            load = {
+                'key': key,
+                'start': start,
+                'entries': [seed],
+                'need_by': seed['need_by'],
+                'drying_hours': seed['drying_hours'],
+            }
+            
+            capacity = cls.LOAD_PROFILES[key[0]]['capacity']
+            for entry in pending:
+                if len(load['entries']) >= capacity:
+                    break
+                if entry is seed or entry['key'] != key:
+                    continue
+                drying = max(load['drying_hours'], entry['drying_hours'])
+                if on_time:
+                    # Don't turn an on-time load into a late one
+                    fits = ready_at(start, key, drying) <= min(load['need_by'], entry['need_by'])
+                else:
+                    # A late load only takes items that are late at this start anyway
+                    fits = ready_at(start, key, entry['drying_hours']) > entry['need_by']
+                if fits:
+                    load['entries'].append(entry)
+                    load['need_by'] = min(load['need_by'], entry['need_by'])
+                    load['drying_hours'] = drying
+            
+            packed = {id(entry) for entry in load['entries']}
+            pending = [entry for entry in pending if id(entry) not in packed]
+            if cls.LOAD_PROFILES[key[0]]['shared']:
+                machine_free = start + timedelta(hours=cls.LOAD_PROFILES[key[0]]['cycle_hours'])
+            loads.append(load)
+        
+        # Top up on-time loads with items that are close to their limit
+        for entry in optional:
+            for load in loads:
+                if load['key'] != entry['key']:
+                    continue
+                if len(load['entries']) >= cls.LOAD_PROFILES[load['key'][0]]['capacity']:
+                    continue
+                need_by = min(load['need_by'], entry['need_by'])
+                drying = max(load['drying_hours'], entry['drying_hours'])
+                if ready_at(load['start'], load['key'], load['drying_hours']) > load['need_by']:
+                    continue
+                if ready_at(load['start'], load['key'], drying) <= need_by:
+                    load['entries'].append(entry)
+                    load['need_by'] = need_by
+                    load['drying_hours'] = drying
+                    break
+        
+        schedule = []
+        for load in loads:
+            ready = ready_at(load['start'], load['key'], load['drying_hours'])
+            infeasible = [
+                e for e in load['entries']
+                if ready_at(now, e['key'], e['drying_hours']) > e['need_by']
+            ]
+            late = [e for e in load['entries'] if ready > e['need_by'] and e not in infeasible]
+            schedule.append({
+                'care_type': load['key'][0],
+                'drying_hours': load['drying_hours'],
+                'items': [e['task']['item'] for e in load['entries']],
+                'start': load['start'],
+                'ready': ready,
+                'need_by': load['need_by'],
+                'on_time': ready <= load['need_by'],
+                'infeasible_items': [e['task']['item'] for e in infeasible],
+                'late_items': [e['task']['item'] for e in late],
+            })
+        
+        schedule.sort(key=lambda load: load['start'])
+        return schedule
+    
+    def plan_wash_loads(self, days: int = 7, now: Optional[datetime] = None) -> Dict:
+        """
+        Plan wash loads for items needing (or nearly needing) a wash.
+        
+        An item's deadline is the morning of the first planned wear in the
+        next `days` days at which it would be over its wash limit. Items
+        already over the limit with no planned wear are due by the end of
+        the horizon; items merely approaching it only fill spare load space.
+        
+        Returns dict with the load schedule, the items that cannot be ready
+        for their planned wear whatever the schedule (infeasible_items), and
+        those the schedule makes late (late_items).
+        """
+        from planner.models import DailyPlanSlot
+        
+        now = now or timezone.now()
+        today = timezone.localdate(now)
+        # Today's outfit is already on once the need-by hour has passed
+        first_day = today if timezone.localtime(now).hour < self.NEED_BY_HOUR else today + timedelta(days=1)
+        horizon_end = timezone.make_aware(datetime.combine(
+            today + timedelta(days=days),
+            datetime.min.time().replace(hour=self.NEED_BY_HOUR)
+        ))
+        
+        # Planned wears per item over the horizon, in date order
+        planned = {}
+        demand = DailyPlanSlot.objects.filter(
+            weekly_plan__user=self.user,
+            date__gte=first_day,
+            date__lt=today + timedelta(days=days),
+            primary_outfit__isnull=False,
+            primary_outfit__items__isnull=False
+        ).order_by('date').values_list('primary_outfit__items', 'date')
+        for item_id, planned_date in demand:
+            planned.setdefault(item_id, []).append(planned_date)
+        
+        items = self.annotate_urgency(
+            ClothingItem.objects.filter(user=self.user, status='available')
+        ).filter(
+            Q(urgency__gte=1) | Q(id__in=list(planned))
+        )
+        
+        tasks = []
+        for item in items:
+            wears = item.wears_since_wash
+            limit = max(item.max_wears_before_wash, 1)
+            need_by = None
+            for planned_date in planned.get(item.id, []):
+                if wears >= limit:
+                    need_by = timezone.make_aware(datetime.combine(
+                        planned_date,
+                        datetime.min.time().replace(hour=self.NEED_BY_HOUR)
+                    ))
+                    break
+                wears += 1
+            
+            mandatory = need_by is not None or item.urgency >= 2
+            if not mandatory and item.urgency == 0:
+                continue
+            
+            tasks.append({
+                'item': item,
+                'care_type': item.care_type,
+                'drying_hours': item.drying_time_hours,
+                'need_by': need_by,
+                'mandatory': mandatory,
+                'priority': item.urgency,
+            })
+        
+        loads = self.pack_wash_loads(tasks, now, horizon_end)
+        
+        return {
+            'loads': loads,
+            'load_count': len(loads),
+            'item_count': sum(len(load['items']) for load in loads),
+            'infeasible_items': [item for load in loads for item in load['infeasible_items']],
+            'late_items': [item for load in loads for item in load['late_items']],
+        }
+    
     def get_laundry_summary(self) -> Dict:
         """
         Get a complete laundry summary for the user.
         
         Returns dict with counts and lists for dashboard display.
         """
-        needs_wash = self.get_items_needing_wash()
-        approaching = self.get_items_approaching_wash()
-        at_laundry = self.get_items_at_laundry()
+        buckets = self.get_laundry_buckets()
+        needs_wash = buckets['overdue'] + buckets['needs_wash']
+        approaching = buckets['approaching']
+        at_laundry = {status: buckets[status] for status in self.LAUNDRY_STATUSES}
         active_alerts = self.get_active_alerts()
         
         # Count urgent alerts (deadline within 24 hours)
@@ -339,6 +688,7 @@ class LaundrySchedulerAI:
         return {
             'needs_wash_count': len(needs_wash),
             'needs_wash_items': needs_wash,
+            'overdue_items': buckets['overdue'],
             'approaching_count': len(approaching),
             'approaching_items': approaching,
             'at_laundry': at_laundry,
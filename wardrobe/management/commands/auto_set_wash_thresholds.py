@@ -0,0 +1,58 @@
+"""
+Django Management Command: Auto-set Wash Thresholds
+
+Applies the AI-recommended wash threshold to every clothing item still
+on the default, across all users, using one UPDATE per threshold value.
+
+Usage:
+    # All users
+    python manage.py auto_set_wash_thresholds
+
+    # A single user
+    python manage.py auto_set_wash_thresholds --email user@example.com
+
+    # Dry run (only report what would change)
+    python manage.py auto_set_wash_thresholds --dry-run
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import User
+from wardrobe.laundry_scheduler import LaundrySchedulerAI
+from wardrobe.models import ClothingItem
+
+
+class Command(BaseCommand):
+    help = 'Auto-set laundry wash thresholds for items still on the default'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email',
+            type=str,
+            help='Only update items of this user'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be updated without writing'
+        )
+
+    def handle(self, *args, **options):
+        items = ClothingItem.objects.all()
+
+        email = options.get('email')
+        if email:
+            if not User.objects.filter(email=email).exists():
+                raise CommandError(f"No user with email '{email}'")
+            items = items.filter(user__email=email)
+
+        dry_run = options['dry_run']
+        updated = LaundrySchedulerAI.bulk_set_wash_thresholds(items, dry_run=dry_run)
+
+        prefix = '[DRY RUN] Would set' if dry_run else '✓ Set'
+        for threshold, count in sorted(updated.items()):
+            self.stdout.write(f"  {prefix} {count} items to {threshold} wears")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done! {sum(updated.values())} items updated")
+        )
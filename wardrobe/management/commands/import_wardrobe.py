@@ -0,0 +1,87 @@
+"""
+Django Management Command: Import Wardrobe
+
+Bulk-imports a directory or zip archive of clothing photos into a user's
+wardrobe. Images are downscaled and analyzed in parallel, categories are
+detected automatically and items are created in batches.
+
+Usage:
+    # Import a folder of photos
+    python manage.py import_wardrobe ~/Pictures/closet --email user@example.com
+
+    # Import a zip archive with 8 workers
+    python manage.py import_wardrobe closet.zip --email user@example.com --workers 8
+
+    # Skip AI analysis and category detection (items are named after their
+    # files and left uncategorized)
+    python manage.py import_wardrobe closet.zip --email user@example.com --no-analysis
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import User
+from wardrobe.bulk_import import BulkImportError, WardrobeBulkImporter
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import clothing photos from a directory or zip archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Directory or .zip archive of photos'
+        )
+        parser.add_argument(
+            '--email',
+            type=str,
+            required=True,
+            help='User to import the items for'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=WardrobeBulkImporter.DEFAULT_WORKERS,
+            help=f'Parallel image workers (default: {WardrobeBulkImporter.DEFAULT_WORKERS})'
+        )
+        parser.add_argument(
+            '--no-analysis',
+            action='store_true',
+            help='Skip AI analysis and category detection (items stay uncategorized)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email '{options['email']}'")
+
+        def progress(done, name, error):
+            if error:
+                self.stdout.write(self.style.ERROR(f"  ✗ [{done}] {name}: {error}"))
+            elif options['verbosity'] > 1 or done % 25 == 0:
+                self.stdout.write(f"  ✓ [{done}] {name}")
+
+        importer = WardrobeBulkImporter(
+            user,
+            workers=options['workers'],
+            analyze=not options['no_analysis'],
+            progress=progress,
+        )
+
+        self.stdout.write(self.style.NOTICE(f"📦 Importing {options['path']} for {user.email}..."))
+        started = time.perf_counter()
+        try:
+            report = importer.import_path(options['path'])
+        except BulkImportError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! Imported {len(report['created'])} of {report['processed']} files "
+                f"in {elapsed:.1f}s, {len(report['errors'])} errors"
+            )
+        )
@@ -0,0 +1,45 @@
+"""
+Django Management Command: Rebuild Wardrobe Search
+
+Rebuilds the wardrobe full-text index and the normalized season/occasion/tag
+rows from ClothingItem. Signals keep both current; run this after bulk
+imports or raw SQL updates that bypass them.
+
+Usage:
+    # All users
+    python manage.py rebuild_wardrobe_search
+
+    # A single user
+    python manage.py rebuild_wardrobe_search --email user@example.com
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from users.models import User
+from wardrobe import search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the wardrobe search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--email',
+            type=str,
+            help='Rebuild a specific user only'
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        email = options.get('email')
+        if email:
+            try:
+                user = User.objects.get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email '{email}'")
+
+        with transaction.atomic():
+            count = search_index.rebuild(user)
+
+        self.stdout.write(self.style.SUCCESS(f"Done! Indexed {count} items"))
@@ -0,0 +1,77 @@
+"""
+Django Management Command: Run Wardrobe Imports
+
+Long-running worker that imports the zip archives uploaded through the
+bulk-import API (see wardrobe.bulk_import.WardrobeImportQueue). Progress
+is written to each job as it runs, so clients can poll its status URL.
+Several workers can run at once: each claims different jobs.
+
+Usage:
+    # Run forever, polling every 5 seconds
+    python manage.py run_wardrobe_imports
+
+    # Poll every 30 seconds
+    python manage.py run_wardrobe_imports --interval 30
+
+    # Import what is queued now and exit (e.g. from cron)
+    python manage.py run_wardrobe_imports --once
+
+Run under a process supervisor (systemd, supervisord) in production:
+    ExecStart=/path/to/venv/bin/python /path/to/tailora/manage.py run_wardrobe_imports
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from wardrobe.bulk_import import WardrobeImportQueue
+
+
+class Command(BaseCommand):
+    help = 'Import queued wardrobe archives (long-running worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=WardrobeImportQueue.POLL_INTERVAL,
+            help=f'Seconds between polls (default: {WardrobeImportQueue.POLL_INTERVAL})'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Import queued archives once and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            jobs = self.run_jobs()
+            self.stdout.write(self.style.SUCCESS(f"Done! Ran {jobs} import jobs"))
+            return
+
+        interval = max(1.0, options['interval'])
+        self.stdout.write(f"📦 Wardrobe import worker started (polling every {interval:g}s, Ctrl+C to stop)")
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    self.run_jobs()
+                except Exception as e:
+                    # Keep polling through transient database errors
+                    self.stdout.write(self.style.ERROR(f'  ✗ Import run failed: {e}'))
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Wardrobe import worker stopped'))
+
+    def run_jobs(self):
+        jobs = WardrobeImportQueue.run_queued()
+        for job in jobs:
+            if job.status == 'done':
+                self.stdout.write(
+                    f'  ✓ Imported {len(job.created_items)}/{job.total_files} photos '
+                    f'for {job.user.email} (job {job.id})'
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f'  ✗ Job {job.id} failed: {job.error_message}'))
+        return len(jobs)
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 21:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0002_clothingitem_care_type_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='clothingitem',
+            name='clothing_it_user_id_e0b7b6_idx',
+        ),
+        migrations.AddIndex(
+            model_name='clothingitem',
+            index=models.Index(fields=['user', 'status', 'wears_since_wash'], name='clothing_it_user_id_03866d_idx'),
+        ),
+    ]
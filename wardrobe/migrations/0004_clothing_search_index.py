@@ -0,0 +1,102 @@
+# Generated by Django 5.0 on 2026-10-18 21:30
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_search_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE clothing_item_search USING fts5("
+            "item_id, user_id, name, brand, description, color, category, tags, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE clothing_item_search ("
+            "item_id uuid PRIMARY KEY REFERENCES clothing_items(id) ON DELETE CASCADE, "
+            "user_id uuid NOT NULL, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX clothing_item_search_document_idx ON clothing_item_search USING GIN (document)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX clothing_item_search_user_idx ON clothing_item_search (user_id)"
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS clothing_item_search")
+
+
+def backfill_search_index(apps, schema_editor):
+    ClothingItem = apps.get_model('wardrobe', 'ClothingItem')
+    ClothingItemAttribute = apps.get_model('wardrobe', 'ClothingItemAttribute')
+    vendor = schema_editor.connection.vendor
+
+    attributes = []
+    documents = []
+    for item in ClothingItem.objects.select_related('category').iterator(chunk_size=500):
+        for kind, field in (('season', 'seasons'), ('occasion', 'occasions'), ('tag', 'tags')):
+            values = {str(value).strip().lower()[:100] for value in (getattr(item, field) or [])}
+            attributes.extend(
+                ClothingItemAttribute(user_id=item.user_id, item_id=item.id, kind=kind, value=value)
+                for value in values if value
+            )
+        documents.append((item, [
+            item.name or '',
+            item.brand or '',
+            item.description or '',
+            item.color or '',
+            item.category.name if item.category else '',
+            ' '.join(str(tag) for tag in (item.tags or [])),
+        ]))
+
+    ClothingItemAttribute.objects.bulk_create(attributes, batch_size=500, ignore_conflicts=True)
+
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.executemany(
+                "INSERT INTO clothing_item_search (item_id, user_id, name, brand, description, color, category, tags) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                [(item.id.hex, item.user_id.hex, *columns) for item, columns in documents]
+            )
+        elif vendor == 'postgresql':
+            cursor.executemany(
+                "INSERT INTO clothing_item_search (item_id, user_id, document) "
+                "VALUES (%s, %s, to_tsvector('simple', %s))",
+                [(item.id, item.user_id, ' '.join(columns)) for item, columns in documents]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0003_clothingitem_laundry_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClothingItemAttribute',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('season', 'Season'), ('occasion', 'Occasion'), ('tag', 'Tag')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attributes', to='wardrobe.clothingitem')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clothing_attributes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'clothing_item_attributes',
+                'indexes': [models.Index(fields=['user', 'kind', 'value'], name='clothing_it_user_id_33d303_idx')],
+                'unique_together': {('item', 'kind', 'value')},
+            },
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
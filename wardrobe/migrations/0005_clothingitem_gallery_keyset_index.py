@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 21:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wardrobe', '0004_clothing_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clothingitem',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='clothing_it_user_id_cea838_idx'),
+        ),
+    ]
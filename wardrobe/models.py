@@ -120,7 +120,8 @@ class ClothingItem(models.Model):
         verbose_name_plural = 'Vêtements'
         indexes = [
             models.Index(fields=['user', 'category']),
-            models.Index(fields=['user', 'status']),
+            models.Index(fields=['user', 'status', 'wears_since_wash']),
+            models.Index(fields=['user', '-created_at', '-id']),
             models.Index(fields=['user', 'favorite']),
         ]
     
@@ -169,6 +170,34 @@ class ClothingItem(models.Model):
         self.save()
 
 
+class ClothingItemAttribute(models.Model):
+    """
+    Normalized seasons, occasions and tags of a clothing item
+    Indexed copy of the JSON lists, kept in sync by wardrobe.search_index
+    """
+    KIND_CHOICES = [
+        ('season', 'Season'),
+        ('occasion', 'Occasion'),
+        ('tag', 'Tag'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='clothing_attributes')
+    item = models.ForeignKey(ClothingItem, on_delete=models.CASCADE, related_name='attributes')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100)
+    
+    class Meta:
+        db_table = 'clothing_item_attributes'
+        unique_together = [['item', 'kind', 'value']]
+        indexes = [
+            models.Index(fields=['user', 'kind', 'value']),
+        ]
+    
+    def __str__(self):
+        return f"{self.item_id} {self.kind}={self.value}"
+
+
 class LaundryAlert(models.Model):
     """
     Proactive laundry notifications
@@ -237,3 +266,47 @@ class LaundryAlert(models.Model):
         self.resolved_at = timezone.now()
         self.save()
 
+
+
+class WardrobeImportJob(models.Model):
+    """
+    Queued bulk import of a zip archive of clothing photos
+    Run by the run_wardrobe_imports worker (see wardrobe.bulk_import);
+    the API polls it for progress.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='wardrobe_import_jobs')
+    archive = models.FileField(upload_to='wardrobe/imports/', blank=True)  # Deleted once the job ends
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    
+    # Progress
+    total_files = models.IntegerField(default=0)  # Images in the archive, known once running
+    processed_files = models.IntegerField(default=0)
+    created_items = models.JSONField(default=list, blank=True)  # Created item ids
+    errors = models.JSONField(default=list, blank=True)  # [{'file', 'error'}]
+    error_message = models.TextField(blank=True)  # Why the whole job failed
+    
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'wardrobe_import_jobs'
+        ordering = ['-created_at']
+        verbose_name = 'Wardrobe Import'
+        verbose_name_plural = 'Wardrobe Imports'
+        indexes = [
+            # Queued jobs, polled by the import worker
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Import by {self.user.email} - {self.status}"
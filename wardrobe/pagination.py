@@ -0,0 +1,110 @@
+"""
+Keyset pagination for the wardrobe
+
+Pages through items newest first on (created_at, id) instead of
+COUNT + OFFSET, so page 50 costs the same single indexed query as page 1.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of results, with opaque cursors to its neighbours"""
+
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset newest first on (created_at, id)
+
+    Cursors encode the direction and the boundary row, e.g. a "next"
+    cursor fetches rows strictly older than the last row of the page.
+    """
+
+    def __init__(self, queryset, per_page=24):
+        self.queryset = queryset.order_by('-created_at', '-id')
+        self.per_page = per_page
+
+    @staticmethod
+    def encode_cursor(direction, item):
+        raw = f"{direction}|{item.created_at.isoformat()}|{item.id.hex}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return (direction, created_at, id) or None for a missing/invalid cursor"""
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, created_at, item_id = base64.urlsafe_b64decode(padded).decode().split('|')
+            if direction not in ('next', 'prev'):
+                return None
+            return direction, datetime.fromisoformat(created_at), uuid.UUID(item_id)
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+    def get_page(self, cursor=None):
+        """
+        Get the page a cursor points to (first page if the cursor is invalid)
+
+        Returns:
+            KeysetPage
+        """
+        position = self.decode_cursor(cursor)
+
+        if position is None:
+            rows = list(self.queryset[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return KeysetPage(
+                rows,
+                next_cursor=self.encode_cursor('next', rows[-1]) if has_more else None,
+            )
+
+        direction, created_at, item_id = position
+
+        if direction == 'next':
+            older = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=item_id)
+            rows = list(self.queryset.filter(older)[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return KeysetPage(
+                rows,
+                next_cursor=self.encode_cursor('next', rows[-1]) if has_more and rows else None,
+                previous_cursor=self.encode_cursor('prev', rows[0]) if rows else None,
+            )
+
+        # Walk backwards in ascending order, then restore newest-first
+        newer = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=item_id)
+        rows = list(self.queryset.filter(newer).reverse()[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor('next', rows[-1]) if rows else None,
+            previous_cursor=self.encode_cursor('prev', rows[0]) if has_more and rows else None,
+        )
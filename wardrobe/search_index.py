@@ -0,0 +1,209 @@
+"""
+Wardrobe Search Index for Tailora
+
+Keeps a full-text index of clothing items (FTS5 on SQLite, tsvector on
+PostgreSQL) and normalized season/occasion/tag rows, so gallery search and
+filters are index lookups instead of icontains scans over a join.
+
+The index is maintained by wardrobe.signals; bulk writers that bypass
+signals (bulk_create/update) must call index_items() themselves.
+"""
+
+import re
+from typing import Iterable, Optional
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import ClothingItem, ClothingItemAttribute
+
+
+SEARCH_TABLE = 'clothing_item_search'
+
+# Columns of the full-text document, in index order
+SEARCH_FIELDS = ['name', 'brand', 'description', 'color', 'category', 'tags']
+
+# JSON list fields normalized into ClothingItemAttribute rows
+ATTRIBUTE_FIELDS = {
+    'season': 'seasons',
+    'occasion': 'occasions',
+    'tag': 'tags',
+}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_backend() -> Optional[str]:
+    """Full-text backend for the current database, or None to fall back to icontains"""
+    if connection.vendor in ('sqlite', 'postgresql'):
+        return connection.vendor
+    return None
+
+
+def _document(item: ClothingItem) -> dict:
+    """Text of each search column for an item"""
+    return {
+        'name': item.name or '',
+        'brand': item.brand or '',
+        'description': item.description or '',
+        'color': item.color or '',
+        'category': item.category.name if item.category_id and item.category else '',
+        'tags': ' '.join(str(tag) for tag in (item.tags or [])),
+    }
+
+
+def _attribute_rows(item: ClothingItem) -> list:
+    rows = []
+    for kind, field in ATTRIBUTE_FIELDS.items():
+        values = {str(value).strip().lower()[:100] for value in (getattr(item, field) or [])}
+        rows.extend(
+            ClothingItemAttribute(user_id=item.user_id, item_id=item.id, kind=kind, value=value)
+            for value in sorted(values) if value
+        )
+    return rows
+
+
+def index_items(items: Iterable[ClothingItem]):
+    """
+    (Re)index items: full-text rows and normalized attribute rows.
+    Pass items with category selected to avoid a query per item.
+    """
+    items = list(items)
+    if not items:
+        return
+
+    item_ids = [item.id for item in items]
+    ClothingItemAttribute.objects.filter(item_id__in=item_ids).delete()
+    ClothingItemAttribute.objects.bulk_create(
+        [row for item in items for row in _attribute_rows(item)],
+        ignore_conflicts=True
+    )
+
+    backend = search_backend()
+    if backend is None:
+        return
+
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+                f"(SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s)",
+                [(f'item_id:"{item.id.hex}"',) for item in items]
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (item_id, user_id, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s, %s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+                [
+                    (item.id.hex, item.user_id.hex, *_document(item).values())
+                    for item in items
+                ]
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (item_id, user_id, document) "
+                f"VALUES (%s, %s, to_tsvector('simple', %s)) "
+                f"ON CONFLICT (item_id) DO UPDATE SET "
+                f"user_id = EXCLUDED.user_id, document = EXCLUDED.document",
+                [
+                    (item.id, item.user_id, ' '.join(_document(item).values()))
+                    for item in items
+                ]
+            )
+
+
+def remove_items(item_ids: Iterable):
+    """Drop items from the full-text index (attribute rows cascade)"""
+    item_ids = list(item_ids)
+    backend = search_backend()
+    if not item_ids or backend is None:
+        return
+
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+                f"(SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s)",
+                [(f'item_id:"{item_id.hex}"',) for item_id in item_ids]
+            )
+        else:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE item_id = ANY(%s)", [item_ids])
+
+
+def rebuild(user=None) -> int:
+    """Rebuild the index for one user or everyone, returns items indexed"""
+    items = ClothingItem.objects.select_related('category').order_by()
+    if user is not None:
+        items = items.filter(user=user)
+
+    backend = search_backend()
+    if backend is not None:
+        with connection.cursor() as cursor:
+            if user is None:
+                cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+            elif backend == 'sqlite':
+                cursor.execute(
+                    f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+                    f"(SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s)",
+                    [f'user_id:"{user.id.hex}"']
+                )
+            else:
+                cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE user_id = %s", [user.id])
+
+    count = 0
+    batch = []
+    for item in items.iterator(chunk_size=500):
+        batch.append(item)
+        if len(batch) == 500:
+            index_items(batch)
+            count += len(batch)
+            batch = []
+    index_items(batch)
+    return count + len(batch)
+
+
+def search_filter(user, query: str) -> Optional[Q]:
+    """
+    Q matching the user's items whose text contains every word of `query`
+    (prefix match, case- and accent-insensitive). None for an empty query.
+    """
+    tokens = TOKEN_RE.findall(query or '')
+    if not tokens:
+        return None
+
+    backend = search_backend()
+    if backend == 'sqlite':
+        terms = ' '.join(f'"{token}"*' for token in tokens)
+        columns = ' '.join(SEARCH_FIELDS)
+        match = f'user_id:"{user.id.hex}" AND {{{columns}}}: ({terms})'
+        return Q(id__in=RawSQL(
+            f"SELECT item_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+            [match]
+        ))
+
+    if backend == 'postgresql':
+        return Q(id__in=RawSQL(
+            f"SELECT item_id FROM {SEARCH_TABLE} "
+            f"WHERE user_id = %s AND document @@ to_tsquery('simple', %s)",
+            [user.id, ' & '.join(f'{token.lower()}:*' for token in tokens)]
+        ))
+
+    search = Q()
+    for token in tokens:
+        search &= (
+            Q(name__icontains=token) |
+            Q(brand__icontains=token) |
+            Q(description__icontains=token) |
+            Q(color__icontains=token) |
+            Q(category__name__icontains=token)
+        )
+    return search
+
+
+def attribute_filter(user, kind: str, value: str) -> Q:
+    """Q matching the user's items with a season/occasion/tag value"""
+    return Q(id__in=ClothingItemAttribute.objects.filter(
+        user=user,
+        kind=kind,
+        value=value.strip().lower()
+    ).values('item_id'))
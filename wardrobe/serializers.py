@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from django.db import transaction
 from .models import ClothingItem, ClothingCategory
+from .category_resolver import CategoryResolver
 from users.models import User
 
 
@@ -108,29 +110,24 @@ class ClothingItemCreateSerializer(serializers.ModelSerializer):
         """Create item with user from context"""
         user = self.context['request'].user
         
-        # Check user's wardrobe limit
-        current_count = ClothingItem.objects.filter(user=user).count()
-        max_items = user.get_max_wardrobe_items()
-        
-        if current_count >= max_items:
-            raise serializers.ValidationError(
-                f"You've reached your wardrobe limit of {max_items} items. Upgrade to Premium to add more!"
-            )
-        
         # Handle category
         category_id = validated_data.pop('category_id', None)
         if category_id:
-            try:
-                category = ClothingCategory.objects.get(id=category_id)
+            category = CategoryResolver(user).get_by_id(category_id)
+            if category:
                 validated_data['category'] = category
-            except ClothingCategory.DoesNotExist:
-                pass
         
         validated_data['user'] = user
-        item = ClothingItem.objects.create(**validated_data)
         
-        # Update user's wardrobe count
-        user.increment_wardrobe_count()
+        # Check the wardrobe limit under a row lock so parallel creates can't
+        # overshoot it; the count itself is maintained by users.signals
+        with transaction.atomic():
+            if not user.can_add_wardrobe_items():
+                raise serializers.ValidationError(
+                    f"You've reached your wardrobe limit of {user.get_max_wardrobe_items()} items. "
+                    f"Upgrade to Premium to add more!"
+                )
+            item = ClothingItem.objects.create(**validated_data)
         
         return item
 
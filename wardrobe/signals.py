@@ -0,0 +1,67 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from . import search_index
+from .category_resolver import CategoryResolver
+from .models import ClothingItem, ClothingCategory
+from .stats_service import WardrobeStatsService
+
+
+# Fields whose changes require reindexing the item
+SEARCHED_FIELDS = [
+    'name', 'brand', 'description', 'color', 'category_id',
+    'seasons', 'occasions', 'tags',
+]
+
+
+@receiver([post_save, post_delete], sender=ClothingItem)
+def invalidate_wardrobe_stats(sender, instance, **kwargs):
+    """Any item change can move the user's counts and top lists"""
+    WardrobeStatsService.invalidate(instance.user_id)
+
+
+# ==================== Search index ====================
+
+def _search_snapshot(instance):
+    # Read from __dict__ so deferred fields never trigger a query
+    values = instance.__dict__
+    return tuple(
+        tuple(values[field]) if isinstance(values.get(field), list) else values.get(field)
+        for field in SEARCHED_FIELDS
+    )
+
+
+@receiver(post_init, sender=ClothingItem)
+def remember_search_fields(sender, instance, **kwargs):
+    instance._search_snapshot = _search_snapshot(instance)
+
+
+@receiver(post_save, sender=ClothingItem)
+def update_search_index(sender, instance, created, **kwargs):
+    """Reindex only when a searched or filtered field actually changed"""
+    snapshot = _search_snapshot(instance)
+    if created or snapshot != getattr(instance, '_search_snapshot', None):
+        search_index.index_items([instance])
+        instance._search_snapshot = snapshot
+
+
+@receiver(post_delete, sender=ClothingItem)
+def remove_from_search_index(sender, instance, **kwargs):
+    search_index.remove_items([instance.id])
+
+
+@receiver([post_save, post_delete], sender=ClothingCategory)
+def invalidate_category_options(sender, instance, **kwargs):
+    """Category lists are cached per user (filter options, category resolver)"""
+    if instance.is_custom and instance.user_id:
+        WardrobeStatsService.invalidate(instance.user_id)
+        CategoryResolver.invalidate_user(instance.user_id)
+    else:
+        WardrobeStatsService.invalidate_shared_categories()
+        CategoryResolver.invalidate_global()
+
+
+@receiver(post_save, sender=ClothingCategory)
+def reindex_category_items(sender, instance, created, **kwargs):
+    """Category names are part of the search document"""
+    if not created:
+        search_index.index_items(instance.items.select_related('category'))
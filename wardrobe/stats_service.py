@@ -0,0 +1,220 @@
+"""
+Wardrobe Statistics Service for Tailora
+
+Computes a user's wardrobe statistics in three queries (scalar aggregates,
+category/color groupings, top-N item lists) and caches them, along with
+the gallery filter options, until the user's wardrobe changes. Shared by
+the stats page, the stats API and the recommendations wardrobe analysis.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum, Value, Window, Case, When, IntegerField, CharField
+from django.db.models.functions import Least, RowNumber
+from django.utils import timezone
+
+from .models import ClothingItem, ClothingCategory
+
+
+class WardrobeStatsService:
+    """
+    Cached, aggregated wardrobe statistics for one user
+    """
+
+    CACHE_TIMEOUT = 60 * 10  # Invalidated on ClothingItem changes anyway
+
+    # Length of the top-N lists
+    TOP_N = 5
+    NEVER_WORN_N = 10
+
+    # Items worn at most this often and owned this long are underutilized
+    UNDERUTILIZED_MAX_WEARS = 2
+    UNDERUTILIZED_MIN_DAYS = 30
+
+    def __init__(self, user):
+        self.user = user
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"wardrobe_stats_{user_id}"
+
+    @staticmethod
+    def filter_options_key(user_id):
+        # Built-in categories are shared, so their version is part of every key
+        version = cache.get_or_set('wardrobe_categories_version', 1, None)
+        return f"wardrobe_filters_{user_id}_{version}"
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """Drop the cached stats and filter options for a user"""
+        cache.delete_many([cls.cache_key(user_id), cls.filter_options_key(user_id)])
+
+    @staticmethod
+    def invalidate_shared_categories():
+        """Built-in categories changed: expire every user's filter options"""
+        try:
+            cache.incr('wardrobe_categories_version')
+        except ValueError:
+            cache.set('wardrobe_categories_version', 1, None)
+
+    def get_filter_options(self):
+        """
+        Get the gallery filter dropdown options
+
+        Returns:
+            dict: 'categories' (built-in plus the user's custom ones, as
+                  id/name dicts) and 'colors' used in the wardrobe
+        """
+        key = self.filter_options_key(self.user.id)
+        options = cache.get(key)
+        if options is None:
+            categories = ClothingCategory.objects.filter(
+                Q(is_custom=False) | Q(user=self.user)
+            ).values('id', 'name')
+            colors = ClothingItem.objects.filter(
+                user=self.user
+            ).exclude(color='').order_by('color').values_list('color', flat=True).distinct()
+
+            options = {
+                'categories': [{'id': str(row['id']), 'name': row['name']} for row in categories],
+                'colors': list(colors),
+            }
+            cache.set(key, options, self.CACHE_TIMEOUT)
+        return options
+
+    def get_stats(self):
+        """
+        Get the user's wardrobe statistics
+
+        Returns:
+            dict: Scalar counts, category/color distributions (all items and
+                  available items only) and the most worn, underutilized,
+                  never worn and recently added items
+        """
+        key = self.cache_key(self.user.id)
+        stats = cache.get(key)
+        if stats is None:
+            stats = self._compute()
+            cache.set(key, stats, self.CACHE_TIMEOUT)
+        return stats
+
+    def _compute(self):
+        items = ClothingItem.objects.filter(user=self.user)
+        available = Q(status='available')
+
+        # 1. Scalars in one conditional-aggregate query
+        totals = items.aggregate(
+            total_items=Count('id'),
+            available_count=Count('id', filter=available),
+            favorite_count=Count('id', filter=Q(favorite=True)),
+            secondhand_count=Count('id', filter=Q(is_secondhand=True)),
+            total_value=Sum('purchase_price'),
+        )
+
+        stats = {
+            'total_items': totals['total_items'],
+            'available_count': totals['available_count'],
+            'favorite_count': totals['favorite_count'],
+            'secondhand_count': totals['secondhand_count'],
+            'total_value': totals['total_value'] or 0,
+            'by_category': {},
+            'by_color': {},
+            'available_by_category': {},
+            'available_by_color': {},
+        }
+
+        # 2. Category and color groupings in one UNION
+        def grouped(dimension, field):
+            return items.order_by().values(
+                dimension=Value(dimension, output_field=CharField()),
+                label=F(field),
+            ).annotate(
+                count=Count('id'),
+                available=Count('id', filter=available),
+            )
+
+        groups = grouped('category', 'category__name').union(grouped('color', 'color'), all=True)
+        for row in sorted(groups, key=lambda row: -row['count']):
+            if not row['label']:
+                continue
+            stats[f"by_{row['dimension']}"][row['label']] = row['count']
+            if row['available']:
+                stats[f"available_by_{row['dimension']}"][row['label']] = row['available']
+
+        # 3. All top-N lists in one pass, ranked with window functions
+        stats.update(self._top_lists(items))
+        return stats
+
+    def _top_lists(self, items):
+        now = timezone.now()
+        cutoff = now - timedelta(days=self.UNDERUTILIZED_MIN_DAYS)
+
+        def qualifies(condition):
+            # Sort qualifying rows first so their row numbers start at 1
+            return Case(When(condition, then=Value(0)), default=Value(1), output_field=IntegerField())
+
+        underutilized = Q(times_worn__lte=self.UNDERUTILIZED_MAX_WEARS, created_at__lte=cutoff)
+        never_worn = Q(times_worn=0, status='available')
+
+        ranked = items.select_related('category').annotate(
+            rank_worn=Window(RowNumber(), order_by=[F('times_worn').desc(), F('created_at').desc()]),
+            rank_recent=Window(RowNumber(), order_by=[F('created_at').desc()]),
+            rank_underutilized=Window(
+                RowNumber(),
+                order_by=[qualifies(underutilized).asc(), F('times_worn').asc(), F('created_at').desc()]
+            ),
+            rank_never_worn=Window(
+                RowNumber(),
+                order_by=[qualifies(never_worn).asc(), F('created_at').desc()]
+            ),
+        ).annotate(
+            # <= 0 when the row is within any list's limit
+            best_rank=Least(
+                F('rank_worn') - self.TOP_N,
+                F('rank_recent') - self.TOP_N,
+                F('rank_underutilized') - self.TOP_N,
+                F('rank_never_worn') - self.NEVER_WORN_N,
+            )
+        ).filter(best_rank__lte=0)
+
+        lists = {
+            'most_worn': [],
+            'recent_additions': [],
+            'underutilized_items': [],
+            'never_worn': [],
+        }
+
+        for item in ranked:
+            row = {
+                'id': str(item.id),
+                'name': item.name,
+                'times_worn': item.times_worn,
+                'category': item.category.name if item.category else None,
+                'image': item.image.url if item.image else None,
+                'created_at': item.created_at,
+            }
+
+            if item.rank_worn <= self.TOP_N and item.times_worn > 0:
+                cost_per_wear = None
+                if item.purchase_price:
+                    cost_per_wear = round(float(item.purchase_price) / item.times_worn, 2)
+                lists['most_worn'].append((item.rank_worn, {**row, 'cost_per_wear': cost_per_wear}))
+
+            if item.rank_recent <= self.TOP_N:
+                lists['recent_additions'].append((item.rank_recent, row))
+
+            if (item.rank_underutilized <= self.TOP_N
+                    and item.times_worn <= self.UNDERUTILIZED_MAX_WEARS
+                    and item.created_at <= cutoff):
+                days_owned = (now.date() - item.created_at.date()).days
+                lists['underutilized_items'].append((item.rank_underutilized, {**row, 'days_owned': days_owned}))
+
+            if (item.rank_never_worn <= self.NEVER_WORN_N
+                    and item.times_worn == 0 and item.status == 'available'):
+                lists['never_worn'].append((item.rank_never_worn, row))
+
+        return {
+            name: [row for _, row in sorted(ranked_rows, key=lambda pair: pair[0])]
+            for name, ranked_rows in lists.items()
+        }
@@ -1,3 +1,196 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from users.models import User
+
+from .bulk_import import WardrobeImportQueue
+from .category_resolver import CategoryResolver
+from .laundry_scheduler import LaundrySchedulerAI
+from .models import ClothingCategory, ClothingItem, WardrobeImportJob
+
+
+class PackWashLoadsTests(SimpleTestCase):
+    """
+    Loads share one washing machine and are sequenced by deadline
+    """
+
+    now = datetime(2026, 1, 5, 8, tzinfo=timezone.utc)
+
+    def task(self, item, need_in_hours, care_type='machine_wash', drying_hours=4):
+        return {
+            'item': item,
+            'care_type': care_type,
+            'drying_hours': drying_hours,
+            'need_by': self.now + timedelta(hours=need_in_hours),
+            'mandatory': True,
+            'priority': 2,
+        }
+
+    def pack(self, tasks):
+        return LaundrySchedulerAI.pack_wash_loads(tasks, self.now, self.now + timedelta(days=7))
+
+    def test_machine_loads_run_one_after_another(self):
+        # Two drying bands cannot share a load but do share the machine
+        loads = self.pack([self.task('shirt', 7), self.task('jeans', 30, drying_hours=24)])
+
+        self.assertEqual([load['items'] for load in loads], [['shirt'], ['jeans']])
+        self.assertEqual(loads[1]['start'], loads[0]['start'] + timedelta(hours=2))
+        self.assertTrue(all(load['on_time'] for load in loads))
+
+    def test_late_items_do_not_delay_feasible_ones(self):
+        # 'tight' misses its deadline whatever happens; 'shirt' needs the first slot
+        loads = self.pack([self.task('tight', 3, drying_hours=12), self.task('shirt', 6)])
+
+        self.assertEqual(loads[0]['items'], ['shirt'])
+        self.assertTrue(loads[0]['on_time'])
+        self.assertEqual(loads[1]['infeasible_items'], ['tight'])
+        self.assertEqual(loads[1]['late_items'], [])
+
+    def test_machine_contention_is_reported_as_late(self):
+        # Either could be ready alone, but not both on one machine
+        loads = self.pack([self.task('shirt', 6), self.task('jeans', 15, drying_hours=12)])
+
+        self.assertEqual(loads[0]['items'], ['shirt'])
+        self.assertTrue(loads[0]['on_time'])
+        self.assertEqual(loads[1]['infeasible_items'], [])
+        self.assertEqual(loads[1]['late_items'], ['jeans'])
+
+
+class CategoryResolverTests(TestCase):
+    """
+    Warm resolvers answer from memory; category changes still show up
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        ClothingCategory.objects.create(name='Tops')
+
+    def setUp(self):
+        cache.clear()
+        CategoryResolver.invalidate_global()
+        CategoryResolver.invalidate_user(self.user.id)
+
+    def test_versions_are_read_once_then_trusted(self):
+        CategoryResolver(self.user).categories()
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as get_many, self.assertNumQueries(0):
+            for _ in range(3):
+                self.assertEqual(CategoryResolver(self.user).find('Tops').name, 'Tops')
+        get_many.assert_not_called()
+
+    def test_versions_are_read_together(self):
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            CategoryResolver(self.user).categories()
+        get_many.assert_called_once()
+
+    def test_new_categories_are_seen(self):
+        CategoryResolver(self.user).categories()
+        ClothingCategory.objects.create(name='Scarves')
+        ClothingCategory.objects.create(name='Capes', user=self.user, is_custom=True)
+
+        resolver = CategoryResolver(self.user)
+        self.assertEqual(resolver.find('Scarves').name, 'Scarves')
+        self.assertEqual(resolver.find('Capes').name, 'Capes')
+
+
+class WardrobeImportQueueTests(TestCase):
+    """
+    Bulk imports are queued by the API and run by the worker
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='importer', email='importer@example.com', password='x')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _archive(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name, color in (('shirt.jpg', 'white'), ('jeans.png', 'blue')):
+                image = io.BytesIO()
+                Image.new('RGB', (32, 32), color).save(image, format='PNG' if name.endswith('.png') else 'JPEG')
+                archive.writestr(name, image.getvalue())
+            archive.writestr('broken.jpg', b'not an image')
+            archive.writestr('notes.txt', b'ignored')
+        return SimpleUploadedFile('closet.zip', buffer.getvalue(), content_type='application/zip')
+
+    def _upload(self):
+        return self.client.post(reverse('wardrobe:api_wardrobe_bulk_import'), {'archive': self._archive()})
+
+    def test_upload_is_queued_not_imported(self):
+        response = self._upload()
+
+        self.assertEqual(response.status_code, 202)
+        job = WardrobeImportJob.objects.get(id=response.data['job_id'])
+        self.assertEqual(job.status, 'queued')
+        self.assertTrue(job.archive)
+        self.assertFalse(ClothingItem.objects.filter(user=self.user).exists())
+
+        status = self.client.get(response.data['status_url'])
+        self.assertEqual(status.status_code, 200)
+        self.assertEqual(status.data['status'], 'queued')
+
+    def test_invalid_archive_is_rejected(self):
+        upload = SimpleUploadedFile('closet.zip', b'not a zip', content_type='application/zip')
+        response = self.client.post(reverse('wardrobe:api_wardrobe_bulk_import'), {'archive': upload})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WardrobeImportJob.objects.exists())
+
+    def test_worker_imports_and_reports_progress(self):
+        response = self._upload()
+        job = WardrobeImportQueue._claim_next()
+        WardrobeImportQueue.run(job, analyze=False)
+
+        status = self.client.get(response.data['status_url']).data
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual(status['total_files'], 3)
+        self.assertEqual(status['processed_files'], 3)
+        self.assertEqual(status['created_count'], 2)
+        self.assertEqual([error['file'] for error in status['errors']], ['broken.jpg'])
+
+        items = ClothingItem.objects.filter(user=self.user)
+        self.assertEqual(sorted(item.name for item in items), ['Jeans', 'Shirt'])
+        self.assertFalse(items.exclude(category=None).exists())
+
+        job.refresh_from_db()
+        self.assertFalse(job.archive)
+        self.assertIsNone(WardrobeImportQueue._claim_next())
+
+    def test_jobs_are_private(self):
+        response = self._upload()
+        other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.client.get(response.data['status_url']).status_code, 404)
+
+    def test_stale_running_jobs_fail(self):
+        self._upload()
+        job = WardrobeImportQueue._claim_next()
+        WardrobeImportJob.objects.filter(pk=job.pk).update(
+            started_at=job.started_at - WardrobeImportQueue.STALE_AFTER - timedelta(minutes=1)
+        )
+
+        self.assertEqual(WardrobeImportQueue.run_queued(), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
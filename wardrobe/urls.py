@@ -24,6 +24,8 @@ urlpatterns = [
     # API endpoints
     path('api/items/', views.api_wardrobe_list, name='api_wardrobe_list'),
     path('api/items/create/', views.api_wardrobe_create, name='api_wardrobe_create'),
+    path('api/items/bulk-import/', views.api_wardrobe_bulk_import, name='api_wardrobe_bulk_import'),
+    path('api/items/bulk-import/<uuid:job_id>/', views.api_wardrobe_bulk_import_status, name='api_wardrobe_bulk_import_status'),
     path('api/items/<uuid:item_id>/', views.api_wardrobe_detail, name='api_wardrobe_detail'),
     path('api/items/<uuid:item_id>/update/', views.api_wardrobe_update, name='api_wardrobe_update'),
     path('api/items/<uuid:item_id>/delete/', views.api_wardrobe_delete, name='api_wardrobe_delete'),
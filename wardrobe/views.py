@@ -1,8 +1,9 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count, Sum
-from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -13,7 +14,7 @@ from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.conf import settings
 import sys
 
-from .models import ClothingItem, ClothingCategory
+from .models import ClothingItem, WardrobeImportJob
 from .serializers import (
     ClothingItemListSerializer, 
     ClothingItemDetailSerializer,
@@ -22,6 +23,10 @@ from .serializers import (
     WardrobeStatsSerializer
 )
 from .ai_image_analyzer import get_image_analyzer
+from .stats_service import WardrobeStatsService
+from . import search_index
+from .pagination import KeysetPaginator
+from .category_resolver import CategoryResolver
 
 
 # ==================== Template Views ====================
@@ -51,9 +56,7 @@ def wardrobe_gallery_view(request):
         items = items.filter(color__icontains=color_filter)
     
     if season_filter:
-        # SQLite doesn't support JSON contains, so we filter in Python if needed
-        # or use icontains on the JSON field as a string workaround
-        items = items.filter(seasons__icontains=season_filter)
+        items = items.filter(search_index.attribute_filter(user, 'season', season_filter))
     
     if status_filter:
         items = items.filter(status=status_filter)
@@ -62,34 +65,33 @@ def wardrobe_gallery_view(request):
         items = items.filter(favorite=True)
     
     if search_query:
-        items = items.filter(
-            Q(name__icontains=search_query) |
-            Q(brand__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(color__icontains=search_query) |
-            Q(category__name__icontains=search_query)
-        )
+        search = search_index.search_filter(user, search_query)
+        if search is not None:
+            items = items.filter(search)
     
-    # Get filter options for dropdowns
-    categories = ClothingCategory.objects.filter(
-        Q(is_custom=False) | Q(user=user)
-    )
-    colors = items.values_list('color', flat=True).distinct()
+    # Filter options and totals are cached per user
+    stats_service = WardrobeStatsService(user)
+    filter_options = stats_service.get_filter_options()
     
-    # Pagination
-    paginator = Paginator(items, 24)  # 24 items per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: deep pages cost the same as the first
+    paginator = KeysetPaginator(items.select_related('category'), 24)  # 24 items per page
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     # Get wardrobe stats
-    total_items = items.count()
+    total_items = stats_service.get_stats()['total_items']
     max_items = user.get_max_wardrobe_items()
     remaining_slots = max_items - total_items
     
+    # Current filters, carried over by the pagination links
+    filter_params = request.GET.copy()
+    filter_params.pop('cursor', None)
+    filter_params.pop('page', None)
+    
     context = {
         'items': page_obj,
-        'categories': categories,
-        'colors': colors,
+        'filter_query': filter_params.urlencode(),
+        'categories': filter_options['categories'],
+        'colors': filter_options['colors'],
         'total_items': total_items,
         'max_items': max_items,
         'remaining_slots': remaining_slots,
@@ -116,7 +118,7 @@ def wardrobe_upload_view(request):
     user = request.user
     
     # Check wardrobe limit
-    current_count = ClothingItem.objects.filter(user=user).count()
+    current_count = user.wardrobe_items_count
     max_items = user.get_max_wardrobe_items()
     
     if current_count >= max_items:
@@ -126,6 +128,10 @@ def wardrobe_upload_view(request):
         )
         return redirect('wardrobe:wardrobe_gallery')
     
+    # Resolved once per request, shared by the form and every re-render
+    resolver = CategoryResolver(user)
+    categories = resolver.categories()
+    
     if request.method == 'POST':
         # Get form data
         name = request.POST.get('name')
@@ -159,63 +165,63 @@ def wardrobe_upload_view(request):
             error_msg = f"Name, image, and color are required. (Received: name={name}, image={image}, color={color})"
             messages.error(request, error_msg)
             print(f"DEBUG: Validation failed - {error_msg}")
-            return render(request, 'wardrobe_upload.html', {'categories': get_categories(user), 'remaining_slots': max_items - current_count, 'max_items': max_items})
+            return render(request, 'wardrobe_upload.html', {'categories': categories, 'remaining_slots': max_items - current_count, 'max_items': max_items})
         
         # Validate image
         if image.size > 5 * 1024 * 1024:  # 5MB
             messages.error(request, "Image size must not exceed 5 MB.")
-            return render(request, 'wardrobe_upload.html', {'categories': get_categories(user), 'remaining_slots': max_items - current_count, 'max_items': max_items})
+            return render(request, 'wardrobe_upload.html', {'categories': categories, 'remaining_slots': max_items - current_count, 'max_items': max_items})
         
         # Process and optimize image
         try:
             processed_image = optimize_image(image)
         except Exception as e:
             messages.error(request, f"Error processing image: {str(e)}")
-            return render(request, 'wardrobe_upload.html', {'categories': get_categories(user), 'remaining_slots': max_items - current_count, 'max_items': max_items})
+            return render(request, 'wardrobe_upload.html', {'categories': categories, 'remaining_slots': max_items - current_count, 'max_items': max_items})
         
         # Get category
-        category = None
-        if category_id:
-            try:
-                category = ClothingCategory.objects.get(id=category_id)
-            except ClothingCategory.DoesNotExist:
-                pass
+        category = resolver.get_by_id(category_id) if category_id else None
         
         # Create item
         try:
-            item = ClothingItem.objects.create(
-                user=user,
-                name=name,
-                description=description,
-                category=category,
-                image=processed_image,
-                color=color,
-                color_hex=color_hex,
-                pattern=pattern,
-                material=material,
-                brand=brand,
-                seasons=seasons,
-                occasions=occasions,
-                purchase_date=purchase_date,
-                purchase_price=purchase_price,
-                purchase_location=purchase_location,
-                is_secondhand=is_secondhand,
-                condition=condition,
-                tags=tags
-            )
-            
-            # Update user's wardrobe count
-            user.increment_wardrobe_count()
+            with transaction.atomic():
+                # Re-check the limit under a row lock so parallel uploads can't overshoot
+                if not user.can_add_wardrobe_items():
+                    messages.error(
+                        request,
+                        f"You've reached your wardrobe limit of {max_items} items. Upgrade to Premium to add more!"
+                    )
+                    return redirect('wardrobe:wardrobe_gallery')
+                
+                item = ClothingItem.objects.create(
+                    user=user,
+                    name=name,
+                    description=description,
+                    category=category,
+                    image=processed_image,
+                    color=color,
+                    color_hex=color_hex,
+                    pattern=pattern,
+                    material=material,
+                    brand=brand,
+                    seasons=seasons,
+                    occasions=occasions,
+                    purchase_date=purchase_date,
+                    purchase_price=purchase_price,
+                    purchase_location=purchase_location,
+                    is_secondhand=is_secondhand,
+                    condition=condition,
+                    tags=tags
+                )
             
             messages.success(request, f"{name} has been added to your wardrobe!")
             return redirect('wardrobe:wardrobe_detail', item_id=item.id)
         
         except Exception as e:
             messages.error(request, f"Error adding item: {str(e)}")
-            return render(request, 'wardrobe_upload.html', {'categories': get_categories(user), 'remaining_slots': max_items - current_count, 'max_items': max_items})
+            return render(request, 'wardrobe_upload.html', {'categories': categories, 'remaining_slots': max_items - current_count, 'max_items': max_items})
     
     # GET request
-    categories = get_categories(user)
     context = {
         'categories': categories,
         'remaining_slots': max_items - current_count,
@@ -270,11 +276,9 @@ def wardrobe_edit_view(request, item_id):
         
         # Update category if provided
         category_id = request.POST.get('category')
-        if category_id:
-            try:
-                item.category = ClothingCategory.objects.get(id=category_id)
-            except ClothingCategory.DoesNotExist:
-                pass
+        category = CategoryResolver(request.user).get_by_id(category_id) if category_id else None
+        if category:
+            item.category = category
         
         # Update image if provided
         new_image = request.FILES.get('image')
@@ -313,12 +317,6 @@ def wardrobe_delete_view(request, item_id):
         item_name = item.name
         item.delete()
         
-        # Update user's wardrobe count
-        user = request.user
-        if user.wardrobe_items_count > 0:
-            user.wardrobe_items_count -= 1
-            user.save()
-        
         messages.success(request, f"{item_name} has been removed from your wardrobe.")
         return redirect('wardrobe:wardrobe_gallery')
     
@@ -347,83 +345,24 @@ def wardrobe_stats_view(request):
     Display wardrobe statistics and insights
     """
     user = request.user
-    items = ClothingItem.objects.filter(user=user)
+    cached = WardrobeStatsService(user).get_stats()
     
-    # Calculate statistics
     stats = {
-        'total_items': items.count(),
-        'by_category': {},
-        'by_color': {},
+        'total_items': cached['total_items'],
+        'by_category': cached['by_category'],
+        'by_color': dict(list(cached['by_color'].items())[:10]),
         'by_season': {},
-        'favorite_count': items.filter(favorite=True).count(),
-        'most_worn': [],
-        'recent_additions': [],
+        'favorite_count': cached['favorite_count'],
+        'most_worn': cached['most_worn'],
+        'recent_additions': cached['recent_additions'],
         'wardrobe_limit': user.get_max_wardrobe_items(),
-        'underutilized_items': [],
-        'total_value': 0,
+        'underutilized_items': cached['underutilized_items'],
+        'total_value': cached['total_value'],
         'secondhand_percentage': 0,
     }
     
-    # Group by category
-    category_counts = items.values('category__name').annotate(count=Count('id'))
-    for item in category_counts:
-        if item['category__name']:
-            stats['by_category'][item['category__name']] = item['count']
-    
-    # Group by color
-    color_counts = items.values('color').annotate(count=Count('id')).order_by('-count')[:10]
-    for item in color_counts:
-        stats['by_color'][item['color']] = item['count']
-    
-    # Calculate total value and second-hand percentage
-    items_with_prices = items.exclude(purchase_price__isnull=True)
-    if items_with_prices.exists():
-        stats['total_value'] = items_with_prices.aggregate(total=Sum('purchase_price'))['total'] or 0
-    
-    secondhand_count = items.filter(is_secondhand=True).count()
     if stats['total_items'] > 0:
-        stats['secondhand_percentage'] = round((secondhand_count / stats['total_items']) * 100, 1)
-    # Most worn items with cost per wear
-    most_worn_items = items.filter(times_worn__gt=0).order_by('-times_worn')[:5]
-    stats['most_worn'] = []
-    for item in most_worn_items:
-        cost_per_wear = None
-        if item.purchase_price and item.times_worn > 0:
-            cost_per_wear = round(float(item.purchase_price) / item.times_worn, 2)
-        stats['most_worn'].append({
-            'name': item.name,
-            'times_worn': item.times_worn,
-            'image': item.image.url if item.image else None,
-            'cost_per_wear': cost_per_wear,
-        })
-    
-    # Underutilized items (low wear count, purchased more than 30 days ago)
-    from django.utils import timezone
-    from datetime import timedelta
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    underutilized = items.filter(
-        times_worn__lte=2,
-        created_at__lte=thirty_days_ago
-    ).order_by('times_worn', '-created_at')[:5]
-    stats['underutilized_items'] = []
-    for item in underutilized:
-        stats['underutilized_items'].append({
-            'name': item.name,
-            'times_worn': item.times_worn,
-            'image': item.image.url if item.image else None,
-            'days_owned': (timezone.now().date() - item.created_at.date()).days,
-        })
-    
-    # Recent additions - need image URLs not just paths
-    recent_items = items.order_by('-created_at')[:5]
-    stats['recent_additions'] = []
-    for item in recent_items:
-        stats['recent_additions'].append({
-            'id': str(item.id),
-            'name': item.name,
-            'created_at': item.created_at,
-            'image': item.image.url if item.image else None,
-        })
+        stats['secondhand_percentage'] = round((cached['secondhand_count'] / stats['total_items']) * 100, 1)
     
     stats['remaining_slots'] = stats['wardrobe_limit'] - stats['total_items']
     
@@ -438,10 +377,8 @@ def wardrobe_stats_view(request):
 # ==================== Helper Functions ====================
 
 def get_categories(user):
-    """Get categories available to user"""
-    return ClothingCategory.objects.filter(
-        Q(is_custom=False) | Q(user=user)
-    )
+    """Get categories available to user (cached, see CategoryResolver)"""
+    return CategoryResolver(user).categories()
 
 
 def optimize_image(image_file):
@@ -498,7 +435,35 @@ def api_wardrobe_list(request):
     
     season = request.query_params.get('season')
     if season:
-        items = items.filter(seasons__contains=[season])
+        items = items.filter(search_index.attribute_filter(request.user, 'season', season))
+    
+    occasion = request.query_params.get('occasion')
+    if occasion:
+        items = items.filter(search_index.attribute_filter(request.user, 'occasion', occasion))
+    
+    tag = request.query_params.get('tag')
+    if tag:
+        items = items.filter(search_index.attribute_filter(request.user, 'tag', tag))
+    
+    search = search_index.search_filter(request.user, request.query_params.get('search'))
+    if search is not None:
+        items = items.filter(search)
+    
+    # Keyset pagination when the client asks for it (?limit= / ?cursor=)
+    if 'limit' in request.query_params or 'cursor' in request.query_params:
+        try:
+            limit = min(max(int(request.query_params.get('limit', 24)), 1), 100)
+        except ValueError:
+            limit = 24
+        page = KeysetPaginator(items.select_related('category'), limit).get_page(
+            request.query_params.get('cursor')
+        )
+        serializer = ClothingItemListSerializer(page.object_list, many=True)
+        return Response({
+            'results': serializer.data,
+            'next_cursor': page.next_cursor,
+            'previous_cursor': page.previous_cursor,
+        })
     
     serializer = ClothingItemListSerializer(items, many=True)
     return Response(serializer.data)
@@ -509,10 +474,9 @@ def api_wardrobe_list(request):
 def api_wardrobe_create(request):
     """API: Create new wardrobe item"""
     user = request.user
-    current_count = ClothingItem.objects.filter(user=user).count()
     max_items = user.get_max_wardrobe_items()
 
-    if current_count >= max_items:
+    if user.wardrobe_items_count >= max_items:
         return Response(
             {'error': f"You've reached your wardrobe limit of {max_items} items. Upgrade to Premium to add more!"},
             status=status.HTTP_403_FORBIDDEN
@@ -528,6 +492,69 @@ def api_wardrobe_create(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def api_wardrobe_bulk_import(request):
+    """
+    API: Queue the bulk import of a zip archive of clothing photos
+    
+    The archive is stored and imported by the run_wardrobe_imports worker,
+    where every photo is optimized, analyzed and auto-categorized. The
+    response carries the job id; poll the status URL for progress, the
+    created item ids and the per-file error report.
+    """
+    import zipfile
+    from .bulk_import import WardrobeImportQueue
+    
+    archive = request.FILES.get('archive')
+    if not archive:
+        return Response({'error': 'No zip archive provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if archive.size > 500 * 1024 * 1024:  # 500MB
+        return Response({'error': 'Archive size must not exceed 500 MB'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not zipfile.is_zipfile(archive):
+        return Response({'error': 'Not a valid zip archive'}, status=status.HTTP_400_BAD_REQUEST)
+    archive.seek(0)
+    
+    user = request.user
+    max_items = user.get_max_wardrobe_items()
+    if user.wardrobe_items_count >= max_items:
+        return Response(
+            {'error': f"You've reached your wardrobe limit of {max_items} items. Upgrade to Premium to add more!"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    job = WardrobeImportQueue.enqueue(user, archive)
+    
+    return Response({
+        'job_id': str(job.id),
+        'status': job.status,
+        'status_url': reverse('wardrobe:api_wardrobe_bulk_import_status', args=[job.id]),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_wardrobe_bulk_import_status(request, job_id):
+    """API: Progress and result of a queued bulk import"""
+    job = get_object_or_404(WardrobeImportJob, id=job_id, user=request.user)
+    
+    return Response({
+        'job_id': str(job.id),
+        'status': job.status,
+        'total_files': job.total_files,
+        'processed_files': job.processed_files,
+        'created': job.created_items,
+        'created_count': len(job.created_items),
+        'errors': job.errors,
+        'error_message': job.error_message,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def api_wardrobe_detail(request, item_id):
@@ -558,12 +585,6 @@ def api_wardrobe_delete(request, item_id):
     item = get_object_or_404(ClothingItem, id=item_id, user=request.user)
     item.delete()
     
-    # Update user's wardrobe count
-    user = request.user
-    if user.wardrobe_items_count > 0:
-        user.wardrobe_items_count -= 1
-        user.save()
-    
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -572,29 +593,27 @@ def api_wardrobe_delete(request, item_id):
 def api_wardrobe_stats(request):
     """API: Get wardrobe statistics"""
     user = request.user
-    items = ClothingItem.objects.filter(user=user)
+    cached = WardrobeStatsService(user).get_stats()
+    wardrobe_limit = user.get_max_wardrobe_items()
     
     stats = {
-        'total_items': items.count(),
-        'by_category': {},
-        'by_color': {},
+        'total_items': cached['total_items'],
+        'by_category': cached['by_category'],
+        'by_color': cached['by_color'],
         'by_season': {},
-        'favorite_count': items.filter(favorite=True).count(),
-        'most_worn': list(items.order_by('-times_worn')[:5].values('id', 'name', 'times_worn')),
-        'recent_additions': list(items.order_by('-created_at')[:5].values('id', 'name', 'created_at')),
-        'wardrobe_limit': user.get_max_wardrobe_items(),
-        'remaining_slots': user.get_max_wardrobe_items() - items.count(),
+        'favorite_count': cached['favorite_count'],
+        'most_worn': [
+            {'id': item['id'], 'name': item['name'], 'times_worn': item['times_worn']}
+            for item in cached['most_worn']
+        ],
+        'recent_additions': [
+            {'id': item['id'], 'name': item['name'], 'created_at': item['created_at']}
+            for item in cached['recent_additions']
+        ],
+        'wardrobe_limit': wardrobe_limit,
+        'remaining_slots': wardrobe_limit - cached['total_items'],
     }
     
-    # Group by category
-    for item in items.values('category__name').annotate(count=Count('id')):
-        if item['category__name']:
-            stats['by_category'][item['category__name']] = item['count']
-    
-    # Group by color
-    for item in items.values('color').annotate(count=Count('id')):
-        stats['by_color'][item['color']] = item['count']
-    
     serializer = WardrobeStatsSerializer(stats)
     return Response(serializer.data)
 
@@ -679,9 +698,9 @@ def laundry_dashboard(request):
     approaching = summary['approaching_items']
     at_laundry = summary['at_laundry']
     
-    # Separate needs_wash into overdue and regular
-    overdue = [item for item in needs_wash if item.urgency_level() >= 3]
-    needs_wash_now = [item for item in needs_wash if item.urgency_level() == 2]
+    # Separate needs_wash into overdue and regular (urgency annotated in SQL)
+    overdue = summary['overdue_items']
+    needs_wash_now = [item for item in needs_wash if item.urgency == 2]
     
     context = {
         'overdue_items': overdue,
@@ -833,13 +852,7 @@ def resolve_laundry_alert(request, alert_id):
 def auto_set_all_thresholds(request):
     """Auto-set wash thresholds for all items based on AI recommendations"""
     scheduler = LaundrySchedulerAI(request.user)
-    items = ClothingItem.objects.filter(user=request.user)
-    
-    updated_count = 0
-    for item in items:
-        if item.max_wears_before_wash == 3:  # Only update defaults
-            scheduler.auto_set_wash_threshold(item)
-            updated_count += 1
+    updated_count = scheduler.auto_set_all_thresholds()
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({